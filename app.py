@@ -7,9 +7,9 @@ This provides a user-friendly web interface for the LinkedIn automation tool.
 import streamlit as st
 import sys
 import os
+import time
+from collections import Counter
 from dotenv import load_dotenv, set_key
-import subprocess
-import threading
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +17,25 @@ load_dotenv()
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '.'))
 
+from src.linkedin_msg.tools.browser_profiles import load_browser_profiles
+from src.linkedin_msg.runner import get_runner, ACTIVE_STATES, DONE
+from src.linkedin_msg.records import RunStatus
+from src.linkedin_msg.storage import cache_dir
+
+# Seconds between progress refreshes while a run is active
+POLL_INTERVAL = 1.0
+
+# What to tell the user for each run outcome (request_sent gets the success box)
+STATUS_MESSAGES = {
+    RunStatus.MESSAGE_SENT: "Message sent to {person}",
+    RunStatus.ALREADY_CONNECTED: "You are already connected with {person}",
+    RunStatus.PENDING: "A connection request to {person} is already pending",
+    RunStatus.UNAVAILABLE: "{person}'s profile has no Connect option",
+    RunStatus.UNKNOWN: "Finished, but the agent did not report a clear outcome for {person}",
+    RunStatus.NOT_FOUND: "No LinkedIn profile found for {person}",
+    RunStatus.FAILED: "Automation failed for {person}",
+}
+
 # Set page config
 st.set_page_config(
     page_title="LinkedIn Automation Tool",
@@ -100,7 +119,7 @@ with col1:
     st.markdown("## ⚙️ Configuration")
 
     # Create tabs
-    tab1, tab2 = st.tabs(["🎯 Quick Start", "🔐 Credentials"])
+    tab1, tab_batch, tab2 = st.tabs(["🎯 Quick Start", "📂 Batch", "🔐 Credentials"])
 
     with tab1:
         st.markdown("### LinkedIn Connection Request")
@@ -134,6 +153,24 @@ with col1:
         else:
             st.caption(f"📊 {note_length} / {max_length} characters")
 
+        # Execution mode
+        direct_mode = st.checkbox(
+            "⚡ Direct mode",
+            value=os.getenv('DIRECT_MODE', 'false').lower() == 'true',
+            help="Run login, search and connect directly without the LLM. "
+                 "The AI agent is only used if a step returns an unclear result."
+        )
+
+        browser_profiles = list(load_browser_profiles())
+        current_profile = os.getenv('BROWSER_PROFILE', 'default')
+        browser_profile = st.selectbox(
+            "🌐 Browser profile",
+            browser_profiles,
+            index=browser_profiles.index(current_profile) if current_profile in browser_profiles else 0,
+            help="'default' opens a visible Chrome window; 'batch' runs headless and skips "
+                 "images, fonts and media for faster, lighter runs."
+        )
+
         # Save configuration button
         col_save, col_run = st.columns(2)
 
@@ -156,53 +193,55 @@ with col1:
                     set_key(env_path, 'PERSON_NAME', person_name)
                     set_key(env_path, 'CONNECTION_NOTE', connection_note)
 
-                    # Show what we're running with
-                    st.info(f"🎯 **Searching for:** {person_name}")
-
-                    with st.spinner("🔄 Running automation... This may take 30-60 seconds"):
-                        try:
-                            # Prepare environment variables - create a fresh env dict
-                            # This ensures the subprocess uses the updated values
-                            env = os.environ.copy()
-                            env['PERSON_NAME'] = person_name
-                            env['CONNECTION_NOTE'] = connection_note
-
-                            # Run the automation with updated environment
-                            result = subprocess.run(
-                                [sys.executable, "src/linkedin_msg/main_async.py"],
-                                capture_output=True,
-                                text=True,
-                                timeout=300,
-                                env=env  # Pass the updated environment
-                            )
-
-                            if "CONNECTION REQUEST SENT SUCCESSFULLY" in result.stdout:
-                                st.balloons()
-                                st.markdown(f"""
-                                <div class="success-box">
-                                    <h3>✅ Success!</h3>
-                                    <p>Connection request sent to <strong>{person_name}</strong></p>
-                                    <p>Your personalized note has been delivered!</p>
-                                </div>
-                                """, unsafe_allow_html=True)
-
-                                # Show execution details in expander
-                                with st.expander("📋 Execution Details"):
-                                    st.code(result.stdout, language="text")
-                            else:
-                                st.error("❌ Automation completed but connection request status unclear")
-                                with st.expander("📋 Full Output"):
-                                    st.code(result.stdout, language="text")
-                                if result.stderr:
-                                    st.code(result.stderr, language="text")
-
-                        except subprocess.TimeoutExpired:
-                            st.error("⏱️ Automation timed out. Please try again.")
-                        except Exception as e:
-                            st.error(f"❌ Error: {str(e)}")
+                    # Hand the run to the background runner; progress is shown below
+                    progress = get_runner().submit_single(
+                        person_name,
+                        connection_note,
+                        direct=direct_mode,
+                        browser_profile=browser_profile,
+                    )
+                    st.session_state['run_id'] = progress.id
+                    st.info(f"🎯 **Queued:** {person_name}")
                 else:
                     st.error("❌ Please fill in both Person Name and Connection Note")
 
+    with tab_batch:
+        st.markdown("### Batch File")
+        st.caption("CSV with a `name` column and an optional `note` column, or JSONL with one "
+                   "`{\"name\": ..., \"note\": ...}` object per line. Rows without a note use the "
+                   "Connection Note from Quick Start.")
+
+        batch_file = st.file_uploader("📄 People", type=["csv", "jsonl", "ndjson"])
+        pool_size = int(os.getenv('DRIVER_POOL_SIZE', '2'))
+        batch_workers = st.number_input(
+            "👥 Parallel workers",
+            min_value=1,
+            max_value=pool_size,
+            value=min(int(os.getenv('BATCH_WORKERS', str(pool_size))), pool_size),
+            help="Number of people processed at once, at most one per browser (DRIVER_POOL_SIZE)"
+        )
+
+        if st.button("🚀 Run Batch", use_container_width=True, type="primary"):
+            if batch_file is None:
+                st.error("❌ Please upload a CSV or JSONL file")
+            else:
+                if connection_note:
+                    os.environ['CONNECTION_NOTE'] = connection_note
+                upload_path = os.path.join(
+                    cache_dir('uploads'), f"{time.strftime('%Y%m%d-%H%M%S')}-{batch_file.name}"
+                )
+                with open(upload_path, 'wb') as f:
+                    f.write(batch_file.getbuffer())
+                progress = get_runner().submit_batch(
+                    upload_path,
+                    direct=direct_mode,
+                    workers=int(batch_workers),
+                    browser_profile=browser_profile,
+                    label=batch_file.name,
+                )
+                st.session_state['run_id'] = progress.id
+                st.info(f"📂 **Queued batch:** {batch_file.name}")
+
     with tab2:
         st.markdown("### LinkedIn Credentials")
         st.markdown("""
@@ -238,6 +277,51 @@ with col1:
             else:
                 st.error("❌ Please provide both email and password")
 
+    # Progress of the selected run, refreshed while it is active
+    run_id = st.session_state.get('run_id')
+    current_run = get_runner().get(run_id) if run_id else None
+    if current_run is not None:
+        st.markdown("## 📈 Progress")
+        elapsed = f" · {current_run.elapsed:.0f}s" if current_run.elapsed is not None else ""
+        st.markdown(f"**{current_run.label}** ({current_run.kind}) — {current_run.state}{elapsed}")
+
+        rows = current_run.table()
+        if rows:
+            st.dataframe(rows, use_container_width=True, hide_index=True)
+        if current_run.trace_path:
+            st.caption(f"🧭 Trace: {current_run.trace_path}")
+
+        if current_run.state == DONE and current_run.kind == "single" and current_run.records:
+            record = current_run.records[0]
+            if record.status == RunStatus.REQUEST_SENT:
+                if st.session_state.get('celebrated') != current_run.id:
+                    st.session_state['celebrated'] = current_run.id
+                    st.balloons()
+                st.markdown(f"""
+                <div class="success-box">
+                    <h3>✅ Success!</h3>
+                    <p>Connection request sent to <strong>{record.person}</strong></p>
+                    <p>Your personalized note has been delivered!</p>
+                </div>
+                """, unsafe_allow_html=True)
+            else:
+                text = STATUS_MESSAGES[record.status].format(person=record.person)
+                if record.ok:
+                    st.info(f"ℹ️ {text}")
+                else:
+                    st.error(f"❌ {text}" + (f" ({record.error_class})" if record.error_class else ""))
+            with st.expander("📋 Execution Details"):
+                st.json(record.to_dict())
+        elif current_run.state == DONE and current_run.kind == "batch":
+            outcomes = Counter(record.status.value for record in current_run.records)
+            successful = sum(1 for record in current_run.records if record.ok)
+            st.success(f"✅ Batch finished: {successful} successful, "
+                       f"{len(current_run.records) - successful} failed")
+            if outcomes:
+                st.caption(", ".join(f"{status}: {n}" for status, n in outcomes.most_common()))
+        elif current_run.error:
+            st.error(f"❌ Error: {current_run.error}")
+
 with col2:
     st.markdown("## 📊 Status")
 
@@ -278,3 +362,8 @@ st.markdown("""
     <p style="font-size: 0.8rem;">⚠️ Use responsibly and in accordance with LinkedIn's Terms of Service</p>
 </div>
 """, unsafe_allow_html=True)
+
+# Poll the background runner until the selected run has finished
+if current_run is not None and current_run.state in ACTIVE_STATES:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
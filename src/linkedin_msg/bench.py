@@ -0,0 +1,243 @@
+"""
+Offline end-to-end benchmark.
+
+Starts the local mock LinkedIn site, drives headless Chrome through the direct
+login → search → connect pipeline for a batch of generated people, and reports
+per-person latency, batch throughput and the per-step trace summary. No
+LinkedIn account, LLM key or network access is needed. It also measures the
+start-up time of the CLI and the import time of the full automation stack.
+
+Usage:
+    python -m src.linkedin_msg.bench --people 20 --workers 2 --latency 0.1
+    python -m src.linkedin_msg.bench --save baseline.json
+    python -m src.linkedin_msg.bench --baseline baseline.json --max-regression 0.2
+    python -m src.linkedin_msg.bench --lookahead --baseline baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from functools import partial
+
+from src.linkedin_msg.job_store import JobStore
+from src.linkedin_msg.mock_site import MockLinkedIn
+from src.linkedin_msg.tools.browser_profiles import load_browser_profiles
+from src.linkedin_msg.tools.driver_pool import DriverPool, create_driver, set_default_pool
+from src.linkedin_msg.tracing import percentile
+
+
+# Project root, the directory the src package is imported from
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Chrome's sandbox cannot start as root, which is how containers and CI run the benchmark
+BENCH_CHROME_ARGUMENTS = ("--no-sandbox",)
+
+# Fresh-interpreter commands timed by measure_startup()
+STARTUP_COMMANDS = {
+    'cli_help_s': ['-m', 'src.linkedin_msg.cli', '--help'],
+    'cli_stats_s': ['-m', 'src.linkedin_msg.cli', 'stats'],
+    'full_import_s': ['-c', 'import src.linkedin_msg.main_async'],
+}
+
+
+@contextmanager
+def _patched_env(values: dict):
+    previous = {key: os.environ.get(key) for key in values}
+    os.environ.update(values)
+    try:
+        yield
+    finally:
+        for key, value in previous.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_benchmark(people: int = 10, workers: int = 2, latency: float = 0.1, jitter: float = 0.0,
+                  failure_rate: float = 0.0, browser_profile: str = "batch", lookahead: bool = False) -> dict:
+    """
+    Run one benchmark batch against the mock site.
+
+    Returns:
+        Report dict with elapsed time, throughput, per-person latency
+        percentiles, number of invitations the mock site received, failures
+        it injected, people that needed retries or failed, and the per-step
+        trace summary.
+    """
+    # Imported here because main_async loads .env on import, which must not
+    # override the benchmark environment set below
+    from src.linkedin_msg.main_async import run_batch
+
+    with tempfile.TemporaryDirectory() as workdir, \
+            MockLinkedIn(latency=latency, jitter=jitter, failure_rate=failure_rate) as site:
+        trace_dir = os.path.join(workdir, 'trace')
+        env = {
+            'LINKEDIN_BASE_URL': site.base_url,
+            'LINKEDIN_EMAIL': 'bench@example.com',
+            'LINKEDIN_PASSWORD': 'bench',
+            'LINKEDIN_CACHE_DIR': workdir,
+            'LINKEDIN_TRACE_DIR': trace_dir,
+            'TRACE': 'true',
+            'PACING_MIN_INTERVAL': '0',
+            'PACING_DAILY_CAP': '0',
+            'SKIP_CONTACTED_DAYS': '0',
+            'BATCH_LOOKAHEAD': 'true' if lookahead else 'false',
+        }
+        with _patched_env(env):
+            pool = DriverPool(size=workers, driver_factory=partial(
+                create_driver, profile=browser_profile, extra_arguments=BENCH_CHROME_ARGUMENTS
+            ))
+            set_default_pool(pool)
+            batch = [
+                {'name': f"Bench Person {i}", 'note': f"Hi Bench Person {i}, benchmark run."}
+                for i in range(people)
+            ]
+            try:
+                started = time.perf_counter()
+                results = asyncio.run(run_batch(batch, direct=True, workers=workers,
+                                      store=JobStore(os.path.join(workdir, 'jobs.sqlite3'))))
+                elapsed = time.perf_counter() - started
+            finally:
+                set_default_pool(None)
+
+        with open(os.path.join(trace_dir, 'summary.json'), encoding='utf-8') as f:
+            steps = json.load(f)['steps']
+        with open(os.path.join(trace_dir, 'trace.jsonl'), encoding='utf-8') as f:
+            person_times = sorted(
+                entry['duration_ms'] / 1000
+                for entry in map(json.loads, f)
+                if entry['span'] == 'person'
+            )
+
+        records = [result['record'] for result in results if isinstance(result, dict) and 'record' in result]
+
+        return {
+            'people': people,
+            'workers': workers,
+            'browser_profile': browser_profile,
+            'lookahead': lookahead,
+            'latency_s': latency,
+            'failure_rate': failure_rate,
+            'elapsed_s': round(elapsed, 3),
+            'throughput_per_min': round(people / elapsed * 60, 2) if elapsed else 0.0,
+            'person_p50_s': round(percentile(person_times, 50), 3),
+            'person_p95_s': round(percentile(person_times, 95), 3),
+            'invitations_sent': len(site.server.invitations),
+            'logins': site.server.logins,
+            'failures_injected': site.server.failures,
+            'retried': sum(1 for record in records if record.retries),
+            'retries': sum(record.retries for record in records),
+            'failed': sum(1 for record in records if not record.ok),
+            'steps': steps,
+        }
+
+
+def measure_startup(repeat: int = 3) -> dict:
+    """
+    Time the STARTUP_COMMANDS in fresh interpreters.
+
+    Each command runs `repeat` times and the fastest run is reported, which
+    filters out noise from other processes. Returns seconds per command.
+    """
+    with tempfile.TemporaryDirectory() as workdir:
+        env = {**os.environ, 'LINKEDIN_CACHE_DIR': workdir}
+        timings = {}
+        for metric, command in STARTUP_COMMANDS.items():
+            runs = []
+            for _ in range(repeat):
+                started = time.perf_counter()
+                subprocess.run([sys.executable, *command], cwd=PROJECT_ROOT, env=env,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+                runs.append(time.perf_counter() - started)
+            timings[metric] = round(min(runs), 3)
+    return timings
+
+
+def compare(report: dict, baseline: dict, max_regression: float) -> list:
+    """Return a description of every metric that regressed by more than `max_regression`."""
+    regressions = []
+    for metric in ('person_p50_s', 'person_p95_s', 'elapsed_s'):
+        before, after = baseline.get(metric), report.get(metric)
+        if before and after and after > before * (1 + max_regression):
+            regressions.append(f"{metric}: {before:.2f}s → {after:.2f}s")
+    for metric in STARTUP_COMMANDS:
+        before = (baseline.get('startup') or {}).get(metric)
+        after = (report.get('startup') or {}).get(metric)
+        if before and after and after > before * (1 + max_regression):
+            regressions.append(f"startup {metric}: {before:.2f}s → {after:.2f}s")
+    before, after = baseline.get('throughput_per_min'), report.get('throughput_per_min')
+    if before and after is not None and after < before * (1 - max_regression):
+        regressions.append(f"throughput_per_min: {before:.1f} → {after:.1f}")
+    return regressions
+
+
+def print_report(report: dict):
+    print(f"\n{'='*60}")
+    print(f"🏁 BENCHMARK ({report['people']} people, {report['workers']} workers, "
+          f"{report['browser_profile']} browser, {report['latency_s']}s latency"
+          f"{', lookahead' if report.get('lookahead') else ''})")
+    print(f"{'='*60}")
+    print(f"⏱️  Total Time: {report['elapsed_s']:.2f} seconds")
+    print(f"📈 Throughput: {report['throughput_per_min']:.1f} people/min")
+    print(f"👤 Per person: p50 {report['person_p50_s']:.2f}s, p95 {report['person_p95_s']:.2f}s")
+    print(f"✉️  Invitations received by mock site: {report['invitations_sent']}")
+    if report.get('failure_rate'):
+        print(f"💥 Injected failures: {report['failures_injected']}, people retried: {report['retried']} "
+              f"({report['retries']} retries), failed: {report['failed']}")
+    if report.get('startup'):
+        startup = report['startup']
+        print(f"🚀 Start-up: CLI --help {startup['cli_help_s']:.2f}s, stats {startup['cli_stats_s']:.2f}s, "
+              f"full import {startup['full_import_s']:.2f}s")
+    print(f"{'='*60}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark against the local mock LinkedIn site")
+    parser.add_argument("--people", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--latency", type=float, default=0.1, help="Mock response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of page loads that fail")
+    parser.add_argument("--browser-profile", choices=list(load_browser_profiles()), default="batch",
+                        help="Browser profile from config/browser.yaml (default: batch)")
+    parser.add_argument("--lookahead", action="store_true",
+                        help="Load the next person's search in a second tab during each connect step")
+    parser.add_argument("--skip-startup", action="store_true",
+                        help="Don't measure CLI start-up and import time")
+    parser.add_argument("--save", metavar="PATH", help="Write the report as JSON")
+    parser.add_argument("--baseline", metavar="PATH", help="Compare against a saved report")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="Allowed slowdown against the baseline before failing (default 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.people, args.workers, args.latency, args.jitter, args.failure_rate,
+                           args.browser_profile, args.lookahead)
+    if not args.skip_startup:
+        report['startup'] = measure_startup()
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(report, json.load(f), args.max_regression)
+        if regressions:
+            print("❌ Regressions against baseline:")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print("✅ No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+Command line interface.
+
+    linkedin_msg run      [--person NAME] [--note TEXT]
+    linkedin_msg batch    [--input PATH] [--workers N] [--lookahead] [--skip-contacted-days DAYS]
+    linkedin_msg resume   [BATCH_ID] [--retry-failed] [--lookahead]
+    linkedin_msg bench    [benchmark options, see --help]
+    linkedin_msg stats    [--days N]
+
+Without a subcommand it behaves like main_async.py: a batch when BATCH_MODE=true
+or a batch option such as --input is given, otherwise a single run. Options
+are passed on to that command, e.g. `linkedin_msg --direct`.
+
+Only argument parsing, configuration checks and the stats readers are
+imported up front. CrewAI, Selenium and the tool stack are imported by the
+subcommands that run automation, so --help, --check and stats start quickly.
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+from src.linkedin_msg.tools.browser_profiles import load_browser_profiles
+
+# Environment values that are still the placeholders from .env.example
+_PLACEHOLDER_PREFIX = "your_"
+
+# Exit status for configuration errors
+CONFIG_ERROR = 2
+
+# Options that select the batch command when no subcommand is given
+_BATCH_OPTIONS = ("--input", "--workers", "--skip-contacted-days", "--lookahead")
+
+
+def _configured(name: str) -> bool:
+    value = os.getenv(name, '')
+    return bool(value) and not value.startswith(_PLACEHOLDER_PREFIX)
+
+
+def validate_config(args) -> tuple:
+    """
+    Check the environment and options of a run/batch/resume command.
+
+    Returns:
+        (errors, warnings) lists of messages.
+    """
+    errors, warnings = [], []
+
+    for name in ('LINKEDIN_EMAIL', 'LINKEDIN_PASSWORD'):
+        if not _configured(name):
+            errors.append(f"{name} is not set (see .env.example)")
+
+    if not _configured('ANTHROPIC_API_KEY'):
+        message = "ANTHROPIC_API_KEY is not set"
+        if args.direct:
+            warnings.append(f"{message}; direct mode cannot fall back to the agent")
+        else:
+            errors.append(f"{message} (or use --direct)")
+
+    try:
+        profiles = load_browser_profiles()
+        profile = args.browser_profile or os.getenv('BROWSER_PROFILE', 'default')
+        if profile not in profiles:
+            errors.append(f"Unknown browser profile '{profile}'. Available: {', '.join(profiles)}")
+    except (OSError, ValueError) as e:
+        errors.append(f"Invalid config/browser.yaml: {e}")
+
+    for name in ('BATCH_WORKERS', 'DRIVER_POOL_SIZE', 'PACING_MIN_INTERVAL', 'PACING_DAILY_CAP',
+                 'SKIP_CONTACTED_DAYS'):
+        value = os.getenv(name)
+        if value:
+            try:
+                float(value)
+            except ValueError:
+                errors.append(f"{name} must be a number, got '{value}'")
+
+    if getattr(args, 'lookahead', False) and not args.direct:
+        warnings.append("--lookahead only applies in direct mode (--direct)")
+    if args.command == 'run' and not (args.person or os.getenv('PERSON_NAME')):
+        warnings.append("PERSON_NAME is not set; using 'John Smith'")
+    if args.command == 'batch':
+        if args.input:
+            if not os.path.isfile(args.input):
+                errors.append(f"Input file not found: {args.input}")
+            elif os.path.splitext(args.input)[1].lower() not in ('.csv', '.jsonl', '.ndjson'):
+                errors.append(f"Unsupported input format: {args.input} (use .csv or .jsonl)")
+        else:
+            from src.linkedin_msg.inputs import env_people
+
+            if not env_people():
+                errors.append("No people to run: pass --input or set PERSON_NAMES (comma-separated)")
+
+    return errors, warnings
+
+
+def _apply_common(args):
+    """Turn the shared options into the environment settings the runtime reads."""
+    if args.browser_profile:
+        os.environ['BROWSER_PROFILE'] = args.browser_profile
+    if args.diagnostics:
+        os.environ['DIAGNOSTICS'] = 'true'
+    if args.verbose:
+        os.environ['VERBOSE'] = 'true'
+    if getattr(args, 'lookahead', False):
+        os.environ['BATCH_LOOKAHEAD'] = 'true'
+
+
+def _check(args) -> Optional[int]:
+    """Validate the configuration; returns an exit status to stop with, or None to continue."""
+    errors, warnings = validate_config(args)
+    for warning in warnings:
+        print(f"⚠️  {warning}")
+    for error in errors:
+        print(f"❌ {error}")
+    if errors:
+        return CONFIG_ERROR
+    if args.check:
+        print("✅ Configuration OK")
+        return 0
+    return None
+
+
+def cmd_run(args) -> int:
+    import asyncio
+    from src.linkedin_msg import main_async
+
+    if args.person:
+        os.environ['PERSON_NAME'] = args.person
+    if args.note:
+        os.environ['CONNECTION_NOTE'] = args.note
+    asyncio.run(main_async.run(direct=args.direct))
+    return 0
+
+
+def cmd_batch(args) -> int:
+    import asyncio
+    from src.linkedin_msg import main_async
+    from src.linkedin_msg.inputs import env_people
+
+    if args.skip_contacted_days is not None:
+        os.environ['SKIP_CONTACTED_DAYS'] = str(args.skip_contacted_days)
+    if args.input:
+        main_async.run_file_sync(args.input, direct=args.direct, workers=args.workers)
+    else:
+        asyncio.run(main_async.run_batch(env_people(), direct=args.direct, workers=args.workers))
+    return 0
+
+
+def cmd_resume(args) -> int:
+    from src.linkedin_msg import main_async
+
+    main_async.resume_sync(args.batch_id, direct=args.direct, retry_failed=args.retry_failed,
+                           workers=args.workers)
+    return 0
+
+
+def cmd_stats(args) -> int:
+    from src.linkedin_msg.contacts import get_contact_index
+    from src.linkedin_msg.job_store import JobStore
+    from src.linkedin_msg.records import iter_results, summarize_results
+
+    since = time.time() - args.days * 86400 if args.days else None
+    summary = summarize_results(iter_results(), since=since)
+    window = f"last {args.days:g} days" if args.days else "all time"
+    print(f"\n📬 Results ({window}): {summary['total']} people")
+    for status, count in summary['statuses'].items():
+        print(f"   {status:<20}{count:>7}")
+    if summary['steps']:
+        print(f"\n{'Step':<20}{'count':>7}{'p50':>9}{'p95':>9}")
+        for step, stats in summary['steps'].items():
+            print(f"{step:<20}{stats['count']:>7}{stats['p50_s']:>8.2f}s{stats['p95_s']:>8.2f}s")
+
+    store = JobStore()
+    batch_id = store.latest_batch_id()
+    if batch_id:
+        states = store.summary(batch_id)
+        print(f"\n🗂️  Latest batch {batch_id}: " + ", ".join(f"{s}={n}" for s, n in sorted(states.items())))
+    print(f"📇 Contact index: {len(get_contact_index())} people")
+
+    if args.selectors:
+        # The selector engine pulls in Selenium, so only load it when asked
+        from src.linkedin_msg.tools.selector_engine import get_selector_engine
+
+        print(f"\n{'Target':<18}{'Strategy':<58}{'hits':>6}{'misses':>8}{'avg ms':>9}{'score':>7}")
+        for target, rows in get_selector_engine().stats().items():
+            for row in rows:
+                avg_ms = f"{row['avg_ms']:.1f}" if row['avg_ms'] is not None else "-"
+                print(f"{target:<18}{row['strategy'][:56]:<58}{row['hits']:>6}{row['misses']:>8}"
+                      f"{avg_ms:>9}{row['score']:>7.2f}")
+    print()
+    return 0
+
+
+def _common_options() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--direct",
+        action="store_true",
+        default=os.getenv('DIRECT_MODE', 'false').lower() == 'true',
+        help="Call the login/search/connect tools directly and only use the agent "
+             "when a step returns an ambiguous result (or set DIRECT_MODE=true)",
+    )
+    common.add_argument(
+        "--browser-profile",
+        default=None,
+        help="Browser profile from config/browser.yaml, e.g. 'batch' for headless, "
+             "resource-trimmed workers (or set BROWSER_PROFILE)",
+    )
+    common.add_argument(
+        "--diagnostics",
+        action="store_true",
+        help="Record per-navigation network waterfalls next to the run trace (or set DIAGNOSTICS=true)",
+    )
+    common.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print the tools' [DEBUG] lines (or set VERBOSE=true)",
+    )
+    common.add_argument(
+        "--check",
+        action="store_true",
+        help="Only validate the configuration and exit",
+    )
+    return common
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="linkedin_msg", description="LinkedIn connection request automation")
+    subcommands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    common = _common_options()
+    workers = argparse.ArgumentParser(add_help=False)
+    workers.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of people processed in parallel (default: BATCH_WORKERS or the driver pool size)",
+    )
+    workers.add_argument(
+        "--lookahead",
+        action="store_true",
+        help="With --direct, load the next person's search in a second tab while the current "
+             "person's connect step runs (or set BATCH_LOOKAHEAD=true)",
+    )
+
+    run = subcommands.add_parser("run", parents=[common], help="Send one connection request")
+    run.add_argument("--person", help="Name to search for (default: PERSON_NAME)")
+    run.add_argument("--note", help="Connection note (default: CONNECTION_NOTE)")
+    run.set_defaults(handler=cmd_run)
+
+    batch = subcommands.add_parser("batch", parents=[common, workers],
+                                   help="Run a batch from a CSV/JSONL file or PERSON_NAMES")
+    batch.add_argument("--input", metavar="PATH",
+                       help="CSV or JSONL file with name/note columns (default: PERSON_NAMES/CONNECTION_NOTES)")
+    batch.add_argument("--skip-contacted-days", type=float, default=None, metavar="DAYS",
+                       help="Skip people contacted within the last DAYS days (or set SKIP_CONTACTED_DAYS)")
+    batch.set_defaults(handler=cmd_batch)
+
+    resume = subcommands.add_parser("resume", parents=[common, workers],
+                                    help="Resume the unfinished jobs of a batch")
+    resume.add_argument("batch_id", nargs="?", default=None,
+                        help="Batch to resume (default: the most recent one)")
+    resume.add_argument("--retry-failed", action="store_true", help="Also re-run jobs that failed")
+    resume.set_defaults(handler=cmd_resume)
+
+    # bench has its own parser; everything after 'bench' is passed on to it
+    subcommands.add_parser("bench", add_help=False, help="Offline benchmark against the mock site")
+
+    stats = subcommands.add_parser("stats", help="Show result, batch and contact statistics")
+    stats.add_argument("--days", type=float, default=None, help="Only count results of the last N days")
+    stats.add_argument("--selectors", action="store_true", help="Also show selector strategy stats")
+    stats.set_defaults(handler=cmd_stats)
+    return parser
+
+
+def _legacy_command(argv: List[str]) -> str:
+    """Subcommand main_async.py would have run for options given without one."""
+    if os.getenv('BATCH_MODE', 'false').lower() == 'true':
+        return "batch"
+    if any(arg.split("=", 1)[0] in _BATCH_OPTIONS for arg in argv):
+        return "batch"
+    return "run"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    load_dotenv(override=True)
+
+    if argv[:1] == ["bench"]:
+        from src.linkedin_msg import bench
+
+        return bench.main(argv[1:])
+
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        argv = [_legacy_command(argv)] + argv
+    args = build_parser().parse_args(argv)
+
+    if args.command in ("run", "batch", "resume"):
+        status = _check(args)
+        if status is not None:
+            return status
+        _apply_common(args)
+    return args.handler(args)
+
+
+def _crew_inputs() -> dict:
+    load_dotenv(override=True)
+    return {
+        'person_name': os.getenv('PERSON_NAME', 'John Smith'),
+        'connection_note': os.getenv('CONNECTION_NOTE',
+                                     'Hi! I came across your profile and would love to connect.'),
+    }
+
+
+def train():
+    """Train the crew: train <n_iterations> <filename> (used by `crewai train`)."""
+    from src.linkedin_msg.crew import LinkedinMsg
+    from src.linkedin_msg.tools.driver_pool import get_default_pool
+
+    with get_default_pool().lease():
+        LinkedinMsg().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=_crew_inputs())
+
+
+def replay():
+    """Replay the crew from a task: replay <task_id> (used by `crewai replay`)."""
+    from src.linkedin_msg.crew import LinkedinMsg
+    from src.linkedin_msg.tools.driver_pool import get_default_pool
+
+    with get_default_pool().lease():
+        LinkedinMsg().crew().replay(task_id=sys.argv[1])
+
+
+def test():
+    """Test the crew: test <n_iterations> <eval_llm> (used by `crewai test`)."""
+    from src.linkedin_msg.crew import LinkedinMsg
+    from src.linkedin_msg.tools.driver_pool import get_default_pool
+
+    with get_default_pool().lease():
+        LinkedinMsg().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=_crew_inputs())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""
+Index of people that were already contacted, and the batch pre-flight check.
+
+Every run that sends a request or message, or finds the person already
+connected or pending, is recorded under the normalized name and the profile
+URL. Before a batch is scheduled, preflight() drops duplicate names within
+the batch and, optionally, people contacted within the last N days, so they
+do not cost a search and a profile page load just to find no Connect button.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Iterable, Iterator, List, Optional
+
+from src.linkedin_msg.storage import cache_dir
+from src.linkedin_msg.tools.profile_cache import (
+    canonical_profile_url,
+    get_profile_cache,
+    normalize_query,
+    profile_cache_enabled,
+)
+
+# Keyed by name and profile, so different people with the same name are all
+# kept; a run that did not resolve the profile is recorded with an empty URL
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    name_key     TEXT NOT NULL,
+    name         TEXT NOT NULL,
+    profile_url  TEXT NOT NULL DEFAULT '',
+    status       TEXT NOT NULL,
+    contacted_at REAL NOT NULL,
+    PRIMARY KEY (name_key, profile_url)
+);
+CREATE INDEX IF NOT EXISTS contacts_profile_url ON contacts (profile_url);
+"""
+
+# Connect/message statuses that mean the person has been reached
+CONTACTED_STATUSES = ("request_sent", "message_sent", "pending", "already_connected")
+
+# Skipped people kept and listed one by one in the batch summary
+MAX_LISTED_SKIPS = 20
+
+
+def skip_contacted_days() -> float:
+    """Days within which a contacted person is skipped (SKIP_CONTACTED_DAYS, 0 = never)."""
+    return float(os.getenv('SKIP_CONTACTED_DAYS', '0'))
+
+
+def contacted_status(result: dict) -> Optional[str]:
+    """Return the status a run_single result is indexed under, or None if nobody was reached."""
+    if result.get('status') != 'success':
+        return None
+    for status in (result.get('message'), result.get('connect')):
+        if status in CONTACTED_STATUSES:
+            return status
+    return None
+
+
+class ContactIndex:
+    """SQLite-backed normalized name / profile URL → (status, timestamp) index."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('LINKEDIN_CONTACT_INDEX') or os.path.join(cache_dir(), 'contacts.sqlite3')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._migrate()
+        self._conn.executescript(_SCHEMA)
+
+    def _migrate(self):
+        """Move the rows of an index keyed by name only into the current table."""
+        columns = self._conn.execute("PRAGMA table_info(contacts)").fetchall()
+        if sum(1 for column in columns if column['pk']) != 1:
+            return
+        with self._conn:
+            self._conn.execute("ALTER TABLE contacts RENAME TO contacts_by_name")
+            self._conn.execute("DROP INDEX IF EXISTS contacts_profile_url")
+        self._conn.executescript(_SCHEMA)
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contacts"
+                " SELECT name_key, name, COALESCE(profile_url, ''), status, contacted_at FROM contacts_by_name"
+            )
+            self._conn.execute("DROP TABLE contacts_by_name")
+
+    def record(self, name: str, status: str, profile_url: Optional[str] = None):
+        """Record that a person was contacted now."""
+        url = canonical_profile_url(profile_url) if profile_url else ''
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO contacts VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(name), name, url, status, time.time()),
+            )
+
+    def lookup(self, name: str) -> Optional[dict]:
+        """
+        Look up a person by name.
+
+        When the profile cache resolves the name to a profile URL, contacts
+        with that URL (under any name) or under this name without a URL
+        match, so a namesake with another profile does not. Otherwise the
+        most recent contact under the name is returned.
+
+        Returns:
+            Dict with 'name', 'profile_url', 'status' and 'contacted_at', or None.
+        """
+        cached = get_profile_cache().get(name) if profile_cache_enabled() else None
+        with self._lock:
+            if cached:
+                row = self._conn.execute(
+                    "SELECT * FROM contacts WHERE profile_url = ? OR (name_key = ? AND profile_url = '')"
+                    " ORDER BY contacted_at DESC LIMIT 1",
+                    (cached['profile_url'], normalize_query(name)),
+                ).fetchone()
+            else:
+                row = self._conn.execute(
+                    "SELECT * FROM contacts WHERE name_key = ? ORDER BY contacted_at DESC LIMIT 1",
+                    (normalize_query(name),),
+                ).fetchone()
+        if row is None:
+            return None
+        contact = dict(row)
+        contact.pop('name_key')
+        contact['profile_url'] = contact['profile_url'] or None
+        return contact
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+
+
+class Preflight:
+    """
+    Filter for the people of a batch, applied while they are streamed into the job store.
+
+    Names already seen are kept in a temporary SQLite database rather than in
+    memory, and of the skipped people only the count and the first
+    MAX_LISTED_SKIPS (name, reason) pairs are kept, so memory use does not
+    grow with the batch.
+    """
+
+    def __init__(self, index: Optional[ContactIndex] = None, skip_days: Optional[float] = None):
+        self.skip_days = skip_contacted_days() if skip_days is None else skip_days
+        self.index = index if index is not None else (get_contact_index() if self.skip_days > 0 else None)
+        self.skipped_count = 0
+        self.skipped: List[tuple] = []
+        # An empty path opens a private database on disk that is deleted on close
+        self._seen = sqlite3.connect('')
+        self._seen.execute("CREATE TABLE seen (name_key TEXT PRIMARY KEY)")
+
+    def _reason(self, name: str) -> Optional[str]:
+        inserted = self._seen.execute(
+            "INSERT OR IGNORE INTO seen VALUES (?)", (normalize_query(name),)
+        ).rowcount
+        if not inserted:
+            return "duplicate in batch"
+
+        if self.index is None:
+            return None
+        contact = self.index.lookup(name)
+        if contact is None:
+            return None
+        age_days = (time.time() - contact['contacted_at']) / 86400
+        if age_days > self.skip_days:
+            return None
+        return f"contacted {age_days:.0f} day(s) ago ({contact['status']})"
+
+    def filter(self, people: Iterable[dict]) -> Iterator[dict]:
+        """Yield the people that should be scheduled, in input order."""
+        for person in people:
+            reason = self._reason(person['name'])
+            if reason:
+                self.skipped_count += 1
+                if len(self.skipped) < MAX_LISTED_SKIPS:
+                    self.skipped.append((person['name'], reason))
+            else:
+                yield person
+
+    def print_summary(self):
+        """Print the skipped people and why they were skipped."""
+        if not self.skipped_count:
+            return
+        print(f"⏭️  Skipped before scheduling: {self.skipped_count}")
+        for name, reason in self.skipped:
+            print(f"   - {name}: {reason}")
+        if self.skipped_count > len(self.skipped):
+            print(f"   ... and {self.skipped_count - len(self.skipped)} more")
+
+
+_default_index: Optional[ContactIndex] = None
+_default_index_lock = threading.Lock()
+
+
+def get_contact_index() -> ContactIndex:
+    """Return the process-wide contact index, opening it on first use."""
+    global _default_index
+
+    with _default_index_lock:
+        if _default_index is None:
+            _default_index = ContactIndex()
+        return _default_index
@@ -1,7 +1,13 @@
+import threading
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
+from crewai.tasks.conditional_task import ConditionalTask
+from crewai.tasks.task_output import TaskOutput
 from typing import List
+from src.linkedin_msg.llm import get_llm
+from src.linkedin_msg.token_ledger import FIELDS, get_token_ledger
+from src.linkedin_msg.tools.results import parse_result
 from src.linkedin_msg.tools.linkedin_automation_tool import (
     LinkedInLoginTool,
     LinkedInSearchTool,
@@ -9,6 +15,16 @@ from src.linkedin_msg.tools.linkedin_automation_tool import (
     LinkedInConnectTool
 )
 
+# Connect results after which the message step still runs. After a new or
+# pending request there is no Message button, so the step is skipped.
+MESSAGE_AFTER_CONNECT = ("already_connected", "connect_unavailable")
+
+
+def should_message(connect_output: TaskOutput) -> bool:
+    """Condition of the message task, evaluated on the connect task's output."""
+    return parse_result(connect_output.raw)['status'] in MESSAGE_AFTER_CONNECT
+
+
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -28,10 +44,14 @@ class LinkedinMsg():
     # https://docs.crewai.com/concepts/agents#agent-tools
     @agent
     def linkedin_automation_agent(self) -> Agent:
+        config = self.agents_config['linkedin_automation_agent'] # type: ignore[index]
         return Agent(
-            config=self.agents_config['linkedin_automation_agent'], # type: ignore[index]
+            config=config,
+            llm=get_llm(config['llm']),
             verbose=True,
-            tools=[LinkedInLoginTool(), LinkedInSearchTool(), LinkedInConnectTool(), LinkedInMessageTool()]
+            tools=[LinkedInLoginTool(), LinkedInSearchTool(), LinkedInConnectTool(), LinkedInMessageTool()],
+            # Browser actions must run every time; see the crew's cache setting below
+            cache=False,
         )
 
     # To learn more about structured task outputs,
@@ -43,24 +63,46 @@ class LinkedinMsg():
             config=self.tasks_config['linkedin_login_task'], # type: ignore[index]
         )
 
+    # Each task only gets the result of the step it depends on as context,
+    # instead of the outputs of every earlier task
     @task
     def linkedin_search_task(self) -> Task:
         return Task(
             config=self.tasks_config['linkedin_search_task'], # type: ignore[index]
+            context=[],
         )
 
     @task
     def linkedin_connect_task(self) -> Task:
         return Task(
             config=self.tasks_config['linkedin_connect_task'], # type: ignore[index]
+            context=[self.linkedin_search_task()],
         )
 
     @task
     def linkedin_message_task(self) -> Task:
-        return Task(
+        return ConditionalTask(
             config=self.tasks_config['linkedin_message_task'], # type: ignore[index]
+            context=[self.linkedin_search_task()],
+            condition=should_message,
         )
 
+    def _record_task_tokens(self, output):
+        """Task callback: book the tokens used since the previous task on this task."""
+        usage = {field: 0 for field in FIELDS}
+        for crew_agent in self.agents:
+            metrics = crew_agent._token_process.get_summary()
+            for field in FIELDS:
+                usage[field] += getattr(metrics, field, 0)
+        previous = getattr(self, '_usage_snapshot', {})
+        # Counters only grow unless the agent reset them; then the whole count is new
+        delta = {
+            field: value - previous.get(field, 0) if value >= previous.get(field, 0) else value
+            for field, value in usage.items()
+        }
+        self._usage_snapshot = usage
+        get_token_ledger().add(output.name or output.description[:40], delta)
+
     @crew
     def crew(self) -> Crew:
         """Creates the LinkedinMsg crew"""
@@ -72,5 +114,27 @@ class LinkedinMsg():
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
             verbose=True,
+            task_callback=self._record_task_tokens,
+            # The crew is reused for every person a worker handles (see worker_crew), so a
+            # tool cache would answer a later login or connect with an earlier person's result
+            cache=False,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
+
+
+_worker_crews = threading.local()
+
+
+def worker_crew() -> Crew:
+    """
+    Return the calling thread's crew, building it on first use.
+
+    A crew resets its per-run state on every kickoff, so it can be kicked off
+    again with new inputs, but not by two threads at once. Batch runs execute
+    crews on the driver pool's worker threads, so each worker builds the
+    agent, tasks and tools once and reuses them for every person it handles.
+    """
+    instance = getattr(_worker_crews, 'crew', None)
+    if instance is None:
+        instance = _worker_crews.crew = LinkedinMsg().crew()
+    return instance
@@ -0,0 +1,96 @@
+"""
+Error taxonomy and retry policy for the automation steps.
+
+Failures are classified into a small set of kinds, so that callers can tell
+a page load that timed out (worth retrying in a second) from a person that
+does not exist (never worth retrying). Tools put the kind into their error
+results (see tools/results.py) and the direct pipeline retries the failed
+step according to a RetryPolicy.
+"""
+
+import os
+import random
+from typing import Optional
+
+from selenium.common.exceptions import (
+    ElementClickInterceptedException,
+    InvalidSessionIdException,
+    NoSuchWindowException,
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+
+from src.linkedin_msg.tools.results import parse_result
+
+# Error kinds
+TRANSIENT = "transient"                  # page load, navigation or wait timed out; retry the step
+STALE_ELEMENT = "stale_element"          # the page changed under an element lookup; retry the step
+AUTH_LOST = "auth_lost"                  # LinkedIn logged the session out; log in again, then retry
+NOT_FOUND = "not_found"                  # the person or profile does not exist; permanent
+ALREADY_CONNECTED = "already_connected"  # nothing to do for this person; permanent
+PERMANENT = "permanent"                  # anything else; retrying would not help
+
+RETRYABLE_KINDS = (TRANSIENT, STALE_ELEMENT, AUTH_LOST)
+
+# Tool result statuses that imply a kind without carrying one
+_STATUS_KINDS = {
+    'not_logged_in': AUTH_LOST,
+    'no_results': NOT_FOUND,
+    'page_error': TRANSIENT,
+    'already_connected': ALREADY_CONNECTED,
+    'pending': ALREADY_CONNECTED,
+    'missing_credentials': PERMANENT,
+    'daily_cap_reached': PERMANENT,
+}
+
+# WebDriver error messages of network-level failures
+_TRANSIENT_MESSAGES = ("net::err_", "timed out", "timeout", "disconnected", "connection refused")
+
+
+def classify_exception(exc: BaseException) -> str:
+    """Return the error kind of an exception raised while driving the browser."""
+    if isinstance(exc, StaleElementReferenceException):
+        return STALE_ELEMENT
+    if isinstance(exc, (TimeoutException, ElementClickInterceptedException)):
+        return TRANSIENT
+    if isinstance(exc, (InvalidSessionIdException, NoSuchWindowException)):
+        # The browser itself is gone; the pool replaces it for the next person
+        return PERMANENT
+    if isinstance(exc, WebDriverException):
+        message = (exc.msg or str(exc)).lower()
+        if any(marker in message for marker in _TRANSIENT_MESSAGES):
+            return TRANSIENT
+    if isinstance(exc, (TimeoutError, ConnectionError)):
+        return TRANSIENT
+    return PERMANENT
+
+
+def error_kind(output) -> Optional[str]:
+    """Return the error kind of a tool result, or None if it does not describe a failure."""
+    result = parse_result(output)
+    return result.get('kind') or _STATUS_KINDS.get(result['status'])
+
+
+class RetryPolicy:
+    """
+    Retry budget and jittered exponential backoff for failed steps.
+
+    Attempt n waits between half and all of min(max_delay, base_delay * 2**(n-1))
+    seconds, so parallel workers that fail together do not retry in lockstep.
+    """
+
+    def __init__(self, max_attempts: Optional[int] = None, base_delay: Optional[float] = None,
+                 max_delay: Optional[float] = None):
+        self.max_attempts = int(os.getenv('RETRY_MAX_ATTEMPTS', '3')) if max_attempts is None else max_attempts
+        self.base_delay = float(os.getenv('RETRY_BASE_DELAY', '1.0')) if base_delay is None else base_delay
+        self.max_delay = float(os.getenv('RETRY_MAX_DELAY', '15')) if max_delay is None else max_delay
+
+    def should_retry(self, kind: Optional[str], attempt: int) -> bool:
+        """True if a step that failed with `kind` on its `attempt`-th try should run again."""
+        return kind in RETRYABLE_KINDS and attempt < self.max_attempts
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before the retry that follows the `attempt`-th try."""
+        cap = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return cap / 2 + random.uniform(0, cap / 2)
@@ -0,0 +1,134 @@
+"""
+Streaming loaders for batch input files.
+
+Rows are read and validated one at a time, so arbitrarily large CSV or JSONL
+files can be fed into a batch with constant memory.
+
+CSV files need a header row with a `name` (or `person_name`) column and an
+optional `note` (or `connection_note`) column. JSONL files hold one object per
+line with the same keys.
+"""
+
+import csv
+import json
+import os
+from typing import Iterator, List, Optional
+
+NAME_KEYS = ('name', 'person_name')
+NOTE_KEYS = ('note', 'connection_note')
+MAX_NOTE_LENGTH = 300
+
+
+class InputFormatError(ValueError):
+    """Raised when an input file cannot be read as a batch file at all."""
+
+
+def _first(row: dict, keys) -> str:
+    for key in keys:
+        value = row.get(key)
+        if value:
+            return str(value).strip()
+    return ""
+
+
+def _validate(row: dict, line: int, default_note: Optional[str]) -> Optional[dict]:
+    """Turn a raw row into a person dict, or return None (with a warning) if it is unusable."""
+    name = _first(row, NAME_KEYS)
+    if not name:
+        print(f"⚠️  Line {line}: missing name, skipping row")
+        return None
+
+    note = _first(row, NOTE_KEYS) or default_note
+    if not note:
+        print(f"⚠️  Line {line}: no note for '{name}' and no default note, skipping row")
+        return None
+    if len(note) > MAX_NOTE_LENGTH:
+        print(f"⚠️  Line {line}: note for '{name}' is {len(note)} characters, "
+              f"LinkedIn may reject notes over {MAX_NOTE_LENGTH}")
+
+    return {'name': name, 'note': note}
+
+
+def _iter_csv(path: str) -> Iterator[tuple]:
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = [field.strip().lower() for field in (reader.fieldnames or [])]
+        if not any(key in fields for key in NAME_KEYS):
+            raise InputFormatError(f"{path}: CSV header needs a 'name' or 'person_name' column")
+        reader.fieldnames = fields
+        for row in reader:
+            yield reader.line_num, row
+
+
+def _iter_jsonl(path: str) -> Iterator[tuple]:
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"⚠️  Line {line_number}: invalid JSON ({e.msg}), skipping row")
+                continue
+            if not isinstance(row, dict):
+                print(f"⚠️  Line {line_number}: expected a JSON object, skipping row")
+                continue
+            yield line_number, row
+
+
+def iter_people(path: str, default_note: Optional[str] = None) -> Iterator[dict]:
+    """
+    Stream validated people from a CSV or JSONL file.
+
+    Args:
+        path: Path to a .csv, .jsonl or .ndjson file
+        default_note: Note used for rows that don't have one
+
+    Yields:
+        Dicts with 'name' and 'note' keys, in file order.
+
+    Raises:
+        InputFormatError: If the file is not UTF-8 text, is malformed CSV or
+            has an unsupported extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.csv':
+        rows = _iter_csv(path)
+    elif extension in ('.jsonl', '.ndjson'):
+        rows = _iter_jsonl(path)
+    else:
+        raise InputFormatError(f"{path}: unsupported input format '{extension}' (use .csv or .jsonl)")
+
+    try:
+        for line, row in rows:
+            person = _validate(row, line, default_note)
+            if person:
+                yield person
+    except UnicodeDecodeError as e:
+        raise InputFormatError(f"{path}: not UTF-8 text ({e.reason})") from e
+    except csv.Error as e:
+        raise InputFormatError(f"{path}: malformed CSV ({str(e)})") from e
+
+
+def env_people() -> List[dict]:
+    """
+    Read a batch from PERSON_NAMES (comma-separated) and CONNECTION_NOTES (pipe-separated).
+
+    A single note is used for everyone; if the counts don't match, the first
+    note is used for everyone with a warning. Returns an empty list if no
+    names are set.
+    """
+    names = [name.strip() for name in os.getenv('PERSON_NAMES', '').split(',') if name.strip()]
+    notes = [note.strip() for note in os.getenv('CONNECTION_NOTES', '').split('|') if note.strip()]
+    if not names:
+        return []
+
+    # If only one note provided, use it for all
+    if len(notes) == 1:
+        notes = notes * len(names)
+    elif len(notes) != len(names):
+        print(f"⚠️  Warning: {len(names)} names but {len(notes)} notes. Using first note for all.")
+        notes = [notes[0] if notes else "Hi! Would love to connect."] * len(names)
+
+    return [{'name': name, 'note': note} for name, note in zip(names, notes)]
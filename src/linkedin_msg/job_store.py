@@ -0,0 +1,192 @@
+"""
+Durable store for batch runs.
+
+Every person in a batch is a row in a local SQLite file with its state,
+attempt count and last result, so an interrupted batch can be resumed
+without redoing completed work.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from src.linkedin_msg.storage import cache_dir
+from src.linkedin_msg.tools.results import parse_result
+
+# Job states
+PENDING = "pending"
+RUNNING = "running"
+SENT = "sent"
+SKIPPED = "skipped"
+FAILED = "failed"
+
+UNFINISHED_STATES = (PENDING, RUNNING)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    batch_id        TEXT NOT NULL,
+    position        INTEGER NOT NULL,
+    person_name     TEXT NOT NULL,
+    connection_note TEXT NOT NULL,
+    state           TEXT NOT NULL DEFAULT 'pending',
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    last_result     TEXT,
+    updated_at      REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_batch_state ON jobs (batch_id, state, position);
+"""
+
+# Tool result statuses that mean there was nothing to send
+_SKIPPED_STATUSES = ("already_connected", "pending", "connect_unavailable")
+
+# Tool result statuses of a run that stopped before its outbound action and should run again
+_DEFERRED_STATUSES = ("daily_cap_reached",)
+
+
+def job_state_for(result: dict) -> str:
+    """Map a run_single result dict to the job state it leaves the person in."""
+    if result.get('status') != 'success':
+        if parse_result(result.get('error', ''))['status'] in _DEFERRED_STATUSES:
+            return PENDING
+        return FAILED
+    if result.get('message') == 'message_sent':
+        return SENT
+    connect = result.get('connect') or parse_result(result.get('result', ''))['status']
+    if connect in _DEFERRED_STATUSES or result.get('message') in _DEFERRED_STATUSES:
+        return PENDING
+    if connect in _SKIPPED_STATUSES:
+        return SKIPPED
+    return SENT
+
+
+class JobStore:
+    """SQLite-backed job table shared by run_batch and resume."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('LINKEDIN_JOB_STORE') or os.path.join(cache_dir(), 'jobs.sqlite3')
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.executescript(_SCHEMA)
+
+    def create_batch(self, people: Iterable[dict], batch_id: Optional[str] = None) -> str:
+        """
+        Create a batch with one pending job per person.
+
+        Args:
+            people: Dicts with 'name' and 'note' keys; any iterable works and
+                is consumed lazily
+            batch_id: Optional explicit id; a timestamped id is generated otherwise
+
+        Returns:
+            The batch id.
+        """
+        batch_id = batch_id or f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        self.add_jobs(batch_id, people)
+        return batch_id
+
+    def add_jobs(self, batch_id: str, people: Iterable[dict], start_position: int = 0):
+        """Append pending jobs to a batch."""
+        now = time.time()
+        rows = (
+            (batch_id, start_position + i, person['name'], person['note'], now)
+            for i, person in enumerate(people)
+        )
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO jobs (batch_id, position, person_name, connection_note, updated_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @staticmethod
+    def _states(include_failed: bool) -> tuple:
+        return UNFINISHED_STATES + ((FAILED,) if include_failed else ())
+
+    def iter_unfinished(self, batch_id: str, include_failed: bool = False,
+                        page_size: int = 500) -> Iterator[dict]:
+        """
+        Stream the jobs of a batch that still need to run, in input order.
+
+        Jobs left in 'running' were interrupted by a crash and are included.
+        Rows are fetched page by page, so memory stays constant for any batch size.
+        """
+        states = self._states(include_failed)
+        placeholders = ", ".join("?" for _ in states)
+        last_position = -1
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT * FROM jobs WHERE batch_id = ? AND state IN ({placeholders})"
+                    f" AND position > ? ORDER BY position LIMIT ?",
+                    (batch_id, *states, last_position, page_size),
+                ).fetchall()
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+            last_position = rows[-1]['position']
+
+    def unfinished(self, batch_id: str, include_failed: bool = False) -> List[dict]:
+        """Return the jobs of a batch that still need to run, in input order."""
+        return list(self.iter_unfinished(batch_id, include_failed))
+
+    def count_unfinished(self, batch_id: str, include_failed: bool = False) -> int:
+        """Return the number of jobs of a batch that still need to run."""
+        states = self._states(include_failed)
+        placeholders = ", ".join("?" for _ in states)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(*) AS n FROM jobs WHERE batch_id = ? AND state IN ({placeholders})",
+                (batch_id, *states),
+            ).fetchone()
+        return row['n']
+
+    def mark_running(self, job_id: int):
+        """Mark a job as started and count the attempt."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (RUNNING, time.time(), job_id),
+            )
+
+    def finish(self, job_id: int, result: dict) -> str:
+        """Record the result of a job and return its new state."""
+        state = job_state_for(result)
+        last_result = {
+            'status': result.get('status'),
+            'result': str(result['result']) if 'result' in result else None,
+            'error': result.get('error'),
+            'connect': result.get('connect'),
+            'message': result.get('message'),
+            'outcome': result['record'].status.value if 'record' in result else None,
+        }
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE jobs SET state = ?, last_result = ?, updated_at = ? WHERE id = ?",
+                (state, json.dumps(last_result), time.time(), job_id),
+            )
+        return state
+
+    def latest_batch_id(self) -> Optional[str]:
+        """Return the id of the most recently created batch."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT batch_id FROM jobs ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        return row['batch_id'] if row else None
+
+    def summary(self, batch_id: str) -> dict:
+        """Return the number of jobs per state for a batch."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT state, COUNT(*) AS n FROM jobs WHERE batch_id = ? GROUP BY state",
+                (batch_id,),
+            ).fetchall()
+        return {row['state']: row['n'] for row in rows}
@@ -0,0 +1,186 @@
+"""
+LLM wrapper used by the crew agents.
+
+Calls are traced, and their responses are cached per prompt template: the
+per-person values in the prompt (see prompt_params) are replaced by
+placeholders before hashing, so the same decision for a different person is
+served from the cache with that person's values filled back in.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from crewai import LLM
+
+from src.linkedin_msg.tracing import span
+
+_prompt_params: ContextVar[Dict[str, str]] = ContextVar('linkedin_prompt_params', default={})
+
+
+@contextmanager
+def prompt_params(**params: str):
+    """Declare the per-person values that are interpolated into the prompts of this context."""
+    token = _prompt_params.set({name: value for name, value in params.items() if value})
+    try:
+        yield
+    finally:
+        _prompt_params.reset(token)
+
+
+def _substitutions(params: Dict[str, str]) -> List[Tuple[re.Pattern, str, str]]:
+    # Longest values first, so a note containing the name is replaced as a whole
+    items = sorted(params.items(), key=lambda item: len(item[1]), reverse=True)
+    return [
+        (re.compile(r'(?<!\w)' + re.escape(value) + r'(?!\w)'), '{' + name + '}', value)
+        for name, value in items
+    ]
+
+
+def normalize_prompt(text: str, params: Dict[str, str]) -> str:
+    """Replace the per-person values in `text` with {name} placeholders."""
+    for pattern, placeholder, _ in _substitutions(params):
+        text = pattern.sub(lambda _: placeholder, text)
+    return text
+
+
+def fill_prompt(text: str, params: Dict[str, str]) -> str:
+    """Inverse of normalize_prompt()."""
+    for _, placeholder, value in _substitutions(params):
+        text = text.replace(placeholder, value)
+    return text
+
+
+def _tool_schema_hash(tools, agent) -> str:
+    if tools is None:
+        tools = [
+            {'name': tool.name, 'description': tool.description,
+             'args': tool.args_schema.model_json_schema()}
+            for tool in getattr(agent, 'tools', None) or []
+        ]
+    return hashlib.sha256(json.dumps(tools, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def llm_cache_enabled() -> bool:
+    """LLM response caching is on unless LLM_CACHE=false."""
+    return os.getenv('LLM_CACHE', 'true').lower() == 'true'
+
+
+class LLMCallCache:
+    """In-memory LRU cache of normalized LLM responses with hit-rate metrics."""
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '512')) if max_entries is None else max_entries
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            response = self._entries.get(key)
+            if response is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return response
+
+    def put(self, key: str, response: str):
+        with self._lock:
+            self._entries[key] = response
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        """Return hits, misses, evictions, size and hit rate."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            }
+
+
+_llm_cache = LLMCallCache()
+
+
+def get_llm_cache() -> LLMCallCache:
+    """Return the process-wide LLM response cache."""
+    return _llm_cache
+
+
+class TracedLLM(LLM):
+    """crewai LLM whose calls are traced as 'llm.call' spans and served from the response cache."""
+
+    def _cache_key(self, messages, tools, from_agent, params: Dict[str, str]) -> str:
+        if isinstance(messages, str):
+            messages = [{'role': 'user', 'content': messages}]
+        normalized = [
+            {**message, 'content': normalize_prompt(message['content'], params)}
+            if isinstance(message.get('content'), str) else message
+            for message in messages
+        ]
+        payload = {
+            'model': self.model,
+            'temperature': getattr(self, 'temperature', None),
+            'tools': _tool_schema_hash(tools, from_agent),
+            'messages': normalized,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        task_name = getattr(from_task, 'name', None)
+        # With available_functions the call executes tools itself, so it must not be skipped
+        cacheable = llm_cache_enabled() and available_functions is None
+        with span("llm.call", model=self.model, task=task_name) as current:
+            if cacheable:
+                params = _prompt_params.get()
+                key = self._cache_key(messages, tools, from_agent, params)
+                cached = get_llm_cache().get(key)
+                if cached is not None:
+                    current.set(cache="hit")
+                    return fill_prompt(cached, params)
+                current.set(cache="miss")
+
+            response = super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                from_task=from_task,
+                from_agent=from_agent,
+            )
+            if cacheable and isinstance(response, str) and response:
+                get_llm_cache().put(key, normalize_prompt(response, params))
+            return response
+
+
+_shared_llms: Dict[str, TracedLLM] = {}
+_shared_llms_lock = threading.Lock()
+
+
+def get_llm(model: str) -> TracedLLM:
+    """
+    Return the process-wide LLM client for `model`, creating it on first use.
+
+    Sharing one client keeps its HTTP connections warm across crews and
+    saves re-validating the model configuration for every person.
+    """
+    with _shared_llms_lock:
+        if model not in _shared_llms:
+            _shared_llms[model] = TracedLLM(model=model)
+        return _shared_llms[model]
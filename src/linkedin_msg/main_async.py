@@ -8,6 +8,9 @@ import sys
 import os
 import warnings
 import asyncio
+import argparse
+import time
+from collections import Counter
 from dotenv import load_dotenv
 from datetime import datetime
 
@@ -17,15 +20,86 @@ load_dotenv(override=True)
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from src.linkedin_msg.crew import LinkedinMsg
+from src.linkedin_msg.crew import worker_crew
+from src.linkedin_msg.llm import get_llm_cache, prompt_params
+from src.linkedin_msg.token_ledger import get_token_ledger, print_token_summary
+from src.linkedin_msg.pipeline import arun_direct, COMPLETED, FAILED
+from src.linkedin_msg.errors import classify_exception, error_kind
+from src.linkedin_msg.tools.results import parse_result
+from src.linkedin_msg.tools.browser_profiles import load_browser_profiles
+from src.linkedin_msg.tools.driver_pool import get_default_pool
+from src.linkedin_msg.tools.lookahead import lookahead_enabled
+from src.linkedin_msg.tools.profile_cache import normalize_query
+from src.linkedin_msg.job_store import JobStore
+from src.linkedin_msg.contacts import Preflight, contacted_status, get_contact_index
+from src.linkedin_msg.records import STEP_PREFIX, get_result_sink, run_record
+from src.linkedin_msg.scheduler import BatchScheduler, PacingBudget
+from src.linkedin_msg.inputs import env_people, iter_people, InputFormatError
+from src.linkedin_msg.tracing import (
+    collect_spans, end_run, get_tracer, print_summary, span, start_run, trace_person,
+)
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
 
-async def run_single(person_name: str, connection_note: str):
+def _kickoff(inputs: dict):
+    """Run this worker thread's crew for one person (blocking)."""
+    return worker_crew().kickoff(inputs=inputs)
+
+
+def _step_statuses(crew_output) -> dict:
+    """Profile URL, connect and message status of a crew run; a message task skipped by its condition is 'skipped'."""
+    outputs = {output.name: output.raw for output in crew_output.tasks_output}
+    statuses = {}
+    if 'linkedin_search_task' in outputs:
+        statuses['profile_url'] = parse_result(outputs['linkedin_search_task']).get('url')
+    if 'linkedin_connect_task' in outputs:
+        statuses['connect'] = parse_result(outputs['linkedin_connect_task'])['status']
+        # The output of a skipped ConditionalTask has no name, so it never shows up under
+        # the message task's name; a missing or empty message output means it was skipped
+        raw = outputs.get('linkedin_message_task')
+        statuses['message'] = parse_result(raw)['status'] if raw else 'skipped'
+    return statuses
+
+
+async def run_single(person_name: str, connection_note: str, direct: bool = False,
+                     lookahead: str = None):
     """
     Run automation for a single person asynchronously.
+
+    With direct=True the login, search and connect tools are called in code and
+    the agent only runs if one of those steps returns an ambiguous result.
+
+    The run leases its own browser from the driver pool, so concurrent runs
+    never share a WebDriver. All spans recorded while it runs are attributed
+    to `person_name` in the run trace.
+
+    The returned dict carries a typed RunResult under 'record', which is also
+    appended to the result sink (see records.py).
+
+    `lookahead` is the name of the person the caller runs next; in direct mode
+    their search is loaded in a second tab during this person's connect step.
     """
+    started = time.perf_counter()
+    with trace_person(person_name), span("person", direct=direct) as person_span, \
+            collect_spans(STEP_PREFIX) as step_spans:
+        result = await _run_single(person_name, connection_note, direct, lookahead)
+        person_span.outcome = "ok" if result['status'] == 'success' else result['status']
+        person_span.set(**{step: result[step] for step in ('connect', 'message') if result.get(step)})
+    contacted = contacted_status(result)
+    if contacted:
+        get_contact_index().record(person_name, contacted, result.get('profile_url'))
+
+    tracer = get_tracer()
+    record = run_record(result, step_spans, seconds=time.perf_counter() - started,
+                        run_id=tracer.run_id if tracer else None)
+    get_result_sink().write(record)
+    result['record'] = record
+    return result
+
+
+async def _run_single(person_name: str, connection_note: str, direct: bool, lookahead: str = None):
+    """Body of run_single(), timed as the 'person' span."""
     print(f"\n🚀 Starting automation for: {person_name}")
 
     inputs = {
@@ -33,51 +107,117 @@ async def run_single(person_name: str, connection_note: str):
         'connection_note': connection_note
     }
 
+    pool = get_default_pool()
     try:
-        # Use async kickoff
-        result = await LinkedinMsg().crew().kickoff_async(inputs=inputs)
+        # Prefer the browser that already loaded this person's search in a lookahead tab
+        async with pool.session(affinity=normalize_query(person_name)):
+            if direct:
+                outcome = await arun_direct(person_name, connection_note, lookahead=lookahead)
+                step_output = outcome['outputs'][outcome['step']]
+                if outcome['status'] == COMPLETED:
+                    print(f"✅ Completed for: {person_name} (direct)")
+                    # The direct pipeline stops after connect; messaging is left to the agent path
+                    connect = parse_result(outcome['outputs']['connect'])['status']
+                    profile_url = parse_result(outcome['outputs']['search']).get('url')
+                    return {'person': person_name, 'status': 'success', 'result': step_output,
+                            'profile_url': profile_url, 'connect': connect, 'message': 'skipped',
+                            'retries': outcome['retries']}
+                if outcome['status'] == FAILED:
+                    print(f"❌ Failed for {person_name}: {step_output}")
+                    return {'person': person_name, 'status': 'failed', 'error': step_output,
+                            'error_kind': error_kind(step_output), 'retries': outcome['retries']}
+                print(f"⚠️  Ambiguous {outcome['step']} result for {person_name}, falling back to the agent")
+
+            # The crew and its tools block, so run them on one of the pool's worker threads
+            with prompt_params(**inputs):
+                result = await pool.run_blocking(_kickoff, inputs)
         print(f"✅ Completed for: {person_name}")
-        return {'person': person_name, 'status': 'success', 'result': result}
+        return {'person': person_name, 'status': 'success', 'result': result, **_step_statuses(result)}
     except Exception as e:
         print(f"❌ Failed for {person_name}: {str(e)}")
-        return {'person': person_name, 'status': 'failed', 'error': str(e)}
+        return {'person': person_name, 'status': 'failed', 'error': str(e),
+                'error_class': type(e).__name__, 'error_kind': classify_exception(e)}
 
 
-async def run_batch(people: list):
-    """
-    Run automation for multiple people in parallel.
+async def _run_job(store: JobStore, job: dict, direct: bool, upcoming: dict = None):
+    """Run one stored job and record its outcome; `upcoming` is the job the same worker runs next."""
+    store.mark_running(job['id'])
+    result = await run_single(job['person_name'], job['connection_note'], direct=direct,
+                              lookahead=upcoming['person_name'] if upcoming else None)
+    store.finish(job['id'], result)
+    return result
 
-    Args:
-        people: List of dicts with 'name' and 'note' keys
 
-    Example:
-        people = [
-            {'name': 'John Smith', 'note': 'Hi John! ...'},
-            {'name': 'Jane Doe', 'note': 'Hi Jane! ...'},
-            {'name': 'Bob Wilson', 'note': 'Hi Bob! ...'}
-        ]
+async def stream_jobs(store: JobStore, jobs, direct: bool, workers: int = None):
+    """
+    Run stored jobs through the bounded scheduler.
+
+    Yields:
+        (job, result) pairs in completion order.
     """
+    # More workers than browsers would only queue up waiting for one
+    pool = get_default_pool()
+    workers = workers or int(os.getenv('BATCH_WORKERS', str(pool.size)))
+    if workers > pool.size:
+        print(f"[INFO] Limiting workers to the driver pool size ({pool.size}); raise DRIVER_POOL_SIZE for more")
+        workers = pool.size
+    scheduler = BatchScheduler(
+        lambda job, upcoming=None: _run_job(store, job, direct, upcoming),
+        workers=workers,
+        pacing=PacingBudget(),
+        # Lookahead tabs are driven by the direct pipeline; the agent picks its own steps
+        lookahead=direct and lookahead_enabled(),
+    )
+
+    # Start the browsers up front so every worker gets a warm one
+    await asyncio.to_thread(pool.warm, min(pool.size, scheduler.workers))
+
+    async for job, result in scheduler.run(jobs):
+        yield job, result
+
+    if scheduler.stop_reason:
+        print(f"⏸️  Stopped early: {scheduler.stop_reason}. Unstarted jobs stay pending for --resume.")
+
+
+async def _run_jobs(store: JobStore, batch_id: str, direct: bool, include_failed: bool = False,
+                   workers: int = None, collect_results: bool = True, preflight: Preflight = None):
+    """Run the unfinished jobs of a batch with bounded concurrency and print the summary."""
+    total = store.count_unfinished(batch_id, include_failed=include_failed)
+    jobs = store.iter_unfinished(batch_id, include_failed=include_failed)
+
     print(f"\n{'='*60}")
     print(f"🔗 LinkedIn Batch Automation")
     print(f"{'='*60}")
-    print(f"📊 Processing {len(people)} connection requests in parallel")
+    print(f"🗂️  Batch ID: {batch_id} (resume with --resume {batch_id})")
+    print(f"📊 Processing {total} connection requests")
+    if preflight and preflight.skipped_count:
+        print(f"⏭️  Skipped {preflight.skipped_count} duplicate or already contacted people")
+    tracer = start_run()
+    get_token_ledger().reset()
+    if tracer:
+        print(f"🧭 Trace: {tracer.path}")
     print(f"{'='*60}\n")
 
-    # Create tasks for all people
-    tasks = [
-        run_single(person['name'], person['note'])
-        for person in people
-    ]
+    results = []
+    successful = failed = 0
+    outcomes = Counter()
 
-    # Run all tasks in parallel
     start_time = datetime.now()
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    async for job, result in stream_jobs(store, jobs, direct, workers=workers):
+        record = result.get('record') if isinstance(result, dict) else None
+        if record is not None and record.ok:
+            successful += 1
+        else:
+            failed += 1
+        outcomes[record.status.value if record is not None else 'failed'] += 1
+        if collect_results:
+            results.append(result)
     end_time = datetime.now()
 
     # Print summary
     elapsed_time = (end_time - start_time).total_seconds()
-    successful = sum(1 for r in results if isinstance(r, dict) and r.get('status') == 'success')
-    failed = len(results) - successful
+    states = store.summary(batch_id)
+    step_summary = end_run()
 
     print(f"\n{'='*60}")
     print(f"📊 BATCH AUTOMATION SUMMARY")
@@ -85,13 +225,89 @@ async def run_batch(people: list):
     print(f"⏱️  Total Time: {elapsed_time:.1f} seconds")
     print(f"✅ Successful: {successful}")
     print(f"❌ Failed: {failed}")
-    print(f"📈 Average Time per Person: {elapsed_time/len(people):.1f} seconds")
+    print(f"📈 Average Time per Person: {elapsed_time/max(successful + failed, 1):.1f} seconds")
+    print(f"🗂️  Batch state: " + ", ".join(f"{state}={n}" for state, n in sorted(states.items())))
+    if outcomes:
+        print(f"📬 Outcomes: " + ", ".join(f"{status}={n}" for status, n in outcomes.most_common()))
+        print(f"🧾 Results: {get_result_sink().path}")
+    if preflight:
+        preflight.print_summary()
+    llm_cache = get_llm_cache().stats()
+    if llm_cache['hits'] + llm_cache['misses']:
+        print(f"🧠 LLM cache: {llm_cache['hits']} hits, {llm_cache['misses']} misses "
+              f"({llm_cache['hit_rate']:.0%} hit rate)")
+    print(f"{'='*60}")
+    print_summary(step_summary)
+    token_summary = get_token_ledger().summary()
+    if token_summary:
+        print(f"{'='*60}")
+        print_token_summary(token_summary)
     print(f"{'='*60}\n")
 
     return results
 
 
-async def run():
+async def run_batch(people, direct: bool = False, store: JobStore = None, workers: int = None,
+                    collect_results: bool = True):
+    """
+    Run automation for multiple people with a bounded number of parallel workers.
+
+    Every person is recorded in the job store first, so the batch can be
+    picked up again with resume_batch() if the process dies. Duplicate names
+    are dropped on the way in, as is anyone contacted within the last
+    SKIP_CONTACTED_DAYS days (see contacts.Preflight).
+
+    Args:
+        people: Iterable of dicts with 'name' and 'note' keys (a generator such
+            as inputs.iter_people() is written to the job store row by row, and
+            all of it is read before the first person runs)
+        direct: Call the tools directly instead of going through the agent
+        store: Job store to record the batch in (defaults to the local one)
+        workers: Number of people processed at once (defaults to BATCH_WORKERS)
+        collect_results: Return the list of result dicts; disable for very large
+            batches so memory stays constant (the job store keeps every result)
+
+    Example:
+        people = [
+            {'name': 'John Smith', 'note': 'Hi John! ...'},
+            {'name': 'Jane Doe', 'note': 'Hi Jane! ...'},
+            {'name': 'Bob Wilson', 'note': 'Hi Bob! ...'}
+        ]
+    """
+    store = store or JobStore()
+    preflight = Preflight()
+    batch_id = store.create_batch(preflight.filter(people))
+    return await _run_jobs(store, batch_id, direct, workers=workers, collect_results=collect_results,
+                           preflight=preflight)
+
+
+async def resume_batch(batch_id: str = None, direct: bool = False,
+                       retry_failed: bool = False, store: JobStore = None, workers: int = None):
+    """
+    Resume a batch, running only the jobs that have not finished.
+
+    Args:
+        batch_id: Batch to resume (defaults to the most recent one)
+        direct: Call the tools directly instead of going through the agent
+        retry_failed: Also re-run jobs that ended in the failed state
+        store: Job store holding the batch (defaults to the local one)
+        workers: Number of people processed at once (defaults to BATCH_WORKERS)
+    """
+    store = store or JobStore()
+    batch_id = batch_id or store.latest_batch_id()
+    if not batch_id:
+        print("❌ No batch found to resume")
+        return []
+
+    if not store.count_unfinished(batch_id, include_failed=retry_failed):
+        print(f"✅ Batch {batch_id} has no unfinished jobs")
+        return []
+
+    return await _run_jobs(store, batch_id, direct, include_failed=retry_failed, workers=workers,
+                           collect_results=False)
+
+
+async def run(direct: bool = False):
     """
     Single person automation (asynchronous).
     """
@@ -99,23 +315,28 @@ async def run():
     connection_note = os.getenv('CONNECTION_NOTE',
         'Hi! I came across your profile and would love to connect.')
 
-    inputs = {
-        'person_name': person_name,
-        'connection_note': connection_note
-    }
-
+    tracer = start_run()
     try:
-        # Use async kickoff for single run
-        result = await LinkedinMsg().crew().kickoff_async(inputs=inputs)
+        outcome = await run_single(person_name, connection_note, direct=direct)
+        if outcome['status'] != 'success' and not direct:
+            raise Exception(outcome['error'])
+        result = outcome.get('result', outcome.get('error'))
         print("\n\n########################")
         print("## Here is the result")
         print("########################\n")
         print(result)
+        print(f"\n📬 Outcome: {outcome['record'].status.value} (recorded in {get_result_sink().path})")
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
+    finally:
+        step_summary = end_run()
+        if tracer:
+            print(f"\n🧭 Trace: {tracer.path}")
+            print_summary(step_summary)
+        print_token_summary(get_token_ledger().summary())
 
 
-def run_batch_sync():
+def run_batch_sync(direct: bool = False, workers: int = None):
     """
     Batch automation - runs async tasks from sync context.
 
@@ -130,38 +351,120 @@ def run_batch_sync():
         print("❌ BATCH_MODE not enabled. Set BATCH_MODE=true in .env")
         return
 
-    # Parse comma-separated names and notes
-    names = os.getenv('PERSON_NAMES', '').split(',')
-    notes = os.getenv('CONNECTION_NOTES', '').split('|')
-
-    # Clean up whitespace
-    names = [name.strip() for name in names if name.strip()]
-    notes = [note.strip() for note in notes if note.strip()]
-
-    if not names:
+    people = env_people()
+    if not people:
         print("❌ No names provided. Set PERSON_NAMES in .env (comma-separated)")
         return
 
-    # If only one note provided, use it for all
-    if len(notes) == 1:
-        notes = notes * len(names)
-    elif len(notes) != len(names):
-        print(f"⚠️  Warning: {len(names)} names but {len(notes)} notes. Using first note for all.")
-        notes = [notes[0] if notes else "Hi! Would love to connect."] * len(names)
+    # Run async batch
+    asyncio.run(run_batch(people, direct=direct, workers=workers))
 
-    # Create people list
-    people = [
-        {'name': name, 'note': note}
-        for name, note in zip(names, notes)
-    ]
 
-    # Run async batch
-    asyncio.run(run_batch(people))
+def run_file_sync(path: str, direct: bool = False, workers: int = None):
+    """
+    Batch automation from a CSV or JSONL file.
+
+    The whole file is read into the job store before the first person runs;
+    rows are streamed on the way in and the scheduler pages jobs back out, so
+    the file size does not affect memory use. Rows without a note use CONNECTION_NOTE.
+    """
+    people = iter_people(path, default_note=os.getenv('CONNECTION_NOTE'))
+    try:
+        asyncio.run(run_batch(people, direct=direct, workers=workers, collect_results=False))
+    except (InputFormatError, OSError) as e:
+        print(f"❌ Could not read {path}: {str(e)}")
+
+
+def resume_sync(batch_id: str = None, direct: bool = False, retry_failed: bool = False,
+                workers: int = None):
+    """Resume an interrupted batch from sync context."""
+    asyncio.run(resume_batch(batch_id, direct=direct, retry_failed=retry_failed, workers=workers))
+
+
+def parse_args(argv=None):
+    """Parse command line options."""
+    parser = argparse.ArgumentParser(description="LinkedIn connection request automation")
+    parser.add_argument(
+        "--direct",
+        action="store_true",
+        default=os.getenv('DIRECT_MODE', 'false').lower() == 'true',
+        help="Call the login/search/connect tools directly and only use the agent "
+             "when a step returns an ambiguous result (or set DIRECT_MODE=true)",
+    )
+    parser.add_argument(
+        "--input",
+        metavar="PATH",
+        help="Run a batch from a CSV or JSONL file with name/note columns "
+             "instead of PERSON_NAMES/CONNECTION_NOTES",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of people processed in parallel in batch mode (default: BATCH_WORKERS "
+             "or the driver pool size)",
+    )
+    parser.add_argument(
+        "--browser-profile",
+        choices=list(load_browser_profiles()),
+        default=None,
+        help="Browser profile from config/browser.yaml, e.g. 'batch' for headless, "
+             "resource-trimmed workers (or set BROWSER_PROFILE)",
+    )
+    parser.add_argument(
+        "--diagnostics",
+        action="store_true",
+        help="Record per-navigation network waterfalls (TTFB, DOMContentLoaded, slowest "
+             "resources) next to the run trace (or set DIAGNOSTICS=true)",
+    )
+    parser.add_argument(
+        "--skip-contacted-days",
+        type=float,
+        default=None,
+        metavar="DAYS",
+        help="Skip people that were contacted within the last DAYS days according to the "
+             "local contact index (or set SKIP_CONTACTED_DAYS; duplicates within a batch "
+             "are always skipped)",
+    )
+    parser.add_argument(
+        "--lookahead",
+        action="store_true",
+        help="In direct batch mode, load the next person's search in a second tab while the "
+             "current person's connect step runs (or set BATCH_LOOKAHEAD=true)",
+    )
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        metavar="BATCH_ID",
+        help="Resume the unfinished jobs of a batch (the most recent one if no id is given)",
+    )
+    parser.add_argument(
+        "--retry-failed",
+        action="store_true",
+        help="With --resume, also re-run jobs that failed",
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
+    args = parse_args()
+    if args.browser_profile:
+        os.environ['BROWSER_PROFILE'] = args.browser_profile
+    if args.diagnostics:
+        os.environ['DIAGNOSTICS'] = 'true'
+    if args.skip_contacted_days is not None:
+        os.environ['SKIP_CONTACTED_DAYS'] = str(args.skip_contacted_days)
+    if args.lookahead:
+        os.environ['BATCH_LOOKAHEAD'] = 'true'
+
+    if args.input:
+        run_file_sync(args.input, direct=args.direct, workers=args.workers)
+    elif args.resume:
+        batch_id = None if args.resume == "latest" else args.resume
+        resume_sync(batch_id, direct=args.direct, retry_failed=args.retry_failed, workers=args.workers)
     # Check if batch mode
-    if os.getenv('BATCH_MODE', 'false').lower() == 'true':
-        run_batch_sync()
+    elif os.getenv('BATCH_MODE', 'false').lower() == 'true':
+        run_batch_sync(direct=args.direct, workers=args.workers)
     else:
-        asyncio.run(run())
+        asyncio.run(run(direct=args.direct))
@@ -0,0 +1,337 @@
+"""
+Local stand-in for the LinkedIn pages the tools drive.
+
+Serves login, feed, people-search, profile, connect-dialog and messaging
+pages whose markup matches the selectors used by the tools, with configurable
+response latency and failure injection. Used by the benchmark harness to
+exercise the whole pipeline offline.
+
+Profiles are generated from the search query:
+- a query containing "nobody" returns no search results
+- a name containing "connected" renders a profile with a Message button
+- a name containing "pending" renders a profile with a Pending button
+
+Usage:
+    python -m src.linkedin_msg.mock_site --port 8765 --latency 0.2
+"""
+
+import argparse
+import html
+import json
+import random
+import re
+import threading
+import time
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlparse
+
+AUTH_COOKIE = "li_at"
+
+_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body><main>{body}</main>{script}</body></html>"""
+
+_LOGIN_BODY = """
+<form method="post" action="/checkpoint/lg/login-submit">
+  <input id="username" name="session_key" type="text">
+  <input id="password" name="session_password" type="password">
+  <button type="submit">Sign in</button>
+</form>"""
+
+_RESULT_ITEM = """
+<li class="reusable-search__result-container">
+  <div class="entity-result__content">
+    <span class="entity-result__title-text">
+      <a class="app-aware-link" href="/in/{slug}/?miniProfileUrn=urn%3Ali%3Afs_miniProfile%3A{slug}">{name}</a>
+    </span>
+    <div class="entity-result__primary-subtitle">Engineer at Example Corp</div>
+  </div>
+</li>"""
+
+_CONNECT_ACTIONS = """
+<div class="pvs-profile-actions">
+  <button class="artdeco-button artdeco-button--primary pvs-profile-actions__action"
+          aria-label="Invite {name} to connect" id="connect">Connect</button>
+  <button class="artdeco-button artdeco-button--secondary" aria-label="More actions">More</button>
+</div>
+<div role="dialog" id="invite-modal" style="display:none">
+  <p>You can add a note to personalize your invitation.</p>
+  <button aria-label="Add a note" id="add-note">Add a note</button>
+  <button aria-label="Send without a note" id="send-plain">Send without a note</button>
+  <div id="note-form" style="display:none">
+    <textarea name="message" maxlength="300"></textarea>
+    <button aria-label="Send now" id="send-note">Send</button>
+  </div>
+</div>"""
+
+_CONNECT_SCRIPT = """
+<script>
+  const slug = {slug};
+  const modal = document.getElementById('invite-modal');
+  function invite(note) {
+    fetch('/voyager/api/growth/normInvitations', {
+      method: 'POST', headers: {'Content-Type': 'application/json'},
+      body: JSON.stringify({slug: slug, note: note})
+    }).then(() => { modal.remove(); document.getElementById('connect').textContent = 'Pending'; });
+  }
+  document.getElementById('connect').onclick = () => setTimeout(() => { modal.style.display = 'block'; }, {delay});
+  document.getElementById('add-note').onclick = () => {
+    document.getElementById('add-note').style.display = 'none';
+    document.getElementById('send-plain').style.display = 'none';
+    setTimeout(() => { document.getElementById('note-form').style.display = 'block'; }, {delay});
+  };
+  document.getElementById('send-note').onclick = () => invite(document.querySelector('textarea[name=message]').value);
+  document.getElementById('send-plain').onclick = () => invite('');
+</script>"""
+
+_MESSAGE_ACTIONS = """
+<div class="pvs-profile-actions">
+  <button class="artdeco-button pvs-profile-actions__action" aria-label="Message {name}" id="message">Message</button>
+</div>
+<div id="msg-overlay" style="display:none">
+  <div class="msg-form__contenteditable" contenteditable="true" role="textbox"></div>
+  <button class="msg-form__send-button" disabled>Send</button>
+</div>"""
+
+_MESSAGE_SCRIPT = """
+<script>
+  const slug = {slug};
+  const box = document.querySelector('.msg-form__contenteditable');
+  const send = document.querySelector('.msg-form__send-button');
+  document.getElementById('message').onclick = () => setTimeout(() => {
+    document.getElementById('msg-overlay').style.display = 'block';
+  }, {delay});
+  box.addEventListener('input', () => { send.disabled = !box.textContent.trim(); });
+  send.onclick = () => fetch('/voyager/api/messaging/conversations', {
+    method: 'POST', headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({slug: slug, message: box.textContent})
+  }).then(() => { box.textContent = ''; send.disabled = true; });
+</script>"""
+
+_PENDING_ACTIONS = """
+<div class="pvs-profile-actions">
+  <button class="artdeco-button pvs-profile-actions__action" aria-label="Pending, click to withdraw invitation">Pending</button>
+</div>"""
+
+
+def slugify(name: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-') or 'member'
+
+
+def name_from_slug(slug: str) -> str:
+    return " ".join(part.capitalize() for part in slug.split('-'))
+
+
+class MockLinkedInServer(ThreadingHTTPServer):
+    """HTTP server holding the mock site's configuration and recorded actions."""
+
+    daemon_threads = True
+
+    def __init__(self, address, latency: float = 0.0, jitter: float = 0.0,
+                 failure_rate: float = 0.0, ui_delay_ms: int = 50, results_per_page: int = 3):
+        super().__init__(address, _Handler)
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.ui_delay_ms = ui_delay_ms
+        self.results_per_page = results_per_page
+        self.invitations: List[dict] = []
+        self.messages: List[dict] = []
+        self.logins = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, payload: dict):
+        with self._lock:
+            if kind == 'invitation':
+                self.invitations.append(payload)
+            elif kind == 'message':
+                self.messages.append(payload)
+            elif kind == 'login':
+                self.logins += 1
+            elif kind == 'failure':
+                self.failures += 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockLinkedInServer
+
+    def log_message(self, format, *args):
+        pass
+
+    # -- helpers ---------------------------------------------------------
+
+    def _delay(self):
+        delay = self.server.latency + random.uniform(0, self.server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _inject_failure(self) -> bool:
+        if self.server.failure_rate and random.random() < self.server.failure_rate:
+            # Marked, so an injected failure can't be mistaken for a page of the site
+            self.server.record('failure', {'path': self.path})
+            self._send(503, '<h1 id="mock-failure">Service unavailable (injected failure)</h1>',
+                       headers={"X-Mock-Failure": "injected", "Retry-After": "1"})
+            return True
+        return False
+
+    def _authenticated(self) -> bool:
+        cookie = SimpleCookie(self.headers.get('Cookie', ''))
+        return AUTH_COOKIE in cookie
+
+    def _send(self, status: int, body: str, content_type: str = "text/html; charset=utf-8",
+              headers: Optional[dict] = None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _page(self, title: str, body: str, script: str = ""):
+        self._send(200, _PAGE.format(title=html.escape(title), body=body, script=script))
+
+    def _redirect(self, location: str, headers: Optional[dict] = None):
+        self._send(302, "", headers={"Location": location, **(headers or {})})
+
+    # -- routes ----------------------------------------------------------
+
+    def do_GET(self):
+        self._delay()
+        url = urlparse(self.path)
+        path = url.path
+
+        if path == '/login':
+            return self._page("LinkedIn Login", _LOGIN_BODY)
+        if path == '/robots.txt':
+            return self._send(200, "User-agent: *\n", content_type="text/plain")
+        if self._inject_failure():
+            return
+        if not self._authenticated():
+            return self._redirect('/login?authwall=1')
+
+        if path.rstrip('/') == '/feed':
+            return self._page("Feed | LinkedIn", "<h1 class='feed-identity-module'>Your feed</h1>")
+        if path.rstrip('/') == '/search/results/people':
+            query = parse_qs(url.query).get('keywords', [''])[0]
+            return self._search(query)
+        if path.startswith('/in/'):
+            return self._profile(path.split('/')[2])
+        self._send(404, "<h1>Page not found</h1>")
+
+    def do_POST(self):
+        self._delay()
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length).decode('utf-8') if length else ''
+        path = urlparse(self.path).path
+
+        if path == '/checkpoint/lg/login-submit':
+            form = parse_qs(raw)
+            if form.get('session_password', [''])[0] == 'wrong':
+                return self._redirect('/login?error=1')
+            self.server.record('login', {})
+            return self._redirect('/feed/', {"Set-Cookie": f"{AUTH_COOKIE}=mock-session; Path=/"})
+        if not self._authenticated():
+            return self._send(401, '{"status": 401}', content_type="application/json")
+        if path == '/voyager/api/growth/normInvitations':
+            self.server.record('invitation', json.loads(raw or '{}'))
+            return self._send(201, '{"status": 201}', content_type="application/json")
+        if path == '/voyager/api/messaging/conversations':
+            self.server.record('message', json.loads(raw or '{}'))
+            return self._send(201, '{"status": 201}', content_type="application/json")
+        self._send(404, '{"status": 404}', content_type="application/json")
+
+    def _search(self, query: str):
+        if 'nobody' in query.lower():
+            body = "<div class='search-no-results'><h2>No results found</h2></div>"
+            return self._page("Search | LinkedIn", body)
+
+        base = slugify(query)
+        names = [query] + [f"{query} {suffix}" for suffix in ("Jr", "PhD", "MBA", "Sr")]
+        items = "".join(
+            _RESULT_ITEM.format(slug=base if i == 0 else f"{base}-{i}", name=html.escape(name))
+            for i, name in enumerate(names[:self.server.results_per_page])
+        )
+        body = f"<div class='search-results-container'><ul class='reusable-search__entity-result-list'>{items}</ul></div>"
+        self._page("Search | LinkedIn", body)
+
+    def _profile(self, slug: str):
+        name = name_from_slug(slug)
+        header = f"<h1 class='text-heading-xlarge inline'>{html.escape(name)}</h1>"
+        escaped = html.escape(name, quote=True)
+        replacements = {'{slug}': json.dumps(slug), '{delay}': str(self.server.ui_delay_ms)}
+
+        if 'connected' in slug:
+            actions, script = _MESSAGE_ACTIONS.format(name=escaped), _MESSAGE_SCRIPT
+        elif 'pending' in slug:
+            actions, script = _PENDING_ACTIONS, ""
+        else:
+            actions, script = _CONNECT_ACTIONS.format(name=escaped), _CONNECT_SCRIPT
+        for key, value in replacements.items():
+            script = script.replace(key, value)
+        self._page(f"{name} | LinkedIn", header + actions, script)
+
+
+class MockLinkedIn:
+    """
+    Run the mock site in a background thread.
+
+    Example:
+        with MockLinkedIn(latency=0.1) as site:
+            os.environ['LINKEDIN_BASE_URL'] = site.base_url
+            ...
+            print(len(site.server.invitations))
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        self.server = MockLinkedInServer((host, port), **options)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLinkedIn":
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockLinkedIn":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the local mock LinkedIn site")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency, up to this many seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Share of page loads answered with 503")
+    args = parser.parse_args(argv)
+
+    server = MockLinkedInServer(
+        (args.host, args.port), latency=args.latency, jitter=args.jitter, failure_rate=args.failure_rate
+    )
+    print(f"Mock LinkedIn running at http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Deterministic login → search → connect pipeline.
+
+The arguments of every step are already known from the run inputs, so this
+calls the tools directly instead of asking the LLM to decide on each call.
+The CrewAI agent is only needed when a step ends in an ambiguous state.
+"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Optional
+
+from src.linkedin_msg.errors import AUTH_LOST, RetryPolicy, error_kind
+from src.linkedin_msg.tools.driver_pool import current_session, get_default_pool
+from src.linkedin_msg.tools.linkedin_automation_tool import (
+    LinkedInLoginTool,
+    LinkedInSearchTool,
+    LinkedInConnectTool,
+)
+from src.linkedin_msg.tools.lookahead import start_lookahead
+from src.linkedin_msg.tools.results import parse_result
+from src.linkedin_msg.tracing import debug, span
+
+# Pipeline outcomes
+COMPLETED = "completed"   # every step reached a definitive result
+FAILED = "failed"         # a step failed in a way the agent cannot fix either
+AMBIGUOUS = "ambiguous"   # a step needs the agent to take a look
+
+# Tool result status codes mapped to an outcome. Anything not listed is ambiguous.
+_OUTCOME_RULES = {
+    'login': {
+        'logged_in': COMPLETED,
+        'missing_credentials': FAILED,
+    },
+    'search': {
+        'profile_found': COMPLETED,
+        'no_results': FAILED,
+    },
+    'connect': {
+        'request_sent': COMPLETED,
+        'already_connected': COMPLETED,
+        'pending': COMPLETED,
+        'connect_unavailable': COMPLETED,
+        'daily_cap_reached': FAILED,
+    },
+}
+
+
+def classify(step: str, output: str) -> str:
+    """Map a tool result to COMPLETED, FAILED or AMBIGUOUS."""
+    return _OUTCOME_RULES[step].get(parse_result(output)['status'], AMBIGUOUS)
+
+
+def _steps(person_name: str, connection_note: str) -> list:
+    return [
+        ('login', LinkedInLoginTool(), {}),
+        ('search', LinkedInSearchTool(), {'person_name': person_name}),
+        ('connect', LinkedInConnectTool(), {'note': connection_note}),
+    ]
+
+
+# Step a failed step is retried from: a lost session logs in again, and a
+# failed connect re-opens the profile first, since the page it failed on may
+# be half-rendered or gone
+_RESTART_STEP = {'connect': 'search'}
+
+
+def _step_index(steps: list, name: str) -> int:
+    return next(i for i, (step, _, _) in enumerate(steps) if step == name)
+
+
+def _after_failure(steps: list, index: int, output: str, attempts: dict, policy: RetryPolicy):
+    """
+    Decide how to continue after steps[index] did not complete.
+
+    Returns:
+        (restart index, kind, delay in seconds), or None if the step is not retried.
+    """
+    step = steps[index][0]
+    kind = error_kind(output)
+    if not policy.should_retry(kind, attempts[step]):
+        return None
+    if kind == AUTH_LOST:
+        session = current_session()
+        if session is not None:
+            session.logged_in = False
+        restart = 'login'
+    else:
+        restart = _RESTART_STEP.get(step, step)
+    return _step_index(steps, restart), kind, policy.delay(attempts[step])
+
+
+def _retry_span(steps: list, index: int, restart: int, kind: str, attempts: dict, delay: float):
+    step = steps[index][0]
+    debug(f"{step} failed ({kind}), retrying from {steps[restart][0]} in {delay:.1f}s "
+          f"(attempt {attempts[step] + 1})")
+    return span("retry", step=step, attempt=attempts[step], kind=kind, restart=steps[restart][0],
+                delay_s=round(delay, 2))
+
+
+def run_direct(person_name: str, connection_note: str, policy: Optional[RetryPolicy] = None,
+               lookahead: Optional[str] = None) -> dict:
+    """
+    Run login, search and connect for one person without the LLM.
+
+    The tools use the browser session bound to the current run (see
+    DriverPool.lease), so the caller owns the browser's lifecycle.
+
+    A step that fails with a retryable error kind (see errors.py) is retried
+    after a jittered backoff, up to the policy's attempt budget; a lost
+    session restarts from login. Every retry is recorded as a 'retry' span.
+
+    With `lookahead` (the next person's name), that person's search is opened
+    in a background tab before the connect step, so its page load overlaps
+    with the connect dialog (see tools/lookahead.py).
+
+    Returns:
+        Dict with 'status' (COMPLETED, FAILED or AMBIGUOUS), 'step' (the last
+        step that ran), 'outputs' (tool output per step) and 'retries'.
+    """
+    policy = policy or RetryPolicy()
+    steps = _steps(person_name, connection_note)
+    outputs, attempts = {}, Counter()
+    index = retries = 0
+    while index < len(steps):
+        step, tool, kwargs = steps[index]
+        attempts[step] += 1
+        if step == 'connect' and lookahead:
+            start_lookahead(lookahead)
+            lookahead = None
+        output = tool.run(**kwargs)
+        outputs[step] = output
+        status = classify(step, output)
+        if status == COMPLETED:
+            index += 1
+            continue
+        retry = _after_failure(steps, index, output, attempts, policy)
+        if retry is None:
+            return {'status': status, 'step': step, 'outputs': outputs, 'retries': retries}
+        restart, kind, delay = retry
+        with _retry_span(steps, index, restart, kind, attempts, delay):
+            time.sleep(delay)
+        index = restart
+        retries += 1
+    return {'status': COMPLETED, 'step': 'connect', 'outputs': outputs, 'retries': retries}
+
+
+async def arun_direct(person_name: str, connection_note: str, policy: Optional[RetryPolicy] = None,
+                      lookahead: Optional[str] = None) -> dict:
+    """
+    Async version of run_direct().
+
+    Each step runs on the driver pool's worker threads via the tools' run_in_pool,
+    so the event loop stays free for the other people in a batch, including
+    during retry backoff.
+    """
+    policy = policy or RetryPolicy()
+    steps = _steps(person_name, connection_note)
+    outputs, attempts = {}, Counter()
+    index = retries = 0
+    while index < len(steps):
+        step, tool, kwargs = steps[index]
+        attempts[step] += 1
+        if step == 'connect' and lookahead:
+            await get_default_pool().run_blocking(start_lookahead, lookahead)
+            lookahead = None
+        output = await tool.run_in_pool(**kwargs)
+        outputs[step] = output
+        status = classify(step, output)
+        if status == COMPLETED:
+            index += 1
+            continue
+        retry = _after_failure(steps, index, output, attempts, policy)
+        if retry is None:
+            return {'status': status, 'step': step, 'outputs': outputs, 'retries': retries}
+        restart, kind, delay = retry
+        with _retry_span(steps, index, restart, kind, attempts, delay):
+            await asyncio.sleep(delay)
+        index = restart
+        retries += 1
+    return {'status': COMPLETED, 'step': 'connect', 'outputs': outputs, 'retries': retries}
+
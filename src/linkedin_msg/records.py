@@ -0,0 +1,209 @@
+"""
+Typed result records for runs and the JSONL result sink.
+
+run_single() turns every person's outcome into a RunResult with a RunStatus,
+the profile URL, per-step status and timings, the error class and kind and
+the number of step retries, and appends it as one JSON line to the result
+sink (LINKEDIN_CACHE_DIR/results.jsonl, or LINKEDIN_RESULTS_FILE). The app, the batch summary and downstream tooling
+read these records instead of scraping log output.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from src.linkedin_msg.storage import cache_dir
+from src.linkedin_msg.tools.results import parse_result
+from src.linkedin_msg.tracing import percentile
+
+
+class RunStatus(str, Enum):
+    """Final outcome of one person's run."""
+
+    REQUEST_SENT = "request_sent"
+    MESSAGE_SENT = "message_sent"
+    ALREADY_CONNECTED = "already_connected"
+    PENDING = "pending"
+    UNAVAILABLE = "unavailable"     # no Connect button and no message sent
+    NOT_FOUND = "not_found"         # the search found nobody
+    UNKNOWN = "unknown"             # finished, but the agent's answer had no tool result
+    FAILED = "failed"
+
+
+# Connect/message tool statuses mapped to the run status they stand for;
+# the message step is checked first because it runs after connect
+_STEP_STATUSES = {
+    'message_sent': RunStatus.MESSAGE_SENT,
+    'request_sent': RunStatus.REQUEST_SENT,
+    'already_connected': RunStatus.ALREADY_CONNECTED,
+    'pending': RunStatus.PENDING,
+    'connect_unavailable': RunStatus.UNAVAILABLE,
+}
+
+# Tool statuses of a failed run that get their own run status
+_FAILED_STATUSES = {
+    'no_results': RunStatus.NOT_FOUND,
+}
+
+# Span name prefix of the tool steps timed in a record
+STEP_PREFIX = "tool."
+
+
+@dataclass
+class RunResult:
+    """Result record of one person's run."""
+
+    person: str
+    status: RunStatus
+    profile_url: Optional[str] = None
+    connect: Optional[str] = None
+    message: Optional[str] = None
+    seconds: Optional[float] = None
+    steps: Dict[str, dict] = field(default_factory=dict)
+    error: Optional[str] = None
+    error_class: Optional[str] = None
+    error_kind: Optional[str] = None
+    retries: int = 0
+    run_id: Optional[str] = None
+    finished_at: float = field(default_factory=time.time)
+
+    @property
+    def ok(self) -> bool:
+        return self.status not in (RunStatus.FAILED, RunStatus.NOT_FOUND)
+
+    def to_dict(self) -> dict:
+        record = asdict(self)
+        record['status'] = self.status.value
+        return record
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, separators=(',', ':'), default=str)
+
+    @classmethod
+    def from_dict(cls, record: dict) -> "RunResult":
+        return cls(**{**record, 'status': RunStatus(record['status'])})
+
+
+def step_timings(spans: List[tuple]) -> Dict[str, dict]:
+    """
+    Per-step status and seconds from collected tool spans (see tracing.collect_spans).
+
+    Steps the agent called more than once keep the last status and the total time.
+    """
+    steps: Dict[str, dict] = {}
+    for name, seconds, span in spans:
+        step = steps.setdefault(name[len(STEP_PREFIX):], {'status': None, 'seconds': 0.0, 'calls': 0})
+        step['status'] = span.attrs.get('status', span.outcome)
+        step['seconds'] = round(step['seconds'] + seconds, 3)
+        step['calls'] += 1
+    return steps
+
+
+def run_record(result: dict, spans: List[tuple], seconds: Optional[float] = None,
+               run_id: Optional[str] = None) -> RunResult:
+    """Build the record for a run_single() result dict."""
+    failed_status = error_kind = None
+    if result.get('status') == 'success':
+        status = next(
+            (_STEP_STATUSES[result[step]] for step in ('message', 'connect')
+             if result.get(step) in _STEP_STATUSES),
+            RunStatus.UNKNOWN,
+        )
+    else:
+        failed = parse_result(result.get('error', ''))
+        failed_status = failed['status']
+        error_kind = result.get('error_kind') or failed.get('kind')
+        status = _FAILED_STATUSES.get(failed_status, RunStatus.FAILED)
+
+    error_class = result.get('error_class')
+    if error_class is None and failed_status not in (None, 'unknown'):
+        error_class = failed_status
+    return RunResult(
+        person=result['person'],
+        status=status,
+        profile_url=result.get('profile_url'),
+        connect=result.get('connect'),
+        message=result.get('message'),
+        seconds=round(seconds, 3) if seconds is not None else None,
+        steps=step_timings(spans),
+        error=result.get('error'),
+        error_class=error_class,
+        error_kind=error_kind,
+        retries=result.get('retries', 0),
+        run_id=run_id,
+    )
+
+
+class ResultSink:
+    """Append-only JSONL file of run records, shared by all runs of the process."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('LINKEDIN_RESULTS_FILE') or os.path.join(cache_dir(), 'results.jsonl')
+        self._lock = threading.Lock()
+        self._file = open(self.path, 'a', buffering=1, encoding='utf-8')
+
+    def write(self, record: RunResult):
+        line = record.to_json()
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+def iter_results(path: Optional[str] = None) -> Iterator[RunResult]:
+    """Stream the records of a result file (the default sink's file if no path is given)."""
+    path = path or os.getenv('LINKEDIN_RESULTS_FILE') or os.path.join(cache_dir(), 'results.jsonl')
+    if not os.path.exists(path):
+        return
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield RunResult.from_dict(json.loads(line))
+
+
+def summarize_results(records: Iterable[RunResult], since: Optional[float] = None) -> dict:
+    """
+    Count records per status and compute p50/p95 seconds per step.
+
+    Args:
+        records: Records to summarize, e.g. iter_results()
+        since: Only include records finished at or after this timestamp
+    """
+    statuses = Counter()
+    step_seconds = defaultdict(list)
+    for record in records:
+        if since is not None and record.finished_at < since:
+            continue
+        statuses[record.status.value] += 1
+        for step, timing in record.steps.items():
+            step_seconds[step].append(timing['seconds'])
+    steps = {}
+    for step, seconds in sorted(step_seconds.items()):
+        seconds.sort()
+        steps[step] = {
+            'count': len(seconds),
+            'p50_s': round(percentile(seconds, 50), 3),
+            'p95_s': round(percentile(seconds, 95), 3),
+        }
+    return {'total': sum(statuses.values()), 'statuses': dict(statuses.most_common()), 'steps': steps}
+
+
+_default_sink: Optional[ResultSink] = None
+_default_sink_lock = threading.Lock()
+
+
+def get_result_sink() -> ResultSink:
+    """Return the process-wide result sink, opening it on first use."""
+    global _default_sink
+
+    with _default_sink_lock:
+        if _default_sink is None:
+            _default_sink = ResultSink()
+        return _default_sink
@@ -0,0 +1,227 @@
+"""
+Long-lived background runner for the web UI.
+
+The runner owns one thread with its own asyncio event loop. The app submits
+single-person runs and batch files to it and polls their progress, so the
+Streamlit script thread never blocks, and the crew imports, LLM client and
+warm browsers are reused across clicks instead of starting a new interpreter
+for every run.
+
+Progress is collected from the run trace (see tracing.add_span_listener),
+so it needs TRACE enabled, which is the default.
+"""
+
+import asyncio
+import itertools
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from src.linkedin_msg.records import RunResult
+from src.linkedin_msg.tracing import add_span_listener, end_run, get_tracer, start_run
+
+# Run states
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Spans shown in the progress table: the whole person and each tool call
+_PROGRESS_SPANS = ("person",)
+_PROGRESS_PREFIX = "tool."
+
+
+class RunProgress:
+    """State and per-step progress of one submitted run."""
+
+    def __init__(self, run_id: int, kind: str, label: str):
+        self.id = run_id
+        self.kind = kind
+        self.label = label
+        self.state = QUEUED
+        self.submitted_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.trace_path: Optional[str] = None
+        self.error: Optional[str] = None
+        self.records: List[RunResult] = []
+        self._steps: Dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def on_span(self, entry: dict):
+        name = entry['span']
+        if name not in _PROGRESS_SPANS and not name.startswith(_PROGRESS_PREFIX):
+            return
+        step = name[len(_PROGRESS_PREFIX):] if name.startswith(_PROGRESS_PREFIX) else name
+        attrs = entry.get('attrs') or {}
+        status = attrs.get('message') if attrs.get('message') not in (None, 'skipped') else attrs.get('connect')
+        with self._lock:
+            self._steps[(entry['person'], step)] = {
+                'person': entry['person'],
+                'step': step,
+                'status': status or entry['outcome'],
+                'started': entry['start'],
+                'seconds': round(entry['duration_ms'] / 1000, 2) if 'duration_ms' in entry else None,
+            }
+
+    def table(self) -> List[dict]:
+        """Return one row per person and step; running steps show their elapsed time so far."""
+        now = time.time()
+        with self._lock:
+            rows = [dict(row) for row in self._steps.values()]
+        for row in rows:
+            if row['seconds'] is None:
+                row['seconds'] = round(now - row['started'], 1)
+            del row['started']
+        return rows
+
+    @property
+    def elapsed(self) -> Optional[float]:
+        if self.started_at is None:
+            return None
+        return (self.finished_at or time.time()) - self.started_at
+
+
+class BackgroundRunner:
+    """
+    Runs automation jobs on a dedicated event-loop thread.
+
+    Runs execute one at a time in submission order; a batch still processes
+    its people in parallel through the usual scheduler and driver pool.
+    """
+
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self._runs: Dict[int, RunProgress] = {}
+        self._current: Optional[RunProgress] = None
+        self._browser_profile: Optional[str] = None
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._serve, name="linkedin-runner", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        add_span_listener(self._on_span)
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        self._gate = asyncio.Lock()
+        self._ready.set()
+        # Pay for the crew and tool imports once, before the first run is submitted
+        self._loop.call_soon(self._preload)
+        self._loop.run_forever()
+
+    @staticmethod
+    def _preload():
+        import src.linkedin_msg.main_async  # noqa: F401
+
+    def _on_span(self, entry: dict):
+        # Runs are serialized, so every span belongs to the current one
+        current = self._current
+        if current is not None:
+            current.on_span(entry)
+
+    def _submit(self, kind: str, label: str, coro_factory, browser_profile: Optional[str]) -> RunProgress:
+        progress = RunProgress(next(self._ids), kind, label)
+        self._runs[progress.id] = progress
+        asyncio.run_coroutine_threadsafe(self._execute(progress, coro_factory, browser_profile), self._loop)
+        return progress
+
+    def _use_browser_profile(self, browser_profile: Optional[str]):
+        """Switch browser profiles; warm browsers of the old profile are closed."""
+        from src.linkedin_msg.tools.driver_pool import set_default_pool
+
+        if not browser_profile or browser_profile == self._browser_profile:
+            return
+        os.environ['BROWSER_PROFILE'] = browser_profile
+        if self._browser_profile is not None:
+            set_default_pool(None)
+        self._browser_profile = browser_profile
+
+    async def _execute(self, progress: RunProgress, coro_factory, browser_profile: Optional[str]):
+        async with self._gate:
+            # The app saves credentials and inputs to .env after this process
+            # started; pick them up before each run like a fresh CLI run would
+            load_dotenv(override=True)
+            self._use_browser_profile(browser_profile)
+            progress.state = RUNNING
+            progress.started_at = time.time()
+            self._current = progress
+            try:
+                results = await coro_factory(progress) or []
+                progress.records = [
+                    result['record'] for result in results
+                    if isinstance(result, dict) and 'record' in result
+                ]
+                progress.state = DONE
+            except Exception as e:
+                progress.error = str(e)
+                progress.state = FAILED
+            finally:
+                progress.finished_at = time.time()
+                self._current = None
+
+    def submit_single(self, person_name: str, connection_note: str, direct: bool = False,
+                      browser_profile: Optional[str] = None) -> RunProgress:
+        """Queue a run for one person and return its progress handle."""
+        async def _run(progress: RunProgress):
+            from src.linkedin_msg.main_async import run_single
+
+            tracer = start_run()
+            progress.trace_path = tracer.path if tracer else None
+            try:
+                return [await run_single(person_name, connection_note, direct=direct)]
+            finally:
+                end_run()
+
+        return self._submit("single", person_name, _run, browser_profile)
+
+    def submit_batch(self, path: str, direct: bool = False, workers: Optional[int] = None,
+                     browser_profile: Optional[str] = None, label: Optional[str] = None) -> RunProgress:
+        """Queue a batch from a CSV or JSONL file and return its progress handle."""
+        # Read now: the app sets the default note for this batch only in the environment
+        default_note = os.getenv('CONNECTION_NOTE')
+
+        async def _run(progress: RunProgress):
+            from src.linkedin_msg.inputs import iter_people
+            from src.linkedin_msg.main_async import run_batch
+
+            people = iter_people(path, default_note=default_note)
+            task = asyncio.ensure_future(run_batch(people, direct=direct, workers=workers))
+            # run_batch starts its own trace; pick up its path once it exists
+            while not task.done() and progress.trace_path is None:
+                tracer = get_tracer()
+                progress.trace_path = tracer.path if tracer else None
+                await asyncio.sleep(0.2)
+            return await task
+
+        return self._submit("batch", label or os.path.basename(path), _run, browser_profile)
+
+    def runs(self) -> List[RunProgress]:
+        """Return all submitted runs, newest first."""
+        return sorted(self._runs.values(), key=lambda run: run.id, reverse=True)
+
+    def get(self, run_id: int) -> Optional[RunProgress]:
+        return self._runs.get(run_id)
+
+    def busy(self) -> bool:
+        """True while any run is queued or running."""
+        return any(run.state in ACTIVE_STATES for run in self._runs.values())
+
+
+_default_runner: Optional[BackgroundRunner] = None
+_default_runner_lock = threading.Lock()
+
+
+def get_runner() -> BackgroundRunner:
+    """Return the process-wide background runner, starting it on first use."""
+    global _default_runner
+
+    with _default_runner_lock:
+        if _default_runner is None:
+            _default_runner = BackgroundRunner()
+        return _default_runner
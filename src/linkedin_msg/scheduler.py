@@ -0,0 +1,225 @@
+"""
+Bounded-concurrency scheduler for batch runs.
+
+A fixed number of workers pull items from a bounded queue, so memory and the
+number of live crews/browsers stay flat regardless of the input size, and
+results are streamed back in completion order.
+
+The per-account pacing budget is bound to the workers' context and charged by
+the tools right before each outbound action (the Connect click or opening the
+message box), so people that need no action do not use it up. The scheduler
+stops starting new items once the daily cap is used up.
+
+With lookahead, each worker also takes the item it will process next before
+starting the current one and passes it to the worker function, which can
+prepare it (e.g. load its search page) while the current item runs.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from contextvars import ContextVar
+from datetime import date
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Optional, Tuple, Union
+
+from src.linkedin_msg.storage import cache_dir
+
+_PACING_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pacing (
+    account        TEXT NOT NULL,
+    day            TEXT NOT NULL,
+    actions        INTEGER NOT NULL,
+    last_action_at REAL NOT NULL,
+    PRIMARY KEY (account, day)
+);
+"""
+
+
+class DailyCapReached(Exception):
+    """Raised when the account has used up its outbound actions for today."""
+
+
+class PacingBudget:
+    """
+    Per-account pacing for outbound actions.
+
+    Enforces a minimum interval between actions and a daily cap. Both are
+    persisted in a local SQLite file, so separate runs on the same day share
+    one budget. A value of 0 disables the corresponding limit.
+
+    acquire() blocks; it is called by the tools on the driver pool's threads.
+    """
+
+    def __init__(self, account: Optional[str] = None, min_interval: Optional[float] = None,
+                 daily_cap: Optional[int] = None, path: Optional[str] = None):
+        self.account = account or os.getenv('LINKEDIN_EMAIL', 'default')
+        self.min_interval = float(os.getenv('PACING_MIN_INTERVAL', '0') if min_interval is None else min_interval)
+        self.daily_cap = int(os.getenv('PACING_DAILY_CAP', '0') if daily_cap is None else daily_cap)
+        self._conn = sqlite3.connect(path or os.path.join(cache_dir(), 'pacing.sqlite3'), check_same_thread=False)
+        self._conn.executescript(_PACING_SCHEMA)
+        self._lock = threading.Lock()
+
+    def _today(self) -> Tuple[int, float]:
+        row = self._conn.execute(
+            "SELECT actions, last_action_at FROM pacing WHERE account = ? AND day = ?",
+            (self.account, date.today().isoformat()),
+        ).fetchone()
+        return row if row else (0, 0.0)
+
+    def remaining_today(self) -> Optional[int]:
+        """Actions left today, or None if there is no daily cap."""
+        if not self.daily_cap:
+            return None
+        with self._lock:
+            return max(self.daily_cap - self._today()[0], 0)
+
+    def cap_message(self) -> str:
+        return f"Daily cap of {self.daily_cap} actions reached for {self.account}"
+
+    def acquire(self):
+        """Wait for the next action slot and record it; raises DailyCapReached when none is left."""
+        while True:
+            # The slot is checked and recorded under the lock, but the wait for
+            # it is not, so other threads can read the budget in the meantime
+            with self._lock:
+                actions, last_action_at = self._today()
+                if self.daily_cap and actions >= self.daily_cap:
+                    raise DailyCapReached(self.cap_message())
+
+                wait = last_action_at + self.min_interval - time.time()
+                if wait <= 0:
+                    with self._conn:
+                        self._conn.execute(
+                            "INSERT INTO pacing VALUES (?, ?, 1, ?)"
+                            " ON CONFLICT (account, day) DO UPDATE SET"
+                            " actions = actions + 1, last_action_at = excluded.last_action_at",
+                            (self.account, date.today().isoformat(), time.time()),
+                        )
+                    return
+            time.sleep(wait)
+
+
+_current_pacing: ContextVar[Optional[PacingBudget]] = ContextVar('linkedin_pacing', default=None)
+
+
+def current_pacing() -> Optional[PacingBudget]:
+    """Return the pacing budget of the batch the current run belongs to, if any."""
+    return _current_pacing.get()
+
+
+_DONE = object()
+
+
+class BatchScheduler:
+    """
+    Run an async worker function over a stream of items with bounded concurrency.
+
+    Example:
+        scheduler = BatchScheduler(process_person, workers=4)
+        async for item, result in scheduler.run(people):
+            print(item['name'], result)
+    """
+
+    def __init__(self, worker: Callable[..., Awaitable], workers: Optional[int] = None,
+                 queue_size: Optional[int] = None, pacing: Optional[PacingBudget] = None,
+                 lookahead: bool = False):
+        self.worker = worker
+        self.workers = workers or int(os.getenv('BATCH_WORKERS', os.getenv('DRIVER_POOL_SIZE', '2')))
+        self.queue_size = queue_size or int(os.getenv('BATCH_QUEUE_SIZE', str(self.workers * 2)))
+        self.pacing = pacing
+        self.lookahead = lookahead
+        self.stop_reason: Optional[str] = None
+
+    def _has_budget(self) -> bool:
+        return self.pacing is None or self.pacing.remaining_today() != 0
+
+    async def run(self, items: Union[Iterable, AsyncIterable]) -> AsyncIterator[Tuple[object, object]]:
+        """
+        Process items and yield (item, result) pairs as they complete.
+
+        With lookahead the worker function is called as worker(item, upcoming),
+        where `upcoming` is the item the same worker runs next, or None if
+        there is none yet or the pacing budget has no room for it.
+
+        Exceptions raised by the worker are yielded as the result. Once the
+        pacing budget's daily cap is used up, no new items are started and
+        `stop_reason` is set; items that were not started are simply not yielded.
+        """
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        completed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stop = asyncio.Event()
+
+        async def produce():
+            if hasattr(items, '__aiter__'):
+                async for item in items:
+                    if stop.is_set():
+                        break
+                    await pending.put(item)
+            else:
+                for item in items:
+                    if stop.is_set():
+                        break
+                    await pending.put(item)
+            await pending.put(_DONE)
+
+        def halt():
+            # Start nothing more: drop the queued items and wake the idle workers
+            stop.set()
+            producer.cancel()
+            while not pending.empty():
+                pending.get_nowait()
+            pending.put_nowait(_DONE)
+
+        async def work():
+            # Every worker task runs in its own copy of the context; the tools it
+            # calls charge their outbound actions to this budget
+            _current_pacing.set(self.pacing)
+            upcoming = None
+            while True:
+                item = upcoming if upcoming is not None else await pending.get()
+                upcoming = None
+                if item is _DONE:
+                    # A single _DONE ends every worker: each one passes it on
+                    pending.put_nowait(_DONE)
+                    break
+                if stop.is_set():
+                    break
+                if not self._has_budget():
+                    self.stop_reason = self.pacing.cap_message()
+                    halt()
+                    break
+                try:
+                    if self.lookahead:
+                        if not pending.empty():
+                            upcoming = pending.get_nowait()
+                        if upcoming is _DONE:
+                            pending.put_nowait(_DONE)
+                            upcoming = None
+                        next_item = upcoming if upcoming is not None and self._has_budget() else None
+                        result = await self.worker(item, next_item)
+                    else:
+                        result = await self.worker(item)
+                except Exception as e:
+                    result = e
+                await completed.put((item, result))
+
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(self.workers)]
+
+        async def close_when_done():
+            await asyncio.gather(*workers)
+            await completed.put(_DONE)
+
+        closer = asyncio.create_task(close_when_done())
+        try:
+            while True:
+                entry = await completed.get()
+                if entry is _DONE:
+                    break
+                yield entry
+        finally:
+            for task in (producer, closer, *workers):
+                task.cancel()
+            await asyncio.gather(producer, closer, *workers, return_exceptions=True)
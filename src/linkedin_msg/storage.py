@@ -0,0 +1,18 @@
+"""
+Local storage locations for caches and run state.
+"""
+
+import os
+
+
+def cache_dir(*parts: str) -> str:
+    """
+    Return (and create) a directory under the local cache root.
+
+    The root defaults to ~/.cache/linkedin_msg and can be moved with
+    LINKEDIN_CACHE_DIR.
+    """
+    root = os.getenv('LINKEDIN_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'linkedin_msg')
+    path = os.path.join(root, *parts)
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    return path
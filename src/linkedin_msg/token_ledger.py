@@ -0,0 +1,54 @@
+"""
+Per-task LLM token accounting.
+
+The crew's task callback books the tokens each task used on that task (see
+LinkedinMsg._record_task_tokens), and the run summaries print the totals.
+"""
+
+import threading
+from typing import Dict
+
+FIELDS = ('prompt_tokens', 'cached_prompt_tokens', 'completion_tokens', 'total_tokens', 'successful_requests')
+
+
+class TokenLedger:
+    """Token totals per task name across all crews of a run."""
+
+    def __init__(self):
+        self._tasks: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    def add(self, task: str, usage: dict):
+        """Book one run of `task` with the token counts in `usage`."""
+        with self._lock:
+            entry = self._tasks.setdefault(task, dict.fromkeys(('runs',) + FIELDS, 0))
+            entry['runs'] += 1
+            for field in FIELDS:
+                entry[field] += usage.get(field, 0)
+
+    def summary(self) -> Dict[str, dict]:
+        """Return the totals per task."""
+        with self._lock:
+            return {task: dict(entry) for task, entry in self._tasks.items()}
+
+    def reset(self):
+        with self._lock:
+            self._tasks.clear()
+
+
+_ledger = TokenLedger()
+
+
+def get_token_ledger() -> TokenLedger:
+    """Return the process-wide token ledger."""
+    return _ledger
+
+
+def print_token_summary(summary: Dict[str, dict]):
+    """Print a per-task token table."""
+    if not summary:
+        return
+    print(f"{'Task':<28}{'runs':>6}{'prompt':>10}{'cached':>9}{'output':>9}{'prompt/run':>12}")
+    for task, entry in summary.items():
+        print(f"{task:<28}{entry['runs']:>6}{entry['prompt_tokens']:>10}{entry['cached_prompt_tokens']:>9}"
+              f"{entry['completion_tokens']:>9}{entry['prompt_tokens'] // max(entry['runs'], 1):>12}")
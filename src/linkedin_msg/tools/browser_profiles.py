@@ -0,0 +1,37 @@
+"""
+Named browser profiles from config/browser.yaml.
+
+Kept apart from driver_pool so that the CLI and the web UI can list and
+validate profiles without importing Selenium.
+"""
+
+import os
+from functools import lru_cache
+
+import yaml
+
+BROWSER_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'browser.yaml')
+
+# URL patterns blocked per resource type (Network.setBlockedURLs)
+BLOCKED_URL_PATTERNS = {
+    'images': ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.ico"],
+    'fonts': ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    'media': ["*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.wav"],
+}
+
+
+@lru_cache(maxsize=1)
+def load_browser_profiles() -> dict:
+    """Load the named browser profiles from config/browser.yaml."""
+    with open(BROWSER_CONFIG_PATH, 'r') as f:
+        profiles = yaml.safe_load(f) or {}
+    for name, settings in profiles.items():
+        unknown = set(settings.get('block', [])) - set(BLOCKED_URL_PATTERNS)
+        if unknown:
+            raise ValueError(f"Browser profile '{name}' blocks unknown resource types: {sorted(unknown)}")
+    return profiles
+
+
+def browser_profile_name() -> str:
+    """The browser profile for this process (BROWSER_PROFILE, default 'default')."""
+    return os.getenv('BROWSER_PROFILE', 'default')
@@ -0,0 +1,196 @@
+"""
+Debugging artifacts and opt-in network diagnostics.
+
+Failure screenshots are written to the per-run, per-person artifact
+directory. With DIAGNOSTICS=true browsers also run with Chrome performance
+logging, and the CDP Network/Page events of every navigation are written as
+a report with the request waterfall, time to first byte, DOMContentLoaded,
+load and the slowest resources. Both are linked from the run trace.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import WebDriverException
+
+from src.linkedin_msg.tracing import artifact_dir, debug, record_artifact
+
+# Resources listed as the slowest of each navigation
+SLOWEST_RESOURCES = 10
+
+
+def diagnostics_enabled() -> bool:
+    """Network diagnostics are off unless DIAGNOSTICS=true."""
+    return os.getenv('DIAGNOSTICS', 'false').lower() == 'true'
+
+
+def _stamp() -> str:
+    return datetime.now().strftime('%H%M%S-%f')
+
+
+def save_screenshot(driver, name: str) -> Optional[str]:
+    """
+    Save a screenshot to the artifact directory and link it from the trace.
+
+    With diagnostics enabled the network activity up to this point is
+    captured as well. Returns the screenshot path, or None if it failed.
+    """
+    capture_network(driver)
+    path = os.path.join(artifact_dir(), f"{_stamp()}-{name}.png")
+    try:
+        driver.save_screenshot(path)
+    except WebDriverException:
+        return None
+    debug(f"Screenshot saved to: {path}")
+    record_artifact('screenshot', path)
+    return path
+
+
+def _read_events(driver) -> List[dict]:
+    """Drain the performance log and return its Network and Page events."""
+    events = []
+    for entry in driver.get_log('performance'):
+        message = json.loads(entry['message'])['message']
+        if message['method'].startswith(('Network.', 'Page.')):
+            events.append(message)
+    return events
+
+
+def _new_navigation(url: Optional[str], start: Optional[float], document_id: Optional[str] = None) -> dict:
+    return {'url': url, 'start': start, 'document_id': document_id, 'requests': {}, 'page_events': {}}
+
+
+def split_navigations(events: List[dict], main_frame: Optional[str]) -> List[dict]:
+    """
+    Group CDP events into navigations of the main frame.
+
+    Events that arrive before the first navigation in `events` belong to the
+    page that was already loaded and are grouped as a continuation of it.
+    """
+    navigations = []
+    current = None
+    for event in events:
+        method, params = event['method'], event.get('params', {})
+
+        if method == 'Network.requestWillBeSent':
+            request_id = params['requestId']
+            is_document = (
+                params.get('type') == 'Document'
+                and request_id == params.get('loaderId')
+                and (main_frame is None or params.get('frameId') == main_frame)
+            )
+            if is_document and (current is None or current['document_id'] != request_id):
+                current = _new_navigation(params['request']['url'], params['timestamp'], request_id)
+                navigations.append(current)
+            elif current is None:
+                current = _new_navigation(params.get('documentURL'), params['timestamp'])
+                navigations.append(current)
+            request = current['requests'].setdefault(request_id, {'start': params['timestamp']})
+            # Redirects reuse the request id; keep the original start and the final URL
+            request.update(url=params['request']['url'], type=params.get('type'))
+            if is_document:
+                current['url'] = params['request']['url']
+            continue
+
+        if current is None:
+            continue
+        request = current['requests'].get(params.get('requestId'))
+        if method == 'Network.responseReceived' and request is not None:
+            response = params['response']
+            timing = response.get('timing') or {}
+            request.update(status=response.get('status'), mime=response.get('mimeType'),
+                           from_cache=response.get('fromDiskCache', False))
+            if timing:
+                headers_end = timing['requestTime'] + timing['receiveHeadersEnd'] / 1000
+                request['ttfb_ms'] = round((headers_end - request['start']) * 1000, 1)
+        elif method == 'Network.loadingFinished' and request is not None:
+            request.update(end=params['timestamp'], bytes=params.get('encodedDataLength', 0))
+        elif method == 'Network.loadingFailed' and request is not None:
+            request.update(end=params['timestamp'],
+                           error=params.get('blockedReason') or params.get('errorText'))
+        elif method == 'Page.domContentEventFired':
+            current['page_events'].setdefault('dom_content_loaded', params['timestamp'])
+        elif method == 'Page.loadEventFired':
+            current['page_events'].setdefault('load', params['timestamp'])
+    return navigations
+
+
+def navigation_report(navigation: dict) -> dict:
+    """Summarize one navigation: TTFB, DOMContentLoaded, load, waterfall and slowest resources."""
+    start = navigation['start']
+
+    def _ms(timestamp: Optional[float]) -> Optional[float]:
+        return round((timestamp - start) * 1000, 1) if timestamp is not None and start is not None else None
+
+    waterfall = []
+    for request in navigation['requests'].values():
+        end = request.get('end')
+        waterfall.append({
+            'url': request.get('url'),
+            'type': request.get('type'),
+            'status': request.get('status'),
+            'start_ms': _ms(request['start']),
+            'duration_ms': round((end - request['start']) * 1000, 1) if end is not None else None,
+            'ttfb_ms': request.get('ttfb_ms'),
+            'bytes': request.get('bytes'),
+            'from_cache': request.get('from_cache', False),
+            'error': request.get('error'),
+        })
+    waterfall.sort(key=lambda r: r['start_ms'] or 0)
+
+    document = navigation['requests'].get(navigation['document_id'], {})
+    return {
+        'url': navigation['url'],
+        'continued': navigation['document_id'] is None,
+        'ttfb_ms': document.get('ttfb_ms'),
+        'dom_content_loaded_ms': _ms(navigation['page_events'].get('dom_content_loaded')),
+        'load_ms': _ms(navigation['page_events'].get('load')),
+        'requests': len(waterfall),
+        'failed': sum(1 for r in waterfall if r['error']),
+        'bytes': sum(r['bytes'] or 0 for r in waterfall),
+        'slowest': sorted(
+            (r for r in waterfall if r['duration_ms'] is not None),
+            key=lambda r: r['duration_ms'],
+            reverse=True,
+        )[:SLOWEST_RESOURCES],
+        'waterfall': waterfall,
+    }
+
+
+def capture_network(driver) -> List[str]:
+    """
+    Write a report for every navigation since the last capture.
+
+    A no-op unless diagnostics are enabled. Returns the report paths.
+    """
+    if not diagnostics_enabled():
+        return []
+    try:
+        events = _read_events(driver)
+        main_frame = driver.execute_cdp_cmd('Page.getFrameTree', {})['frameTree']['frame']['id']
+    except Exception as e:
+        # Never let diagnostics break a run, e.g. when the browser already died
+        debug(f"Network capture unavailable: {str(e)}")
+        return []
+
+    paths = []
+    for navigation in split_navigations(events, main_frame):
+        report = navigation_report(navigation)
+        page = urlparse(report['url'] or '').path.strip('/').replace('/', '_') or 'page'
+        path = os.path.join(artifact_dir(), f"{_stamp()}-network-{page[:60]}.json")
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        record_artifact(
+            'network', path,
+            url=report['url'],
+            ttfb_ms=report['ttfb_ms'],
+            dom_content_loaded_ms=report['dom_content_loaded_ms'],
+            requests=report['requests'],
+        )
+        debug(f"Network: {report['url']} TTFB {report['ttfb_ms']}ms, "
+              f"DOMContentLoaded {report['dom_content_loaded_ms']}ms, {report['requests']} requests")
+        paths.append(path)
+    return paths
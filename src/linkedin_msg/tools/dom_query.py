@@ -0,0 +1,118 @@
+"""
+Single round-trip DOM queries.
+
+Reading tag, href, text and aria-label of N elements through WebDriver costs
+one HTTP round trip per attribute per element. query_candidates() instead runs
+one in-page script that evaluates several locators and returns a compact
+description of every match, so matches can be picked on the Python side.
+"""
+
+from typing import List, Optional, Sequence, Tuple
+
+from selenium.webdriver.remote.webelement import WebElement
+
+# Matches returned per locator, to keep the payload small on busy pages
+MAX_CANDIDATES = 50
+# Characters of innerText returned per element
+MAX_TEXT_LENGTH = 200
+
+_QUERY_SCRIPT = """
+const root = arguments[0] || document;
+const locators = arguments[1];
+const limit = arguments[2];
+const maxText = arguments[3];
+
+function matches(by, value) {
+    if (by === 'css selector') {
+        return Array.from(root.querySelectorAll(value));
+    }
+    if (by === 'xpath') {
+        const found = [];
+        const snapshot = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+        for (let i = 0; i < snapshot.snapshotLength; i++) {
+            found.push(snapshot.snapshotItem(i));
+        }
+        return found;
+    }
+    return [];
+}
+
+function describe(el) {
+    const rect = el.getBoundingClientRect();
+    const style = window.getComputedStyle(el);
+    return {
+        element: el,
+        tag: el.tagName.toLowerCase(),
+        href: typeof el.href === 'string' ? el.href : el.getAttribute('href'),
+        text: (el.innerText || el.textContent || '').trim().slice(0, maxText),
+        aria_label: el.getAttribute('aria-label'),
+        visible: rect.width > 0 && rect.height > 0
+            && style.visibility !== 'hidden' && style.display !== 'none' && style.opacity !== '0',
+        rect: {x: rect.x, y: rect.y, width: rect.width, height: rect.height},
+    };
+}
+
+return locators.map(([by, value]) => {
+    const started = performance.now();
+    let found;
+    try {
+        found = matches(by, value).slice(0, limit).map(describe);
+    } catch (e) {
+        found = [];
+    }
+    return [found, performance.now() - started];
+});
+"""
+
+
+class Candidate:
+    """Description of one matched element, plus the element itself for clicking."""
+
+    def __init__(self, element: WebElement, tag: str, href: Optional[str], text: str,
+                 aria_label: Optional[str], visible: bool, rect: dict):
+        self.element = element
+        self.tag = tag
+        self.href = href
+        self.text = text
+        self.aria_label = aria_label
+        self.visible = visible
+        self.rect = rect
+
+    def __repr__(self):
+        return f"<Candidate {self.tag} text={self.text[:30]!r} href={self.href!r} visible={self.visible}>"
+
+
+def query_candidates_timed(root, locators: Sequence[Tuple[str, str]],
+                           limit: int = MAX_CANDIDATES) -> Tuple[List[List[Candidate]], List[float]]:
+    """
+    Like query_candidates(), but also return the seconds each locator took in the page.
+
+    Returns:
+        (candidates, seconds): one list of Candidates and one duration per locator.
+    """
+    if isinstance(root, WebElement):
+        driver, scope = root.parent, root
+    else:
+        driver, scope = root, None
+    results = driver.execute_script(
+        _QUERY_SCRIPT, scope, [list(locator) for locator in locators], limit, MAX_TEXT_LENGTH
+    )
+    candidates = [[Candidate(**description) for description in matches or []] for matches, _ in results]
+    seconds = [elapsed_ms / 1000 for _, elapsed_ms in results]
+    return candidates, seconds
+
+
+def query_candidates(root, locators: Sequence[Tuple[str, str]],
+                     limit: int = MAX_CANDIDATES) -> List[List[Candidate]]:
+    """
+    Evaluate several locators under `root` in one execute_script call.
+
+    Args:
+        root: The driver (searches the whole document) or an element to search under
+        locators: Selenium (By, value) pairs; CSS selectors and XPath are supported
+        limit: Maximum matches returned per locator
+
+    Returns:
+        One list of Candidates per locator, in document order.
+    """
+    return query_candidates_timed(root, locators, limit)[0]
@@ -0,0 +1,390 @@
+"""
+Pool of warm Chrome sessions for the LinkedIn tools.
+
+Each crew run leases one BrowserSession for its whole duration. The session is
+bound to the current context (contextvars), so the tools of that run - and only
+that run - see it, even when CrewAI executes them in a worker thread.
+"""
+
+import asyncio
+import atexit
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import partial
+from typing import Callable, List, Optional
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+
+from src.linkedin_msg.tools.browser_profiles import (
+    BLOCKED_URL_PATTERNS,
+    browser_profile_name,
+    load_browser_profiles,
+)
+from src.linkedin_msg.tools.diagnostics import capture_network, diagnostics_enabled
+from src.linkedin_msg.tools.session_cache import profile_dir
+from src.linkedin_msg.tracing import debug
+
+
+def create_driver(slot: int = 0, profile: Optional[str] = None, extra_arguments: tuple = ()) -> webdriver.Chrome:
+    """
+    Start a new Chrome instance with the automation-friendly options.
+
+    When session caching is enabled the browser runs on the cached profile of
+    the configured account for its pool slot, so it starts out logged in.
+
+    Args:
+        slot: Pool slot of the browser
+        profile: Browser profile from config/browser.yaml; defaults to BROWSER_PROFILE
+        extra_arguments: Chrome switches added to the profile's, e.g. for the benchmark
+    """
+    name = profile or browser_profile_name()
+    profiles = load_browser_profiles()
+    if name not in profiles:
+        raise ValueError(f"Unknown browser profile '{name}'. Available: {', '.join(profiles)}")
+    settings = profiles[name]
+
+    chrome_options = Options()
+    user_data_dir = profile_dir(os.getenv("LINKEDIN_EMAIL"), slot)
+    if user_data_dir:
+        chrome_options.add_argument(f"--user-data-dir={user_data_dir}")
+    if settings.get('headless'):
+        chrome_options.add_argument("--headless=new")
+    if settings.get('window_size'):
+        width, height = settings['window_size']
+        chrome_options.add_argument(f"--window-size={width},{height}")
+    for argument in [*settings.get('arguments', []), *extra_arguments]:
+        chrome_options.add_argument(argument)
+    chrome_options.page_load_strategy = settings.get('page_load_strategy', 'normal')
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    if diagnostics_enabled():
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    blocked = settings.get('block', [])
+    if 'images' in blocked:
+        chrome_options.add_experimental_option(
+            'prefs', {'profile.managed_default_content_settings.images': 2}
+        )
+
+    driver = webdriver.Chrome(options=chrome_options)
+    # Kept on the driver so tabs opened later can be given the same blocks (see block_urls)
+    driver.blocked_urls = [pattern for kind in blocked for pattern in BLOCKED_URL_PATTERNS[kind]]
+    block_urls(driver)
+    return driver
+
+
+def block_urls(driver):
+    """
+    Apply the browser profile's URL blocks to the tab the driver is switched to.
+
+    Network.setBlockedURLs only affects the CDP target it is sent to, so every
+    tab opened after the first needs its own call before it loads anything.
+    """
+    patterns = getattr(driver, 'blocked_urls', None)
+    if patterns:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+
+class BrowserSession:
+    """Browser state owned by a single crew run."""
+
+    def __init__(self, driver, slot: int = 0):
+        self.driver = driver
+        self.slot = slot
+        self.logged_in = False
+        self.uses = 0
+        self.broken = False
+        # (normalized name, window handle) of the background search tab, see tools/lookahead.py
+        self.lookahead: Optional[tuple] = None
+
+
+_current_session: ContextVar[Optional[BrowserSession]] = ContextVar(
+    'linkedin_browser_session', default=None
+)
+
+
+def current_session() -> Optional[BrowserSession]:
+    """Return the browser session bound to the current run, if any."""
+    return _current_session.get()
+
+
+class DriverPool:
+    """
+    Bounded pool of reusable browser sessions.
+
+    Sessions are health-checked before they are handed out again, and replaced
+    after `max_uses` leases or when a run marks them as broken. Every live
+    browser owns one of `size` slots, which keeps per-slot resources such as the
+    Chrome profile directory exclusive to one browser at a time.
+
+    Blocking Selenium and LLM work runs on the pool's own worker threads (see
+    run_blocking), one per browser, so every leased session can make progress
+    concurrently without tying up the event loop or its default executor.
+    """
+
+    def __init__(self, size: Optional[int] = None, max_uses: Optional[int] = None,
+                 driver_factory: Callable = create_driver):
+        self.size = size or int(os.getenv('DRIVER_POOL_SIZE', '2'))
+        self.max_uses = max_uses or int(os.getenv('DRIVER_MAX_USES', '25'))
+        self._driver_factory = driver_factory
+        self._idle: List[BrowserSession] = []
+        # Sessions leased by ensure_session() outside of session()/lease(); released by close()
+        self._unbound: List[BrowserSession] = []
+        self._free_slots = list(range(self.size))
+        self._leased = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._executor = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="linkedin-worker")
+        # Runs waiting for a free browser block on these threads, never on asyncio's default
+        # executor, so they cannot starve the runs that hold a browser and need a thread to finish
+        self._waiters = ThreadPoolExecutor(max_workers=self.size, thread_name_prefix="linkedin-acquire")
+
+    def warm(self, count: Optional[int] = None):
+        """Start browsers up front so the first runs don't pay for Chrome startup."""
+        count = min(count or self.size, self.size)
+        with self._cond:
+            missing = count - len(self._idle) - self._leased
+            if missing <= 0:
+                return
+            # Reserve the slots while the browsers start outside the lock
+            self._leased += missing
+
+        def _start():
+            try:
+                return self._new_session()
+            except Exception as e:
+                debug(f"Failed to warm browser: {str(e)}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=missing) as executor:
+            sessions = [s for s in executor.map(lambda _: _start(), range(missing)) if s]
+
+        with self._cond:
+            self._leased -= missing
+            self._idle.extend(sessions)
+            self._cond.notify_all()
+
+    def acquire(self, timeout: Optional[float] = None, affinity: Optional[str] = None) -> BrowserSession:
+        """
+        Lease a healthy session, starting a new browser if the pool has room.
+
+        An idle browser holding the lookahead search for `affinity` (a
+        normalized person name) is preferred; other runs prefer browsers
+        without a pending lookahead, so they don't take one that is spoken for.
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("DriverPool is closed")
+                if self._idle:
+                    session = self._take_idle(affinity)
+                    break
+                if self._leased + len(self._idle) < self.size:
+                    session = None
+                    break
+                if not self._cond.wait(timeout):
+                    raise TimeoutError(f"No browser available after {timeout}s")
+            self._leased += 1
+
+        try:
+            if session is not None and not self._is_healthy(session):
+                self._discard(session)
+                session = None
+            if session is None:
+                session = self._new_session()
+        except Exception:
+            with self._cond:
+                self._leased -= 1
+                self._cond.notify()
+            raise
+
+        session.uses += 1
+        return session
+
+    def _take_idle(self, affinity: Optional[str]) -> BrowserSession:
+        def rank(index: int) -> tuple:
+            lookahead = self._idle[index].lookahead
+            if lookahead is None:
+                return 1, index
+            return (2 if lookahead[0] == affinity else 0), index
+
+        # Among equally ranked browsers the most recently released one wins
+        return self._idle.pop(max(range(len(self._idle)), key=rank))
+
+    def release(self, session: BrowserSession):
+        """Return a session to the pool, recycling it if it is worn out or broken."""
+        recycle = self._closed or session.broken or session.uses >= self.max_uses
+        if recycle:
+            self._discard(session)
+
+        with self._cond:
+            self._leased -= 1
+            if not recycle:
+                self._idle.append(session)
+            self._cond.notify()
+
+    def acquire_unbound(self) -> BrowserSession:
+        """Lease a session that no session()/lease() block owns; close() releases it."""
+        session = self.acquire()
+        with self._cond:
+            self._unbound.append(session)
+        return session
+
+    @contextmanager
+    def lease(self):
+        """Lease a session and bind it to the current context for the duration of the block."""
+        session = self.acquire()
+        token = _current_session.set(session)
+        try:
+            yield session
+        except BaseException:
+            session.broken = True
+            raise
+        finally:
+            _current_session.reset(token)
+            try:
+                if diagnostics_enabled():
+                    self._capture_network(session)
+            finally:
+                self.release(session)
+
+    @asynccontextmanager
+    async def session(self, affinity: Optional[str] = None):
+        """Async version of lease(); waiting for a free browser does not block the event loop."""
+        waiting = asyncio.get_running_loop().run_in_executor(
+            self._waiters, partial(self.acquire, affinity=affinity)
+        )
+        try:
+            session = await asyncio.shield(waiting)
+        except asyncio.CancelledError:
+            # A browser granted after the caller gave up goes straight back to the pool
+            waiting.add_done_callback(self._release_abandoned)
+            raise
+        token = _current_session.set(session)
+        try:
+            yield session
+        except BaseException:
+            session.broken = True
+            raise
+        finally:
+            _current_session.reset(token)
+            try:
+                if diagnostics_enabled():
+                    # On the pool's own threads: one is always free for a leased browser,
+                    # so giving the browser back never waits for a shared executor
+                    await self.run_blocking(self._capture_network, session)
+            finally:
+                self.release(session)
+
+    def _release_abandoned(self, waiting):
+        if not waiting.cancelled() and waiting.exception() is None:
+            self.release(waiting.result())
+
+    @staticmethod
+    def _capture_network(session: BrowserSession):
+        # Diagnostics must never keep a browser from going back to the pool
+        try:
+            capture_network(session.driver)
+        except Exception as e:
+            debug(f"Network capture failed: {str(e)}")
+
+    async def run_blocking(self, func: Callable, *args, **kwargs):
+        """
+        Run a blocking call on the pool's worker threads and await its result.
+
+        The current context is copied to the worker thread, so the call sees
+        the session bound by session()/lease() and the traced person.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(self._executor, partial(context.run, func, *args, **kwargs))
+
+    def close(self):
+        """Quit all idle and unbound browsers; leased ones are quit when they are released."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            unbound, self._unbound = self._unbound, []
+            self._cond.notify_all()
+        self._executor.shutdown(wait=False)
+        self._waiters.shutdown(wait=False)
+        for session in idle:
+            self._discard(session)
+        for session in unbound:
+            self.release(session)
+
+    def _new_session(self) -> BrowserSession:
+        with self._cond:
+            slot = self._free_slots.pop()
+        try:
+            return BrowserSession(self._driver_factory(slot), slot)
+        except Exception:
+            with self._cond:
+                self._free_slots.append(slot)
+            raise
+
+    @staticmethod
+    def _is_healthy(session: BrowserSession) -> bool:
+        try:
+            session.driver.current_url
+            return True
+        except WebDriverException:
+            return False
+
+    def _discard(self, session: BrowserSession):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+        with self._cond:
+            self._free_slots.append(session.slot)
+
+
+_default_pool: Optional[DriverPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> DriverPool:
+    """Return the process-wide driver pool, creating it on first use."""
+    global _default_pool
+
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def set_default_pool(pool: Optional[DriverPool]):
+    """Replace the process-wide driver pool, closing the previous one."""
+    global _default_pool
+
+    with _default_pool_lock:
+        previous, _default_pool = _default_pool, pool
+    if previous is not None and previous is not pool:
+        previous.close()
+
+
+def ensure_session() -> BrowserSession:
+    """
+    Return the session bound to the current run.
+
+    When a tool is used outside of a leased run (e.g. called directly by a crew
+    started elsewhere), a session is leased from the default pool and bound to
+    the current context. It holds a pool slot until the pool is closed, at exit
+    or by set_default_pool(), so callers should prefer DriverPool.lease().
+    """
+    session = current_session()
+    if session is None:
+        session = get_default_pool().acquire_unbound()
+        _current_session.set(session)
+    return session
@@ -2,22 +2,35 @@ from crewai.tools import BaseTool
 from typing import Type, Optional
 from pydantic import BaseModel, Field
 import os
-import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from dotenv import load_dotenv
+from src.linkedin_msg.errors import AUTH_LOST, TRANSIENT, classify_exception
+from src.linkedin_msg.scheduler import DailyCapReached, current_pacing
+from src.linkedin_msg.tools.diagnostics import save_screenshot
+from src.linkedin_msg.tools.lookahead import take_lookahead
+from src.linkedin_msg.tools.driver_pool import current_session, ensure_session, get_default_pool
+from src.linkedin_msg.tools.results import result_attrs, result_outcome, tool_result
+from src.linkedin_msg.tools.profile_cache import get_profile_cache, profile_cache_enabled
+from src.linkedin_msg.tools.selector_engine import get_selector_engine
+from src.linkedin_msg.tools.session_cache import is_logged_out, restore_session, save_session
+from src.linkedin_msg.tools.urls import is_profile_url, linkedin_url, people_search_url
+from src.linkedin_msg.tracing import debug, traced
+from src.linkedin_msg.tools.waits import (
+    navigate,
+    step_timeout,
+    wait_for_any,
+    wait_for_dom_ready,
+    wait_for_element,
+    wait_for_gone,
+    wait_for_network_idle,
+    wait_for_url_contains,
+)
 
 # Load environment variables from .env file
 load_dotenv()
 
 
-# Global driver instance
-_driver_instance = None
-
 
 class LinkedInAutomationInput(BaseModel):
     """Input schema for LinkedIn Automation."""
@@ -49,19 +62,81 @@ class LinkedInConnectInput(BaseModel):
     note: str = Field(description="Personal note to include with the connection request")
 
 
-class LinkedInLoginTool(BaseTool):
+class _BrowserTool(BaseTool):
+    """Base for the Selenium tools: _arun runs the blocking _run on the driver pool's threads."""
+
+    async def _arun(self, *args, **kwargs) -> str:
+        return await get_default_pool().run_blocking(self._run, *args, **kwargs)
+
+    async def run_in_pool(self, **kwargs) -> str:
+        """Call the tool through BaseTool.run (usage counting included) on the driver pool's threads."""
+        return await get_default_pool().run_blocking(self.run, **kwargs)
+
+
+def _logged_out(session) -> Optional[str]:
+    """Return a not_logged_in result if LinkedIn redirected to its login page, else None."""
+    url = session.driver.current_url
+    if not is_logged_out(url):
+        return None
+    debug(f"Session was logged out (redirected to {url})")
+    session.logged_in = False
+    return tool_result("not_logged_in", kind=AUTH_LOST, url=url)
+
+
+# Chrome's own error page (DNS, connection reset, offline), a 5xx or 429 response,
+# or a page that rendered nothing; any of these can look like an empty search
+_PAGE_ERROR_SCRIPT = """
+if (location.protocol === 'chrome-error:' || document.querySelector('#main-frame-error, body.neterror')) {
+    return 'network error';
+}
+var navigation = performance.getEntriesByType('navigation')[0];
+var status = navigation && navigation.responseStatus;
+if (status && (status >= 500 || status === 429)) {
+    return 'HTTP ' + status;
+}
+if (!document.body || !document.body.innerText.trim()) {
+    return 'empty page';
+}
+return null;
+"""
+
+
+def _page_error(driver, person_name: str) -> Optional[str]:
+    """Return a transient page_error result if the page failed to load, else None."""
+    error = driver.execute_script(_PAGE_ERROR_SCRIPT)
+    if not error:
+        return None
+    debug(f"Search page did not load: {error}")
+    return tool_result("page_error", kind=TRANSIENT, query=person_name, error=error)
+
+
+def _pace() -> Optional[str]:
+    """Wait for the batch's pacing budget before an outbound action; returns a result to stop with if it is used up."""
+    pacing = current_pacing()
+    if pacing is None:
+        return None
+    try:
+        pacing.acquire()
+    except DailyCapReached as e:
+        print(f"[INFO] {str(e)}")
+        return tool_result("daily_cap_reached", error=str(e))
+    return None
+
+
+class LinkedInLoginTool(_BrowserTool):
     name: str = "LinkedIn Login Tool"
     description: str = (
         "Logs into LinkedIn using credentials from environment variables (.env file). "
         "Automatically loads LINKEDIN_EMAIL and LINKEDIN_PASSWORD. "
         "No parameters required - credentials are loaded automatically. "
-        "Returns the driver instance for subsequent operations."
+        "Opens the browser session that the other LinkedIn tools work in."
     )
     args_schema: Type[BaseModel] = LinkedInLoginInput
 
+    @traced("tool.login", outcome=result_outcome, attrs=result_attrs)
     def _run(self, email: str = "", password: str = "") -> str:
         """Execute LinkedIn login."""
-        global _driver_instance
+        session = None
 
         try:
             # Always get credentials from environment variables
@@ -70,290 +145,280 @@ class LinkedInLoginTool(BaseTool):
             password = os.getenv("LINKEDIN_PASSWORD")
 
             if not email or not password:
-                return "Error: LinkedIn credentials not found in environment variables. Please check your .env file."
+                return tool_result("missing_credentials", error="LINKEDIN_EMAIL and LINKEDIN_PASSWORD must be set in .env")
+
+            # Use the browser leased for this run
+            session = ensure_session()
+            driver = session.driver
 
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument("--start-maximized")
-            chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
+            # A pooled browser may still be logged in from a previous run
+            if session.logged_in and driver.get_cookie("li_at"):
+                return tool_result("logged_in", account=email, session="reused")
 
-            # Initialize driver
-            _driver_instance = webdriver.Chrome(options=chrome_options)
+            # Otherwise try the session cached by an earlier run before typing credentials
+            if restore_session(driver, email):
+                session.logged_in = True
+                return tool_result("logged_in", account=email, session="restored")
 
             # Navigate to LinkedIn
-            _driver_instance.get("https://www.linkedin.com/login")
-            time.sleep(2)
+            navigate(driver, linkedin_url("/login"))
 
             # Enter credentials
-            email_field = WebDriverWait(_driver_instance, 10).until(
-                EC.presence_of_element_located((By.ID, "username"))
+            email_field = wait_for_element(
+                driver, (By.ID, "username"), step_timeout('login', 'page_ready')
             )
             email_field.send_keys(email)
 
-            password_field = _driver_instance.find_element(By.ID, "password")
+            password_field = driver.find_element(By.ID, "password")
             password_field.send_keys(password)
 
             # Click login button
-            login_button = _driver_instance.find_element(By.CSS_SELECTOR, "button[type='submit']")
+            login_button = driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             login_button.click()
 
-            # Wait for login to complete
-            time.sleep(5)
+            # Wait for the post-login redirect (feed, network page or a verification checkpoint)
+            try:
+                wait_for_url_contains(
+                    driver,
+                    ["feed", "mynetwork", "checkpoint"],
+                    step_timeout('login', 'redirect'),
+                )
+            except TimeoutException:
+                pass
 
             # Check if login was successful
-            if "feed" in _driver_instance.current_url or "mynetwork" in _driver_instance.current_url:
-                return f"Successfully logged into LinkedIn as {email}"
+            if "feed" in driver.current_url or "mynetwork" in driver.current_url:
+                session.logged_in = True
+                save_session(driver, email)
+                return tool_result("logged_in", account=email, session="new")
             else:
-                return "Login may have failed or requires additional verification"
+                return tool_result("login_unverified", url=driver.current_url)
 
         except Exception as e:
-            if _driver_instance:
-                _driver_instance.quit()
-                _driver_instance = None
-            return f"Error during LinkedIn login: {str(e)}"
+            # Let the pool replace the browser instead of reusing it in an unknown state
+            if session:
+                session.broken = True
+            return tool_result("error", kind=classify_exception(e), error=f"LinkedIn login failed: {str(e)}")
+
 
+def _read_profile_name(driver, timeout: float) -> Optional[str]:
+    """Wait for the profile header and return the person's name, or None."""
+    try:
+        return get_selector_engine().wait(driver, 'profile_name', timeout, state="visible").text
+    except TimeoutException:
+        return None
 
-class LinkedInSearchTool(BaseTool):
+
+def _profile_found(profile_name: str, profile_url: str) -> str:
+    print("[INFO] ══════════════════════════════════════════")
+    print(f"[INFO] ✓ SELECTED FIRST RESULT: {profile_name}")
+    print(f"[INFO] ✓ Profile URL: {profile_url}")
+    print("[INFO] ══════════════════════════════════════════")
+    return tool_result("profile_found", name=profile_name, url=profile_url)
+
+
+class LinkedInSearchTool(_BrowserTool):
     name: str = "LinkedIn Search Tool"
     description: str = (
         "Searches for a person on LinkedIn and navigates to their profile."
     )
     args_schema: Type[BaseModel] = LinkedInSearchInput
 
+    @traced("tool.search", outcome=result_outcome, attrs=result_attrs)
     def _run(self, person_name: str) -> str:
         """Execute LinkedIn search."""
-        global _driver_instance
+        session = current_session()
 
         try:
-            if not _driver_instance:
-                return "Error: Please login first using LinkedIn Login Tool"
+            if not session:
+                return tool_result("not_logged_in", error="Please login first using LinkedIn Login Tool")
+            driver = session.driver
+
+            # Go straight to the profile if this query was resolved before
+            if profile_cache_enabled():
+                cached = get_profile_cache().get(person_name)
+                if cached:
+                    debug(f"Profile cache hit for '{person_name}': {cached['profile_url']}")
+                    navigate(driver, cached['profile_url'])
+                    logged_out = _logged_out(session)
+                    if logged_out:
+                        return logged_out
+                    profile_name = _read_profile_name(driver, step_timeout('search', 'profile_load'))
+                    if profile_name:
+                        return _profile_found(profile_name, cached['profile_url'])
+                    debug("Cached profile did not load, running a full search")
+                    get_profile_cache().invalidate(person_name)
+
+            # Use the search results a lookahead tab loaded while the previous person was processed
+            profile_url = take_lookahead(session, person_name)
+            if profile_url:
+                debug(f"Lookahead resolved '{person_name}': {profile_url}")
+                navigate(driver, profile_url)
+                logged_out = _logged_out(session)
+                if logged_out:
+                    return logged_out
+                profile_name = _read_profile_name(driver, step_timeout('search', 'profile_name'))
+                if profile_name:
+                    if profile_cache_enabled():
+                        get_profile_cache().put(person_name, profile_url, profile_name)
+                    return _profile_found(profile_name, profile_url)
+                debug("Lookahead profile did not load, running a full search")
 
             # Navigate to search
-            search_url = f"https://www.linkedin.com/search/results/people/?keywords={person_name.replace(' ', '%20')}"
-            print(f"[DEBUG] Searching for: {person_name}")
-            print(f"[DEBUG] Search URL: {search_url}")
-            _driver_instance.get(search_url)
-            time.sleep(5)  # Increased wait time for results to load
+            search_url = people_search_url(person_name)
+            debug(f"Searching for: {person_name}")
+            debug(f"Search URL: {search_url}")
+            navigate(driver, search_url)
+            logged_out = _logged_out(session)
+            if logged_out:
+                return logged_out
+            wait_for_dom_ready(driver, step_timeout('search', 'page_ready'), state="interactive")
 
             # Check current URL for debugging
-            current_url = _driver_instance.current_url
-            print(f"[DEBUG] Current URL after search: {current_url}")
+            current_url = driver.current_url
+            debug(f"Current URL after search: {current_url}")
 
             # Wait for search results with multiple selectors
             try:
-                # Try different selectors for search results
-                selectors = [
-                    "li.reusable-search__result-container",
-                    "li[class*='search-result']",
-                    "div.search-results-container",
-                    "ul.reusable-search__entity-result-list"
-                ]
-
                 first_result = None
-                for selector in selectors:
-                    try:
-                        print(f"[DEBUG] Trying selector: {selector}")
-                        first_result = WebDriverWait(_driver_instance, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        print(f"[DEBUG] Found result with selector: {selector}")
-                        break
-                    except TimeoutException:
-                        continue
+                try:
+                    first_result = get_selector_engine().wait(
+                        driver, 'search_result', step_timeout('search', 'results')
+                    )
+                except TimeoutException:
+                    pass
 
                 if not first_result:
-                    print(f"[DEBUG] No results found for any selector")
-                    # Take a screenshot for debugging
-                    try:
-                        screenshot_path = f"/tmp/linkedin_search_{person_name.replace(' ', '_')}.png"
-                        _driver_instance.save_screenshot(screenshot_path)
-                        print(f"[DEBUG] Screenshot saved to: {screenshot_path}")
-                    except:
-                        pass
-                    return f"No search results found for '{person_name}'. Please verify the name spelling or try searching on LinkedIn manually first."
+                    page_error = _page_error(driver, person_name)
+                    if page_error:
+                        save_screenshot(driver, "search_page_error")
+                        return page_error
+                    debug("No results found for any selector")
+                    save_screenshot(driver, "search_no_results")
+                    return tool_result("no_results", query=person_name)
 
                 print(f"[INFO] ✓ Found search results for '{person_name}'")
-                print(f"[INFO] → Selecting FIRST person from search results...")
+                print("[INFO] → Selecting FIRST person from search results...")
 
                 # Find the first profile link - try finding all links and filter for profile links
-                print(f"[DEBUG] Looking for profile links in search results...")
+                debug("Looking for profile links in search results...")
 
-                # First, try to find all clickable profile links
                 try:
-                    # Get all links in the first result
-                    all_links = first_result.find_elements(By.TAG_NAME, "a")
-                    print(f"[DEBUG] Found {len(all_links)} links in first result")
-
-                    profile_link = None
-                    for link in all_links:
-                        try:
-                            href = link.get_attribute("href")
-                            if href and "/in/" in href and "linkedin.com/in/" in href:
-                                profile_link = link
-                                print(f"[DEBUG] Found profile link: {href}")
-                                break
-                        except:
-                            continue
-
-                    if not profile_link:
-                        # Try finding by parent container
-                        print(f"[DEBUG] Trying alternative selectors...")
-                        link_selectors = [
-                            "a.app-aware-link[href*='/in/']",
-                            "a[href*='/in/']",
-                            ".entity-result__title-text a",
-                            "span.entity-result__title-text a",
-                            ".entity-result__content a[href*='/in/']"
-                        ]
-
-                        for link_sel in link_selectors:
-                            try:
-                                profile_link = first_result.find_element(By.CSS_SELECTOR, link_sel)
-                                if profile_link:
-                                    print(f"[DEBUG] Found with selector: {link_sel}")
-                                    break
-                            except NoSuchElementException:
-                                continue
+                    profile_link = get_selector_engine().find_candidate(
+                        first_result, 'profile_link', match=lambda link: bool(link.href) and is_profile_url(link.href)
+                    )
 
                     if not profile_link:
-                        # Take screenshot for debugging
-                        try:
-                            screenshot_path = f"/tmp/linkedin_search_results_{person_name.replace(' ', '_')}.png"
-                            _driver_instance.save_screenshot(screenshot_path)
-                            print(f"[DEBUG] Screenshot saved to: {screenshot_path}")
-                        except:
-                            pass
-                        return f"Found search results but couldn't find profile link for '{person_name}'. Screenshot saved for debugging."
+                        save_screenshot(driver, "search_no_profile_link")
+                        return tool_result("no_profile_link", query=person_name)
 
                 except Exception as e:
-                    print(f"[DEBUG] Error finding profile link: {str(e)}")
-                    return f"Found search results but couldn't extract profile link for '{person_name}': {str(e)}"
+                    debug(f"Error finding profile link: {str(e)}")
+                    return tool_result("no_profile_link", query=person_name, error=str(e))
 
-                profile_url = profile_link.get_attribute("href")
+                profile_url = profile_link.href
                 print(f"[INFO] ✓ FIRST result profile URL: {profile_url}")
-                print(f"[INFO] → Clicking on this profile...")
-                profile_link.click()
-                time.sleep(4)
-                print(f"[INFO] ✓ Navigated to profile page")
+                print("[INFO] → Clicking on this profile...")
+                profile_link.element.click()
+                try:
+                    wait_for_url_contains(driver, ["/in/"], step_timeout('search', 'profile_load'))
+                except TimeoutException:
+                    debug("Profile URL not reached yet, continuing")
+                print("[INFO] ✓ Navigated to profile page")
 
                 # Get profile name
                 try:
-                    name_selectors = [
-                        "h1.text-heading-xlarge",
-                        "h1[class*='heading']",
-                        "h1.inline"
-                    ]
-
-                    profile_name = None
-                    for name_sel in name_selectors:
-                        try:
-                            profile_name = WebDriverWait(_driver_instance, 10).until(
-                                EC.presence_of_element_located((By.CSS_SELECTOR, name_sel))
-                            ).text
-                            if profile_name:
-                                break
-                        except:
-                            continue
+                    profile_name = _read_profile_name(driver, step_timeout('search', 'profile_name'))
 
                     if profile_name:
-                        print(f"[INFO] ══════════════════════════════════════════")
-                        print(f"[INFO] ✓ SELECTED FIRST RESULT: {profile_name}")
-                        print(f"[INFO] ✓ Profile URL: {profile_url}")
-                        print(f"[INFO] ══════════════════════════════════════════")
-                        return f"Found FIRST profile in search results: {profile_name}\nProfile URL: {profile_url}\nThis is the person who will receive your connection request."
+                        if profile_cache_enabled():
+                            get_profile_cache().put(person_name, profile_url, profile_name)
+                        return _profile_found(profile_name, profile_url)
                     else:
-                        print(f"[DEBUG] Couldn't extract name but on profile")
-                        return f"Navigated to profile but couldn't extract name\nProfile URL: {profile_url}"
+                        debug("Couldn't extract name but on profile")
+                        return tool_result("profile_found", url=profile_url)
                 except Exception as e:
-                    print(f"[DEBUG] Error extracting profile name: {str(e)}")
-                    return f"Navigated to profile but couldn't extract name\nProfile URL: {profile_url}"
+                    debug(f"Error extracting profile name: {str(e)}")
+                    return tool_result("profile_found", url=profile_url)
 
             except TimeoutException:
-                print(f"[DEBUG] Timeout waiting for search results")
-                return f"No search results found for '{person_name}'. The profile may not exist or name may be spelled differently."
+                debug("Timeout waiting for search results")
+                return _page_error(driver, person_name) or tool_result("no_results", query=person_name)
 
         except Exception as e:
-            print(f"[DEBUG] Error during search: {str(e)}")
-            return f"Error during LinkedIn search: {str(e)}"
+            debug(f"Error during search: {str(e)}")
+            return tool_result("error", kind=classify_exception(e), error=f"LinkedIn search failed: {str(e)}")
 
 
-class LinkedInMessageTool(BaseTool):
+class LinkedInMessageTool(_BrowserTool):
     name: str = "LinkedIn Message Tool"
     description: str = (
         "Checks if messaging is available and sends a message on the current LinkedIn profile."
     )
     args_schema: Type[BaseModel] = LinkedInMessageInput
 
+    @traced("tool.message", outcome=result_outcome, attrs=result_attrs)
     def _run(self, message: str) -> str:
         """Execute LinkedIn messaging."""
-        global _driver_instance
+        session = current_session()
 
         try:
-            if not _driver_instance:
-                return "Error: Please login first using LinkedIn Login Tool"
+            if not session:
+                return tool_result("not_logged_in", error="Please login first using LinkedIn Login Tool")
+            driver = session.driver
+            logged_out = _logged_out(session)
+            if logged_out:
+                return logged_out
 
-            time.sleep(2)
+            wait_for_dom_ready(driver, step_timeout('message', 'profile_ready'))
 
             # Look for message button
             try:
-                # Try different selectors for message button
-                message_button = None
-                selectors = [
-                    "button.pvs-profile-actions__action[aria-label*='Message']",
-                    "button[aria-label*='Message']",
-                    "a[href*='/messaging/']",
-                ]
-
-                for selector in selectors:
-                    try:
-                        message_button = _driver_instance.find_element(By.CSS_SELECTOR, selector)
-                        if message_button:
-                            break
-                    except NoSuchElementException:
-                        continue
+                message_button = get_selector_engine().find(driver, 'message_button')
 
                 if not message_button:
-                    return "Message button not available for this profile. User may not be a connection or messaging may be restricted."
+                    return tool_result("message_unavailable")
+
+                capped = _pace()
+                if capped:
+                    return capped
 
                 # Click message button
                 message_button.click()
-                time.sleep(2)
 
                 # Find message input box
-                message_box = WebDriverWait(_driver_instance, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-form__contenteditable"))
+                message_box = wait_for_element(
+                    driver,
+                    (By.CSS_SELECTOR, "div.msg-form__contenteditable"),
+                    step_timeout('message', 'message_box'),
                 )
 
                 # Type message
                 message_box.click()
                 message_box.send_keys(message)
-                time.sleep(1)
 
-                # Send message
-                send_button = _driver_instance.find_element(By.CSS_SELECTOR, "button.msg-form__send-button")
+                # Send message once the form has enabled the button
+                send_button = wait_for_element(
+                    driver,
+                    (By.CSS_SELECTOR, "button.msg-form__send-button"),
+                    step_timeout('message', 'message_box'),
+                    state="clickable",
+                )
                 send_button.click()
-                time.sleep(2)
+                wait_for_network_idle(driver, step_timeout('message', 'send_confirm'))
 
-                return f"Successfully sent message: '{message}'"
+                return tool_result("message_sent")
 
             except TimeoutException:
-                return "Message button found but unable to send message. May require verification or connection request."
+                return tool_result("message_failed")
             except NoSuchElementException:
-                return "Message button not available for this profile."
+                return tool_result("message_unavailable")
 
         except Exception as e:
-            return f"Error during LinkedIn messaging: {str(e)}"
-        finally:
-            # Close browser after all automation tasks are complete
-            if _driver_instance:
-                time.sleep(3)
-                _driver_instance.quit()
-                _driver_instance = None
+            return tool_result("error", kind=classify_exception(e), error=f"LinkedIn messaging failed: {str(e)}")
 
 
-class LinkedInConnectTool(BaseTool):
+class LinkedInConnectTool(_BrowserTool):
     name: str = "LinkedIn Connection Request Tool"
     description: str = (
         "Sends a connection request with a personalized note to a LinkedIn profile. "
@@ -361,176 +426,132 @@ class LinkedInConnectTool(BaseTool):
     )
     args_schema: Type[BaseModel] = LinkedInConnectInput
 
+    @traced("tool.connect", outcome=result_outcome, attrs=result_attrs)
     def _run(self, note: str) -> str:
         """Execute LinkedIn connection request with note."""
-        global _driver_instance
+        session = current_session()
 
         try:
-            if not _driver_instance:
-                return "Error: Please login first using LinkedIn Login Tool"
-
-            time.sleep(3)
+            if not session:
+                return tool_result("not_logged_in", error="Please login first using LinkedIn Login Tool")
+            driver = session.driver
+            logged_out = _logged_out(session)
+            if logged_out:
+                return logged_out
+
+            # Wait for the profile header / action bar to render before scanning buttons
+            try:
+                wait_for_any(
+                    driver,
+                    [
+                        (By.CSS_SELECTOR, "div.pvs-profile-actions"),
+                        (By.CSS_SELECTOR, "h1.text-heading-xlarge"),
+                        (By.CSS_SELECTOR, "main h1"),
+                    ],
+                    step_timeout('connect', 'profile_ready'),
+                )
+            except TimeoutException:
+                debug("Profile header not detected, scanning anyway")
 
-            print(f"[DEBUG] Looking for Connect button...")
+            debug("Looking for Connect button...")
 
-            # Look for Connect button with comprehensive detection
+            # Look for Connect button, trying the strategy that worked most recently first
             try:
-                connect_button = None
-
-                # Strategy 1: Try CSS selectors
-                selectors = [
-                    "button[aria-label*='Connect']",
-                    "button.pvs-profile-actions__action[aria-label*='Connect']",
-                    "button.artdeco-button--secondary[aria-label*='Connect']",
-                    "button[aria-label*='Invite']",
-                    "div.pvs-profile-actions button[aria-label*='Connect']",
-                ]
-
-                for selector in selectors:
-                    try:
-                        print(f"[DEBUG] Trying selector: {selector}")
-                        connect_button = _driver_instance.find_element(By.CSS_SELECTOR, selector)
-                        if connect_button and connect_button.is_displayed():
-                            print(f"[DEBUG] ✓ Found Connect button with selector: {selector}")
-                            break
-                        else:
-                            connect_button = None
-                    except NoSuchElementException:
-                        continue
+                connect_button = get_selector_engine().find(driver, 'connect_button', require_displayed=True)
 
-                # Strategy 2: Find all buttons and search for "Connect" in text
                 if not connect_button:
-                    print(f"[DEBUG] Trying to find Connect button by text content...")
-                    try:
-                        all_buttons = _driver_instance.find_elements(By.TAG_NAME, "button")
-                        print(f"[DEBUG] Found {len(all_buttons)} total buttons on page")
-                        for button in all_buttons:
-                            try:
-                                button_text = button.text.strip()
-                                aria_label = button.get_attribute("aria-label") or ""
-                                if ("Connect" in button_text or "Connect" in aria_label) and button.is_displayed():
-                                    connect_button = button
-                                    print(f"[DEBUG] ✓ Found Connect button by text: '{button_text}' / aria-label: '{aria_label}'")
-                                    break
-                            except:
-                                continue
-                    except Exception as e:
-                        print(f"[DEBUG] Error searching buttons by text: {str(e)}")
+                    # Tell an existing connection or a pending invitation apart from a missing button
+                    if get_selector_engine().find(driver, 'pending_button', require_displayed=True):
+                        return tool_result("pending")
+                    if get_selector_engine().find(driver, 'message_button', require_displayed=True):
+                        return tool_result("already_connected")
+                    save_screenshot(driver, "connect_not_found")
+                    return tool_result("connect_unavailable")
 
-                if not connect_button:
-                    # Take screenshot for debugging
-                    try:
-                        screenshot_path = "/tmp/linkedin_connect_not_found.png"
-                        _driver_instance.save_screenshot(screenshot_path)
-                        print(f"[DEBUG] Screenshot saved to: {screenshot_path}")
-                    except:
-                        pass
-                    return "Connect button not available. The person may already be a connection, or you may have a pending request."
+                capped = _pace()
+                if capped:
+                    return capped
 
-                print(f"[INFO] ✓ Found Connect button, clicking...")
+                print("[INFO] ✓ Found Connect button, clicking...")
 
                 # Click connect button
                 connect_button.click()
-                print(f"[INFO] ✓ Clicked Connect button, waiting for dialog...")
-                time.sleep(3)
+                print("[INFO] ✓ Clicked Connect button, waiting for dialog...")
 
                 # Look for "Add a note" button
                 try:
-                    print(f"[DEBUG] Looking for 'Add a note' button...")
-                    add_note_selectors = [
-                        "button[aria-label='Add a note']",
-                        "button[aria-label*='Add a note']",
-                        "button[aria-label*='note']",
-                    ]
-
+                    debug("Looking for 'Add a note' button...")
                     add_note_button = None
-                    for selector in add_note_selectors:
-                        try:
-                            print(f"[DEBUG] Trying 'Add a note' selector: {selector}")
-                            add_note_button = WebDriverWait(_driver_instance, 5).until(
-                                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                            )
-                            if add_note_button:
-                                print(f"[DEBUG] ✓ Found 'Add a note' button with selector: {selector}")
-                                break
-                        except TimeoutException:
-                            continue
+                    try:
+                        add_note_button = get_selector_engine().wait(
+                            driver, 'add_note', step_timeout('connect', 'dialog'), state="clickable"
+                        )
+                    except TimeoutException:
+                        pass
 
                     if add_note_button:
                         add_note_button.click()
-                        print(f"[INFO] ✓ Clicked 'Add a note' button")
-                        time.sleep(2)
+                        print("[INFO] ✓ Clicked 'Add a note' button")
 
                         # Find the note text area
-                        print(f"[DEBUG] Looking for note textarea...")
-                        note_textarea = WebDriverWait(_driver_instance, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "textarea[name='message']"))
+                        debug("Looking for note textarea...")
+                        note_textarea = wait_for_element(
+                            driver,
+                            (By.CSS_SELECTOR, "textarea[name='message']"),
+                            step_timeout('connect', 'note_textarea'),
                         )
-                        print(f"[DEBUG] ✓ Found note textarea")
+                        debug("✓ Found note textarea")
 
                         # Type the note
                         note_textarea.click()
                         note_textarea.clear()
                         note_textarea.send_keys(note)
                         print(f"[INFO] ✓ Typed personalized note: '{note[:50]}...'")
-                        time.sleep(1)
 
                         # Click Send button
-                        print(f"[DEBUG] Looking for Send button...")
-                        send_selectors = [
-                            "button[aria-label='Send now']",
-                            "button[aria-label*='Send']",
-                        ]
-
-                        send_button = None
-                        for selector in send_selectors:
-                            try:
-                                send_button = _driver_instance.find_element(By.CSS_SELECTOR, selector)
-                                if send_button and send_button.is_displayed():
-                                    print(f"[DEBUG] ✓ Found Send button with selector: {selector}")
-                                    break
-                            except NoSuchElementException:
-                                continue
+                        debug("Looking for Send button...")
+                        send_button = get_selector_engine().find(driver, 'send', require_displayed=True)
 
                         if send_button:
                             send_button.click()
-                            print(f"[INFO] ✓ Clicked Send button")
-                            time.sleep(3)
-                            print(f"[INFO] ══════════════════════════════════════════")
-                            print(f"[INFO] ✓ CONNECTION REQUEST SENT SUCCESSFULLY!")
+                            print("[INFO] ✓ Clicked Send button")
+                            wait_for_gone(driver, send_button, step_timeout('connect', 'send_confirm'))
+                            print("[INFO] ══════════════════════════════════════════")
+                            print("[INFO] ✓ CONNECTION REQUEST SENT SUCCESSFULLY!")
                             print(f"[INFO] ✓ Note included: '{note}'")
-                            print(f"[INFO] ══════════════════════════════════════════")
-                            return f"Successfully sent connection request with note: '{note}'"
+                            print("[INFO] ══════════════════════════════════════════")
+                            return tool_result("request_sent", note=True)
                         else:
-                            print(f"[DEBUG] Could not find Send button")
-                            return "Found note dialog but could not find Send button."
+                            debug("Could not find Send button")
+                            return tool_result("send_not_found")
 
                     else:
                         # If "Add a note" is not available, try to send without note
-                        print(f"[DEBUG] 'Add a note' button not found, trying to send without note...")
+                        debug("'Add a note' button not found, trying to send without note...")
                         try:
-                            send_button = _driver_instance.find_element(By.CSS_SELECTOR, "button[aria-label='Send without a note']")
+                            send_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Send without a note']")
                             send_button.click()
-                            time.sleep(2)
-                            print(f"[INFO] ✓ Sent connection request without note option")
-                            return f"Sent connection request (note option not available)"
+                            wait_for_gone(driver, send_button, step_timeout('connect', 'send_confirm'))
+                            print("[INFO] ✓ Sent connection request without note option")
+                            return tool_result("request_sent", note=False)
                         except NoSuchElementException:
                             # Try generic Send button
                             try:
-                                send_button = _driver_instance.find_element(By.CSS_SELECTOR, "button[aria-label*='Send']")
+                                send_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label*='Send']")
                                 send_button.click()
-                                time.sleep(2)
-                                print(f"[INFO] ✓ Sent connection request")
-                                return f"Sent connection request (attempted with note: '{note}')"
+                                wait_for_gone(driver, send_button, step_timeout('connect', 'send_confirm'))
+                                print("[INFO] ✓ Sent connection request")
+                                return tool_result("request_sent", note=False)
                             except NoSuchElementException:
-                                return "Unable to complete connection request. Dialog opened but could not send."
+                                return tool_result("send_not_found")
 
                 except Exception as note_error:
-                    print(f"[DEBUG] Error in note handling: {str(note_error)}")
-                    return f"Connect button clicked but error adding note: {str(note_error)}"
+                    debug(f"Error in note handling: {str(note_error)}")
+                    return tool_result("note_failed", kind=classify_exception(note_error), error=str(note_error))
 
             except NoSuchElementException:
-                return "Connect button not found. May already be connected or have a pending request."
+                return tool_result("connect_unavailable")
 
         except Exception as e:
-            return f"Error during LinkedIn connection request: {str(e)}"
\ No newline at end of file
+            return tool_result("error", kind=classify_exception(e),
+                               error=f"LinkedIn connection request failed: {str(e)}")
\ No newline at end of file
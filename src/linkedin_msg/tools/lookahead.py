@@ -0,0 +1,156 @@
+"""
+Lookahead search in a second browser tab.
+
+In a pipelined batch (BATCH_LOOKAHEAD=true, direct mode), the next person's
+people search is opened in a background tab of the same browser while the
+current person's connect step runs in the main tab. The tab is opened with
+window.open, so the main tab keeps Selenium's focus and the search page loads
+concurrently with the connect dialog's waits. When the next person's search
+step runs on that browser, it only reads the first result from the loaded
+tab and goes straight to the profile. The browser profile's URL blocks are
+applied to the tab before the search loads (see driver_pool.block_urls).
+
+Only one lookahead tab is kept per browser. The driver pool hands the browser
+holding a person's lookahead to that person's run (see DriverPool.acquire),
+and a tab nobody claims is closed the next time the browser is used.
+"""
+
+import os
+from typing import Optional
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from src.linkedin_msg.tools.driver_pool import block_urls, current_session
+from src.linkedin_msg.tools.profile_cache import get_profile_cache, normalize_query, profile_cache_enabled
+from src.linkedin_msg.tools.selector_engine import get_selector_engine
+from src.linkedin_msg.tools.session_cache import is_logged_out
+from src.linkedin_msg.tools.urls import is_profile_url, people_search_url
+from src.linkedin_msg.tools.waits import step_timeout
+from src.linkedin_msg.tracing import debug, span
+
+
+def lookahead_enabled() -> bool:
+    """True if batches resolve the next person's profile during the current connect step."""
+    return os.getenv('BATCH_LOOKAHEAD', 'false').lower() == 'true'
+
+
+def start_lookahead(person_name: str) -> bool:
+    """
+    Open the people search for `person_name` in a background tab of the current session.
+
+    Returns:
+        True if a tab was opened; False if the profile is already cached or
+        the browser did not open a tab.
+    """
+    session = current_session()
+    if session is None:
+        return False
+    try:
+        discard_lookahead(session)
+    except WebDriverException:
+        return False
+    if profile_cache_enabled() and get_profile_cache().get(person_name):
+        return False
+
+    driver = session.driver
+    url = people_search_url(person_name)
+    # A tab with URL blocks opens empty, gets the blocks, then loads the search
+    blocked = bool(getattr(driver, 'blocked_urls', None))
+    with span("lookahead.open", upcoming=person_name) as current:
+        try:
+            handles = set(driver.window_handles)
+            driver.execute_script("window.open(arguments[0], '_blank');", 'about:blank' if blocked else url)
+            opened = [handle for handle in driver.window_handles if handle not in handles]
+            if opened and blocked:
+                main = driver.current_window_handle
+                session.lookahead = (normalize_query(person_name), opened[0])
+                try:
+                    driver.switch_to.window(opened[0])
+                    block_urls(driver)
+                    driver.execute_script("window.location.href = arguments[0];", url)
+                finally:
+                    _return_to_main(session, main)
+        except WebDriverException as e:
+            # The lookahead is an optimization; the current person's run must not fail over it
+            current.outcome = type(e).__name__
+            return False
+        if not opened:
+            current.outcome = "blocked"
+            return False
+        session.lookahead = (normalize_query(person_name), opened[0])
+    debug(f"Lookahead search opened for: {person_name}")
+    return True
+
+
+def _return_to_main(session, main: str):
+    """Switch back to the main tab; a browser that cannot is marked broken so the pool replaces it."""
+    try:
+        session.driver.switch_to.window(main)
+    except WebDriverException:
+        session.broken = True
+        raise
+
+
+def discard_lookahead(session):
+    """Close the session's lookahead tab, if any; the main tab keeps the focus."""
+    if session.lookahead is None:
+        return
+    _, handle = session.lookahead
+    session.lookahead = None
+    driver = session.driver
+    main = driver.current_window_handle
+    try:
+        driver.switch_to.window(handle)
+        driver.close()
+    except WebDriverException:
+        pass
+    finally:
+        _return_to_main(session, main)
+
+
+def take_lookahead(session, person_name: str) -> Optional[str]:
+    """
+    Read the first profile URL from the lookahead tab opened for `person_name`.
+
+    The tab is closed either way. Returns None if there is no lookahead for
+    this person or its search did not produce a profile link, in which case
+    the caller runs the regular search.
+    """
+    if session.lookahead is None:
+        return None
+    if session.lookahead[0] != normalize_query(person_name):
+        discard_lookahead(session)
+        return None
+
+    _, handle = session.lookahead
+    session.lookahead = None
+    driver = session.driver
+    main = driver.current_window_handle
+    with span("lookahead.take") as current:
+        try:
+            driver.switch_to.window(handle)
+        except WebDriverException as e:
+            # The tab is gone; the main tab still has the focus and must not be closed
+            current.outcome = type(e).__name__
+            _return_to_main(session, main)
+            return None
+        try:
+            if is_logged_out(driver.current_url):
+                # Let the regular search report the lost session
+                current.outcome = "logged_out"
+                return None
+            first_result = get_selector_engine().wait(driver, 'search_result', step_timeout('search', 'results'))
+            profile_link = get_selector_engine().find_candidate(
+                first_result, 'profile_link', match=lambda link: bool(link.href) and is_profile_url(link.href)
+            )
+            current.outcome = "hit" if profile_link else "no_profile_link"
+            return profile_link.href if profile_link else None
+        except (TimeoutException, WebDriverException) as e:
+            current.outcome = type(e).__name__
+            return None
+        finally:
+            try:
+                driver.close()
+            except WebDriverException:
+                pass
+            _return_to_main(session, main)
@@ -0,0 +1,125 @@
+"""
+Persistent cache of resolved profiles: search query → profile URL.
+
+Entries expire after a TTL and the least recently used entries are evicted
+once the cache grows past its size limit.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from src.linkedin_msg.storage import cache_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    query        TEXT PRIMARY KEY,
+    profile_url  TEXT NOT NULL,
+    display_name TEXT,
+    resolved_at  REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS profiles_last_used ON profiles (last_used_at);
+"""
+
+
+def normalize_query(query: str) -> str:
+    """Normalize a search query so spacing and casing differences share one entry."""
+    return " ".join(query.lower().split())
+
+
+def canonical_profile_url(url: str) -> str:
+    """Strip tracking parameters and trailing slashes from a profile URL."""
+    return url.split('?')[0].split('#')[0].rstrip('/')
+
+
+class ProfileCache:
+    """SQLite-backed person_name → profile cache with TTL expiry and LRU eviction."""
+
+    def __init__(self, path: Optional[str] = None, ttl_days: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.path = path or os.path.join(cache_dir(), 'profiles.sqlite3')
+        if ttl_days is None:
+            ttl_days = float(os.getenv('PROFILE_CACHE_TTL_DAYS', '30'))
+        self.ttl = ttl_days * 86400
+        if max_entries is None:
+            max_entries = int(os.getenv('PROFILE_CACHE_MAX_ENTRIES', '10000'))
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, query: str) -> Optional[dict]:
+        """
+        Look up a query.
+
+        Returns:
+            Dict with 'profile_url', 'display_name' and 'resolved_at', or None
+            if the query is unknown or its entry has expired.
+        """
+        key = normalize_query(query)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT profile_url, display_name, resolved_at FROM profiles WHERE query = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] > self.ttl:
+                self._conn.execute("DELETE FROM profiles WHERE query = ?", (key,))
+                return None
+            self._conn.execute("UPDATE profiles SET last_used_at = ? WHERE query = ?", (now, key))
+        return {'profile_url': row[0], 'display_name': row[1], 'resolved_at': row[2]}
+
+    def put(self, query: str, profile_url: str, display_name: Optional[str] = None):
+        """Store the profile a query resolved to, evicting the least recently used entries if full."""
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO profiles VALUES (?, ?, ?, ?, ?)",
+                (normalize_query(query), canonical_profile_url(profile_url), display_name, now, now),
+            )
+            self._conn.execute(
+                "DELETE FROM profiles WHERE query IN ("
+                " SELECT query FROM profiles ORDER BY last_used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def invalidate(self, query: str):
+        """Drop a query, e.g. when its cached profile no longer loads."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM profiles WHERE query = ?", (normalize_query(query),))
+
+    def purge_expired(self) -> int:
+        """Delete all expired entries and return how many were removed."""
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM profiles WHERE resolved_at < ?", (time.time() - self.ttl,)
+            )
+        return cursor.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM profiles").fetchone()[0]
+
+
+_default_cache: Optional[ProfileCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def profile_cache_enabled() -> bool:
+    """Profile caching is on unless PROFILE_CACHE=false."""
+    return os.getenv('PROFILE_CACHE', 'true').lower() == 'true'
+
+
+def get_profile_cache() -> ProfileCache:
+    """Return the process-wide profile cache, opening it on first use."""
+    global _default_cache
+
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = ProfileCache()
+        return _default_cache
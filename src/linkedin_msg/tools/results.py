@@ -0,0 +1,56 @@
+"""
+Compact structured tool results.
+
+Every LinkedIn tool returns a single JSON object with a status code and only
+the fields later steps need, e.g.
+
+    {"status":"profile_found","name":"Jane Doe","url":"https://www.linkedin.com/in/jane-doe"}
+
+Tool results are what the agent sees as observations and what ends up in the
+context of later tasks, so they are kept short. parse_result() reads them
+back for the direct pipeline and the job store.
+"""
+
+import json
+
+# Status codes that mean the tool itself failed (see result_outcome)
+ERROR_STATUSES = ("error", "missing_credentials", "not_logged_in")
+
+
+def tool_result(status: str, **fields) -> str:
+    """Format a tool result; fields that are None are left out."""
+    result = {'status': status}
+    result.update((key, value) for key, value in fields.items() if value is not None)
+    return json.dumps(result, ensure_ascii=False, separators=(',', ':'))
+
+
+def parse_result(output) -> dict:
+    """
+    Parse a tool result back into a dict.
+
+    Output that is not a tool result (e.g. an agent's free-text final answer)
+    is returned as {'status': 'unknown', 'text': output}.
+    """
+    text = str(output).strip()
+    try:
+        result = json.loads(text)
+    except ValueError:
+        # Agents sometimes wrap the result line in prose; use the last JSON object in it
+        start, end = text.rfind('{"status"'), text.rfind('}')
+        try:
+            result = json.loads(text[start:end + 1]) if 0 <= start < end else None
+        except ValueError:
+            result = None
+    if isinstance(result, dict) and 'status' in result:
+        return result
+    return {'status': 'unknown', 'text': text}
+
+
+def result_outcome(output) -> str:
+    """Span outcome for a tool result: 'error' for error statuses, 'ok' otherwise."""
+    return "error" if parse_result(output)['status'] in ERROR_STATUSES else "ok"
+
+
+def result_attrs(output) -> dict:
+    """Span attributes for a tool result: its status code."""
+    return {'status': parse_result(output)['status']}
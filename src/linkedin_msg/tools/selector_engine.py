@@ -0,0 +1,289 @@
+"""
+Selector strategy engine.
+
+Each logical target (search_result, connect_button, ...) has an ordered list
+of lookup strategies in config/selectors.yaml. The engine records hits,
+misses and time-to-match per strategy and per site, tries the strategy that
+currently works first, and keeps those statistics across runs in SQLite.
+"""
+
+import atexit
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+import yaml
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+
+from src.linkedin_msg.storage import cache_dir
+from src.linkedin_msg.tools.dom_query import Candidate, query_candidates_timed
+from src.linkedin_msg.tools.urls import base_url
+from src.linkedin_msg.tools.waits import wait_for_any
+from src.linkedin_msg.tracing import debug, span
+
+SELECTORS_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'selectors.yaml')
+
+# Score of a strategy that has never been tried; scores move towards 1 on hits and 0 on misses
+UNTRIED_SCORE = 0.5
+# Weight of the latest attempt in the score (exponential moving average)
+SCORE_WEIGHT = 0.3
+# Stats are written to disk after this many new attempts, and on exit
+FLUSH_EVERY = 25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS selector_stats (
+    site       TEXT NOT NULL,
+    target     TEXT NOT NULL,
+    strategy   TEXT NOT NULL,
+    hits       INTEGER NOT NULL,
+    misses     INTEGER NOT NULL,
+    total_ms   REAL NOT NULL,
+    score      REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (site, target, strategy)
+);
+"""
+
+
+def _xpath_literal(text: str) -> str:
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    parts = text.split("'")
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in parts) + ")"
+
+
+class Strategy:
+    """One compiled lookup strategy: a Selenium locator plus its stats key."""
+
+    def __init__(self, key: str, by: str, value: str, index: int):
+        self.key = key
+        self.by = by
+        self.value = value
+        self.index = index
+
+    @property
+    def locator(self):
+        return (self.by, self.value)
+
+
+def compile_strategy(spec: dict, index: int) -> Strategy:
+    """Compile one entry of selectors.yaml into a Strategy."""
+    if 'css' in spec:
+        return Strategy(spec['css'], By.CSS_SELECTOR, spec['css'], index)
+    if 'xpath' in spec:
+        return Strategy(spec['xpath'], By.XPATH, spec['xpath'], index)
+    if 'text' in spec:
+        # One XPath query instead of reading .text and aria-label of every element
+        tag = spec.get('tag', '*')
+        text = _xpath_literal(spec['text'])
+        xpath = f".//{tag}[contains(normalize-space(.), {text}) or contains(@aria-label, {text})]"
+        return Strategy(f"text:{tag}:{spec['text']}", By.XPATH, xpath, index)
+    raise ValueError(f"Unknown selector strategy: {spec}")
+
+
+@lru_cache(maxsize=1)
+def load_selector_config() -> Dict[str, List[Strategy]]:
+    """Load and compile the strategies from config/selectors.yaml."""
+    with open(SELECTORS_CONFIG_PATH, 'r') as f:
+        raw = yaml.safe_load(f) or {}
+    return {
+        target: [compile_strategy(spec, i) for i, spec in enumerate(specs)]
+        for target, specs in raw.items()
+    }
+
+
+def selector_adaptive() -> bool:
+    """Adaptive strategy ordering is on unless SELECTOR_ADAPTIVE=false."""
+    return os.getenv('SELECTOR_ADAPTIVE', 'true').lower() == 'true'
+
+
+def current_site() -> str:
+    """The host the tools are pointed at; stats are kept per site."""
+    return urlparse(base_url()).netloc
+
+
+class _StrategyStats:
+    def __init__(self, hits: int = 0, misses: int = 0, total_ms: float = 0.0, score: float = UNTRIED_SCORE):
+        self.hits = hits
+        self.misses = misses
+        self.total_ms = total_ms
+        self.score = score
+        self.dirty = False
+
+
+class SelectorEngine:
+    """Finds elements for logical targets, trying the best-scoring strategy first."""
+
+    def __init__(self, path: Optional[str] = None, strategies: Optional[Dict[str, List[Strategy]]] = None,
+                 adaptive: Optional[bool] = None):
+        self.path = path or os.path.join(cache_dir(), 'selectors.sqlite3')
+        self.adaptive = selector_adaptive() if adaptive is None else adaptive
+        self._strategies = strategies or load_selector_config()
+        self._stats: Dict[tuple, _StrategyStats] = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.executescript(_SCHEMA)
+        for row in self._conn.execute(
+            "SELECT site, target, strategy, hits, misses, total_ms, score FROM selector_stats"
+        ):
+            self._stats[row[:3]] = _StrategyStats(*row[3:])
+
+    def ordered(self, target: str, site: Optional[str] = None) -> List[Strategy]:
+        """Return the strategies for `target`, best score first (config order on ties)."""
+        strategies = self._strategies[target]
+        if not self.adaptive:
+            return list(strategies)
+        site = site or current_site()
+        with self._lock:
+            scores = {
+                s.key: self._stats[(site, target, s.key)].score if (site, target, s.key) in self._stats
+                else UNTRIED_SCORE
+                for s in strategies
+            }
+        return sorted(strategies, key=lambda s: (-scores[s.key], s.index))
+
+    def record(self, target: str, strategy: Strategy, hit: bool, duration: float, site: Optional[str] = None):
+        """Record one attempt of `strategy` and update its score."""
+        key = (site or current_site(), target, strategy.key)
+        with self._lock:
+            stats = self._stats.setdefault(key, _StrategyStats())
+            if hit:
+                stats.hits += 1
+                stats.total_ms += duration * 1000
+            else:
+                stats.misses += 1
+            stats.score = (1 - SCORE_WEIGHT) * stats.score + SCORE_WEIGHT * (1.0 if hit else 0.0)
+            stats.dirty = True
+            self._pending += 1
+            flush = self._pending >= FLUSH_EVERY
+        if flush:
+            self.save()
+
+    def find_candidate(self, root, target: str, require_displayed: bool = False,
+                       match: Optional[Callable[[Candidate], bool]] = None) -> Optional[Candidate]:
+        """
+        Look up `target` under `root` (the driver or an element) without waiting.
+
+        All strategies are evaluated in one execute_script round trip; the
+        first candidate of the best-ordered strategy that is visible (if
+        `require_displayed`) and passes `match` wins. Each strategy's time is
+        measured in the page, so its stats are not charged for the others.
+
+        Returns:
+            The winning Candidate, or None if no strategy matched.
+        """
+        site = current_site()
+        strategies = self.ordered(target, site)
+        with span("selector", target=target, strategies=len(strategies)) as attempt:
+            results, timings = query_candidates_timed(root, [s.locator for s in strategies])
+
+            for strategy, candidates, elapsed in zip(strategies, results, timings):
+                candidate = next(
+                    (c for c in candidates
+                     if (c.visible or not require_displayed) and (match is None or match(c))),
+                    None,
+                )
+                self.record(target, strategy, candidate is not None, elapsed, site)
+                if candidate is not None:
+                    attempt.outcome = "hit"
+                    attempt.set(selector=strategy.value)
+                    debug(f"✓ Found {target} with selector: {strategy.value}")
+                    return candidate
+            attempt.outcome = "miss"
+        return None
+
+    def find(self, root, target: str, require_displayed: bool = False,
+             match: Optional[Callable[[Candidate], bool]] = None):
+        """Like find_candidate(), but return the element itself (or None)."""
+        candidate = self.find_candidate(root, target, require_displayed, match)
+        return candidate.element if candidate else None
+
+    def wait(self, driver, target: str, timeout: float, state: str = "present"):
+        """
+        Wait until any strategy for `target` matches and return the element.
+
+        All strategies are polled together (see wait_for_any); the ones ordered
+        before the winner count as misses. Raises TimeoutException if none match.
+        """
+        site = current_site()
+        strategies = self.ordered(target, site)
+        started = time.perf_counter()
+        try:
+            locator, element = wait_for_any(driver, [s.locator for s in strategies], timeout, state)
+        except TimeoutException:
+            for strategy in strategies:
+                self.record(target, strategy, False, 0.0, site)
+            raise
+        elapsed = time.perf_counter() - started
+        for strategy in strategies:
+            if strategy.locator == locator:
+                self.record(target, strategy, True, elapsed, site)
+                debug(f"✓ Found {target} with selector: {strategy.value}")
+                break
+            self.record(target, strategy, False, 0.0, site)
+        return element
+
+    def stats(self, site: Optional[str] = None) -> Dict[str, List[dict]]:
+        """Return per-strategy stats for every target, in the order they are currently tried."""
+        site = site or current_site()
+        report = {}
+        for target in self._strategies:
+            rows = []
+            for strategy in self.ordered(target, site):
+                with self._lock:
+                    stats = self._stats.get((site, target, strategy.key)) or _StrategyStats()
+                rows.append({
+                    'strategy': strategy.key,
+                    'hits': stats.hits,
+                    'misses': stats.misses,
+                    'avg_ms': round(stats.total_ms / stats.hits, 2) if stats.hits else None,
+                    'score': round(stats.score, 3),
+                })
+            report[target] = rows
+        return report
+
+    def save(self):
+        """Write changed stats to disk."""
+        now = time.time()
+        with self._lock:
+            rows = []
+            for (site, target, key), stats in self._stats.items():
+                if stats.dirty:
+                    stats.dirty = False
+                    rows.append((site, target, key, stats.hits, stats.misses, stats.total_ms, stats.score, now))
+            self._pending = 0
+            if not rows:
+                return
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT INTO selector_stats"
+                    " (site, target, strategy, hits, misses, total_ms, score, updated_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (site, target, strategy) DO UPDATE SET"
+                    " hits = excluded.hits, misses = excluded.misses, total_ms = excluded.total_ms,"
+                    " score = excluded.score, updated_at = excluded.updated_at",
+                    rows,
+                )
+
+
+_default_engine: Optional[SelectorEngine] = None
+_default_engine_lock = threading.Lock()
+
+
+def get_selector_engine() -> SelectorEngine:
+    """Return the process-wide selector engine, loading its stats on first use."""
+    global _default_engine
+
+    with _default_engine_lock:
+        if _default_engine is None:
+            _default_engine = SelectorEngine()
+            atexit.register(_default_engine.save)
+        return _default_engine
@@ -0,0 +1,142 @@
+"""
+Persistent cache of authenticated LinkedIn sessions.
+
+A session is stored per account as a cookie file plus Chrome user-data-dir
+profiles (one per pool slot, since Chrome cannot share a profile between
+running instances). Restoring a session costs one navigation to the feed
+instead of a full login.
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Optional
+from urllib.parse import urlparse
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from src.linkedin_msg.storage import cache_dir
+from src.linkedin_msg.tools.urls import base_url, linkedin_url
+from src.linkedin_msg.tools.waits import navigate, step_timeout, wait_for_url_contains
+from src.linkedin_msg.tracing import debug
+
+AUTH_COOKIE = "li_at"
+
+# URL fragments of the pages LinkedIn redirects to when a session is not logged in
+LOGGED_OUT_MARKERS = ("/login", "authwall", "/uas/")
+
+
+def is_logged_out(url: str) -> bool:
+    """True if `url` is one of LinkedIn's login or authwall pages."""
+    return any(marker in url for marker in LOGGED_OUT_MARKERS)
+
+
+def session_cache_enabled() -> bool:
+    """Session caching is on unless SESSION_CACHE=false."""
+    return os.getenv('SESSION_CACHE', 'true').lower() == 'true'
+
+
+def _account_key(account: str) -> str:
+    return hashlib.sha256(account.strip().lower().encode()).hexdigest()[:16]
+
+
+def _account_dir(account: str) -> str:
+    return cache_dir('sessions', _account_key(account))
+
+
+def _cookies_path(account: str) -> str:
+    return os.path.join(_account_dir(account), 'cookies.json')
+
+
+def profile_dir(account: Optional[str], slot: int = 0) -> Optional[str]:
+    """Return the Chrome user-data-dir for an account and pool slot, or None if caching is off."""
+    if not account or not session_cache_enabled():
+        return None
+    return os.path.join(_account_dir(account), f'profile-{slot}')
+
+
+def load_cookies(account: str) -> List[dict]:
+    """Return the cookies saved for an account, or an empty list."""
+    try:
+        with open(_cookies_path(account), 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return []
+
+
+def save_session(driver, account: str):
+    """Save the cookies of a logged-in driver for later runs."""
+    if not session_cache_enabled():
+        return
+
+    cookies = driver.get_cookies()
+    # The file holds live session tokens, so keep it private to the user
+    fd = os.open(_cookies_path(account), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w') as f:
+        json.dump(cookies, f)
+
+
+def invalidate_session(account: str):
+    """Forget the cached cookies of an account."""
+    try:
+        os.remove(_cookies_path(account))
+    except FileNotFoundError:
+        pass
+
+
+def _to_cdp_cookie(cookie: dict) -> dict:
+    """Convert a WebDriver cookie dict to the Network.setCookies format."""
+    cdp_cookie = {
+        'name': cookie['name'],
+        'value': cookie['value'],
+        'domain': cookie.get('domain') or urlparse(base_url()).hostname,
+        'path': cookie.get('path', '/'),
+        'secure': cookie.get('secure', False),
+        'httpOnly': cookie.get('httpOnly', False),
+    }
+    if 'expiry' in cookie:
+        cdp_cookie['expires'] = cookie['expiry']
+    if cookie.get('sameSite') in ('Strict', 'Lax', 'None'):
+        cdp_cookie['sameSite'] = cookie['sameSite']
+    return cdp_cookie
+
+
+def restore_session(driver, account: str) -> bool:
+    """
+    Restore a cached session into `driver` and validate it.
+
+    Cookies already present in the Chrome profile are used as-is; otherwise the
+    saved cookie file is injected over CDP, which works before any page is open.
+    Validation is a single navigation to the feed: LinkedIn redirects to the
+    login/authwall page when the session is no longer valid.
+
+    Returns:
+        True if the browser is logged in, False if a full login is needed.
+    """
+    if not session_cache_enabled():
+        return False
+
+    try:
+        existing = driver.execute_cdp_cmd('Network.getCookies', {'urls': [base_url()]})['cookies']
+        if not any(c['name'] == AUTH_COOKIE for c in existing):
+            cookies = load_cookies(account)
+            if not cookies:
+                return False
+            driver.execute_cdp_cmd('Network.setCookies', {'cookies': [_to_cdp_cookie(c) for c in cookies]})
+
+        navigate(driver, linkedin_url("/feed/"))
+        current_url = wait_for_url_contains(
+            driver,
+            ["/feed", "checkpoint", *LOGGED_OUT_MARKERS],
+            step_timeout('login', 'redirect'),
+        )
+    except (TimeoutException, WebDriverException) as e:
+        debug(f"Could not restore cached session: {str(e)}")
+        return False
+
+    if "/feed" in current_url:
+        return True
+
+    debug("Cached session rejected, falling back to full login")
+    invalidate_session(account)
+    return False
@@ -0,0 +1,29 @@
+"""
+LinkedIn URL helpers.
+
+The site root can be pointed elsewhere with LINKEDIN_BASE_URL, e.g. at the
+local mock site used by the benchmark harness.
+"""
+
+import os
+from urllib.parse import quote, urlparse
+
+
+def base_url() -> str:
+    """Return the LinkedIn site root without a trailing slash."""
+    return os.getenv('LINKEDIN_BASE_URL', 'https://www.linkedin.com').rstrip('/')
+
+
+def linkedin_url(path: str) -> str:
+    """Return an absolute URL for a site path such as '/feed/'."""
+    return f"{base_url()}{path}"
+
+
+def people_search_url(query: str) -> str:
+    """Return the people-search URL for a query."""
+    return linkedin_url(f"/search/results/people/?keywords={quote(query)}")
+
+
+def is_profile_url(url: str) -> bool:
+    """True for links to a member profile (/in/<slug>)."""
+    return urlparse(url).path.startswith("/in/")
@@ -0,0 +1,190 @@
+"""
+Condition-based wait helpers shared by the LinkedIn tools.
+
+Every helper returns as soon as its condition holds and only uses the
+per-step timeout from config/waits.yaml as an upper bound.
+"""
+
+import os
+import time
+from functools import lru_cache
+from typing import Callable, List, Optional, Tuple
+
+import yaml
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from src.linkedin_msg.tools.diagnostics import capture_network
+from src.linkedin_msg.tracing import span, traced
+
+WAITS_CONFIG_PATH = os.path.join(os.path.dirname(__file__), '..', 'config', 'waits.yaml')
+
+DEFAULT_TIMEOUT = 10.0
+
+Locator = Tuple[str, str]
+
+_ELEMENT_STATES = {
+    'present': EC.presence_of_element_located,
+    'visible': EC.visibility_of_element_located,
+    'clickable': EC.element_to_be_clickable,
+}
+
+
+@lru_cache(maxsize=1)
+def load_wait_config() -> dict:
+    """Load the wait configuration from config/waits.yaml."""
+    with open(WAITS_CONFIG_PATH, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+def step_timeout(step: str, name: str, default: float = DEFAULT_TIMEOUT) -> float:
+    """Return the timeout configured for `step.name`, e.g. ('search', 'results')."""
+    return float(load_wait_config().get(step, {}).get(name, default))
+
+
+def _poll_frequency() -> float:
+    return float(load_wait_config().get('poll_frequency', 0.1))
+
+
+def navigate(driver, url: str):
+    """Load a URL, timed as a 'navigate' span."""
+    # Report the previous page's network activity before it is replaced
+    capture_network(driver)
+    with span("navigate", url=url):
+        driver.get(url)
+
+
+def wait_until(driver, condition: Callable, timeout: float, message: str = ""):
+    """Wait until `condition(driver)` returns a truthy value and return it."""
+    return WebDriverWait(
+        driver,
+        timeout,
+        poll_frequency=_poll_frequency(),
+        ignored_exceptions=(StaleElementReferenceException,),
+    ).until(condition, message)
+
+
+@traced("wait.dom_ready")
+def wait_for_dom_ready(driver, timeout: float, state: str = "complete"):
+    """Wait until document.readyState reaches `state` ('interactive' or 'complete')."""
+    accepted = ("interactive", "complete") if state == "interactive" else ("complete",)
+    return wait_until(
+        driver,
+        lambda d: d.execute_script("return document.readyState") in accepted,
+        timeout,
+        f"document.readyState did not reach '{state}'",
+    )
+
+
+@traced("wait.network_idle")
+def wait_for_network_idle(driver, timeout: float, idle_window: Optional[float] = None) -> bool:
+    """
+    Wait until the page stops fetching new resources.
+
+    The page counts as idle once the number of Resource Timing entries has not
+    changed for `idle_window` seconds. Returns False instead of raising if the
+    page keeps loading until `timeout`, since long-polling pages never go idle.
+    """
+    if idle_window is None:
+        idle_window = float(load_wait_config().get('network_idle_window', 0.5))
+
+    deadline = time.monotonic() + timeout
+    last_count = -1
+    stable_since = time.monotonic()
+    while time.monotonic() < deadline:
+        count = driver.execute_script("return performance.getEntriesByType('resource').length")
+        now = time.monotonic()
+        if count != last_count:
+            last_count = count
+            stable_since = now
+        elif now - stable_since >= idle_window:
+            return True
+        time.sleep(_poll_frequency())
+    return False
+
+
+@traced("wait.element")
+def wait_for_element(driver, locator: Locator, timeout: float, state: str = "present"):
+    """Wait for a single element to be present, visible or clickable and return it."""
+    return wait_until(
+        driver,
+        _ELEMENT_STATES[state](locator),
+        timeout,
+        f"{locator[1]} not {state}",
+    )
+
+
+def wait_for_any(driver, locators: List[Locator], timeout: float, state: str = "present"):
+    """
+    Wait for the first of several locators to match.
+
+    All locators are checked on every poll, so a cascade of fallback selectors
+    costs one timeout in total instead of one timeout per selector.
+
+    Returns:
+        Tuple of (matched locator, element).
+    """
+    conditions = [(locator, _ELEMENT_STATES[state](locator)) for locator in locators]
+
+    def _first_match(d):
+        for locator, condition in conditions:
+            try:
+                element = condition(d)
+            except StaleElementReferenceException:
+                continue
+            if element:
+                return locator, element
+        return False
+
+    with span("wait.any", candidates=len(locators)) as current:
+        locator, element = wait_until(
+            driver,
+            _first_match,
+            timeout,
+            f"none of {[l[1] for l in locators]} became {state}",
+        )
+        current.set(selector=locator[1])
+    return locator, element
+
+
+@traced("wait.url")
+def wait_for_url_contains(driver, fragments: List[str], timeout: float) -> str:
+    """Wait until the current URL contains any of `fragments` and return it."""
+    def _matching_url(d):
+        url = d.current_url
+        return url if any(fragment in url for fragment in fragments) else False
+
+    return wait_until(driver, _matching_url, timeout, f"URL never contained any of {fragments}")
+
+
+@traced("wait.url")
+def wait_for_url_change(driver, old_url: str, timeout: float) -> str:
+    """Wait until the current URL differs from `old_url` and return the new URL."""
+    return wait_until(
+        driver,
+        lambda d: d.current_url if d.current_url != old_url else False,
+        timeout,
+        f"URL did not change from {old_url}",
+    )
+
+
+@traced("wait.gone")
+def wait_for_gone(driver, element, timeout: float) -> bool:
+    """
+    Wait until `element` is detached from the DOM or hidden.
+
+    Returns False instead of raising on timeout so callers can treat it as a
+    best-effort confirmation step.
+    """
+    def _gone(d):
+        try:
+            return not element.is_displayed()
+        except StaleElementReferenceException:
+            return True
+
+    try:
+        wait_until(driver, _gone, timeout)
+        return True
+    except TimeoutException:
+        return False
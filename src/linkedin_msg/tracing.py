@@ -0,0 +1,352 @@
+"""
+Span-based timing instrumentation.
+
+Each run writes a JSONL trace (one line per span) under
+~/.cache/linkedin_msg/runs/<run_id>/, plus a summary with p50/p95/p99
+durations per step. Debugging artifacts are stored in artifacts/<person>/
+next to the trace and linked from it. Spans are no-ops until start_run() is called, so the
+tools can be instrumented unconditionally.
+"""
+
+import functools
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from src.linkedin_msg.storage import cache_dir
+
+# Durations kept per step for the percentile summary (reservoir sampled beyond this)
+MAX_SAMPLES_PER_STEP = 10000
+
+# Outcomes that don't count as errors in the summary (selector attempts report hit/miss)
+_OK_OUTCOMES = ("ok", "hit", "miss")
+
+_person: ContextVar[Optional[str]] = ContextVar('linkedin_trace_person', default=None)
+
+# Callbacks that receive every trace entry as it is written (see add_span_listener)
+_listeners: List[Callable[[dict], None]] = []
+
+# (prefix, spans) of the innermost collect_spans() block
+_collector: ContextVar[Optional[tuple]] = ContextVar('linkedin_span_collector', default=None)
+
+
+class Span:
+    """A timed operation. Set `outcome` or call set() to add attributes before it ends."""
+
+    def __init__(self, name: str, attrs: dict):
+        self.name = name
+        self.attrs = attrs
+        self.outcome = "ok"
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class _StepStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.samples: List[float] = []
+
+    def add(self, duration: float, ok: bool):
+        self.count += 1
+        self.total += duration
+        if not ok:
+            self.errors += 1
+        if len(self.samples) < MAX_SAMPLES_PER_STEP:
+            self.samples.append(duration)
+        else:
+            index = random.randrange(self.count)
+            if index < MAX_SAMPLES_PER_STEP:
+                self.samples[index] = duration
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+class Tracer:
+    """Writes the spans of one run to a JSONL file and keeps per-step statistics."""
+
+    def __init__(self, run_id: Optional[str] = None, directory: Optional[str] = None):
+        self.run_id = run_id or datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        self.directory = directory or os.getenv('LINKEDIN_TRACE_DIR') or cache_dir('runs', self.run_id)
+        os.makedirs(self.directory, exist_ok=True)
+        self.path = os.path.join(self.directory, 'trace.jsonl')
+        self._file = open(self.path, 'a', buffering=1, encoding='utf-8')
+        self._stats: Dict[str, _StepStats] = defaultdict(_StepStats)
+        self._lock = threading.Lock()
+
+    def record(self, span: Span, start: float, duration: float):
+        entry = {
+            'run_id': self.run_id,
+            'span': span.name,
+            'person': _person.get(),
+            'start': round(start, 6),
+            'end': round(start + duration, 6),
+            'duration_ms': round(duration * 1000, 3),
+            'outcome': span.outcome,
+        }
+        if span.attrs:
+            entry['attrs'] = span.attrs
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._stats[span.name].add(duration, span.outcome in _OK_OUTCOMES)
+        _notify(entry)
+
+    def started(self, span: Span, start: float):
+        """Tell the span listeners that a span has started (not written to the trace)."""
+        if _listeners:
+            _notify({
+                'run_id': self.run_id,
+                'span': span.name,
+                'person': _person.get(),
+                'start': round(start, 6),
+                'outcome': 'running',
+            })
+
+    def link(self, kind: str, path: str, attrs: dict):
+        """Write a trace line pointing at an artifact file (not counted in the summary)."""
+        entry = {
+            'run_id': self.run_id,
+            'span': 'artifact',
+            'person': _person.get(),
+            'start': round(time.time(), 6),
+            'kind': kind,
+            'path': path,
+        }
+        if attrs:
+            entry['attrs'] = attrs
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def summary(self) -> dict:
+        """Return count, errors and p50/p95/p99/total seconds per step."""
+        with self._lock:
+            stats = {name: (s.count, s.errors, s.total, sorted(s.samples)) for name, s in self._stats.items()}
+        return {
+            name: {
+                'count': count,
+                'errors': errors,
+                'total_s': round(total, 3),
+                'p50_s': round(percentile(samples, 50), 3),
+                'p95_s': round(percentile(samples, 95), 3),
+                'p99_s': round(percentile(samples, 99), 3),
+            }
+            for name, (count, errors, total, samples) in sorted(stats.items())
+        }
+
+    def close(self) -> dict:
+        """Write summary.json next to the trace and close the trace file."""
+        summary = self.summary()
+        with open(os.path.join(self.directory, 'summary.json'), 'w', encoding='utf-8') as f:
+            json.dump({'run_id': self.run_id, 'steps': summary}, f, indent=2)
+        with self._lock:
+            self._file.close()
+        return summary
+
+
+_tracer: Optional[Tracer] = None
+
+
+def tracing_enabled() -> bool:
+    """Tracing is on unless TRACE=false."""
+    return os.getenv('TRACE', 'true').lower() == 'true'
+
+
+def verbose_enabled() -> bool:
+    """[DEBUG] lines are printed only with VERBOSE=true."""
+    return os.getenv('VERBOSE', 'false').lower() == 'true'
+
+
+def debug(message: str):
+    """Print a [DEBUG] line if VERBOSE=true; the trace records the timings either way."""
+    if verbose_enabled():
+        print(f"[DEBUG] {message}")
+
+
+def start_run(run_id: Optional[str] = None) -> Optional[Tracer]:
+    """Start tracing a new run (closing the previous one) and return its tracer."""
+    global _tracer
+
+    if _tracer is not None:
+        _tracer.close()
+        _tracer = None
+    if tracing_enabled():
+        _tracer = Tracer(run_id)
+    return _tracer
+
+
+def end_run() -> Optional[dict]:
+    """Finish the current run and return its per-step summary."""
+    global _tracer
+
+    if _tracer is None:
+        return None
+    summary = _tracer.close()
+    _tracer = None
+    return summary
+
+
+def add_span_listener(listener: Callable[[dict], None]):
+    """
+    Call `listener` with every span of a traced run, in the trace line format.
+
+    Listeners are called once with outcome 'running' when a span starts and
+    again with the finished entry. They run on the thread that ran the span
+    and must be quick; exceptions they raise are ignored.
+    """
+    _listeners.append(listener)
+
+
+def remove_span_listener(listener: Callable[[dict], None]):
+    """Stop calling a listener added with add_span_listener()."""
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+
+def _notify(entry: dict):
+    for listener in list(_listeners):
+        try:
+            listener(entry)
+        except Exception:
+            pass
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the tracer of the current run, if tracing was started."""
+    return _tracer
+
+
+@contextmanager
+def trace_person(person: str):
+    """Attribute all spans in this context to a person."""
+    token = _person.set(person)
+    try:
+        yield
+    finally:
+        _person.reset(token)
+
+
+def artifact_dir() -> str:
+    """
+    Return (and create) the artifact directory for the current run and person.
+
+    Inside a traced run this is runs/<run_id>/artifacts/<person>/ next to the
+    trace; otherwise artifacts/<person>/ under the cache directory.
+    """
+    slug = re.sub(r'[^a-z0-9]+', '-', (_person.get() or 'run').lower()).strip('-') or 'run'
+    tracer = _tracer
+    if tracer is None:
+        return cache_dir('artifacts', slug)
+    path = os.path.join(tracer.directory, 'artifacts', slug)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def record_artifact(kind: str, path: str, **attrs):
+    """Link an artifact file (screenshot, network report, ...) from the current trace."""
+    tracer = _tracer
+    if tracer is not None:
+        tracer.link(kind, path, attrs)
+
+
+@contextmanager
+def collect_spans(prefix: str = ""):
+    """
+    Collect the spans whose name starts with `prefix` that finish in this context.
+
+    Works whether or not a run is being traced, and follows the context into
+    the driver pool's worker threads. Yields a list that is filled with
+    (name, seconds, span) tuples.
+    """
+    spans = []
+    token = _collector.set((prefix, spans))
+    try:
+        yield spans
+    finally:
+        _collector.reset(token)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """
+    Time a block as a span named `name`.
+
+    An exception escaping the block sets the outcome to the exception class name.
+    """
+    current = Span(name, attrs)
+    tracer = _tracer
+    collector = _collector.get()
+    if collector is not None and not name.startswith(collector[0]):
+        collector = None
+    if tracer is None and collector is None:
+        yield current
+        return
+
+    start = time.time()
+    started = time.perf_counter()
+    if tracer is not None:
+        tracer.started(current, start)
+    try:
+        yield current
+    except BaseException as e:
+        current.outcome = type(e).__name__
+        raise
+    finally:
+        duration = time.perf_counter() - started
+        if tracer is not None:
+            tracer.record(current, start, duration)
+        if collector is not None:
+            collector[1].append((name, duration, current))
+
+
+def traced(name: str, outcome: Optional[Callable[[Any], str]] = None,
+           attrs: Optional[Callable[[Any], dict]] = None):
+    """
+    Decorator that wraps a function in a span.
+
+    `outcome` maps the return value to the span outcome. By default string
+    results starting with "Error" are recorded with outcome "error". `attrs`
+    maps the return value to extra span attributes.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name) as current:
+                result = func(*args, **kwargs)
+                if outcome is not None:
+                    current.outcome = outcome(result)
+                elif isinstance(result, str) and result.startswith("Error"):
+                    current.outcome = "error"
+                if attrs is not None:
+                    current.set(**attrs(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def print_summary(summary: Optional[dict]):
+    """Print a per-step latency table."""
+    if not summary:
+        return
+    print(f"{'Step':<28}{'count':>7}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in summary.items():
+        print(f"{name:<28}{stats['count']:>7}{stats['errors']:>8}"
+              f"{stats['p50_s']:>8.2f}s{stats['p95_s']:>8.2f}s{stats['p99_s']:>8.2f}s")
@@ -0,0 +1,109 @@
+"""Configuration checks and the legacy (no subcommand) mode of the CLI."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.linkedin_msg import cli
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """A valid configuration; .env is not read."""
+    monkeypatch.setattr(cli, 'load_dotenv', lambda **kwargs: None)
+    for name, value in {
+        'LINKEDIN_EMAIL': "me@example.com",
+        'LINKEDIN_PASSWORD': "secret",
+        'ANTHROPIC_API_KEY': "sk-test",
+        'BROWSER_PROFILE': "default",
+        'BATCH_MODE': "false",
+        'BATCH_LOOKAHEAD': "false",
+        'PERSON_NAME': "Jane Doe",
+        'PERSON_NAMES': "",
+    }.items():
+        monkeypatch.setenv(name, value)
+    for name in ('BATCH_WORKERS', 'DRIVER_POOL_SIZE', 'PACING_MIN_INTERVAL', 'PACING_DAILY_CAP',
+                 'SKIP_CONTACTED_DAYS'):
+        monkeypatch.delenv(name, raising=False)
+    return monkeypatch
+
+
+def _args(command="run", **options):
+    defaults = {'direct': False, 'browser_profile': None, 'lookahead': False, 'person': None, 'input': None}
+    return SimpleNamespace(command=command, **{**defaults, **options})
+
+
+def test_valid_configuration_has_no_errors(env):
+    assert cli.validate_config(_args()) == ([], [])
+
+
+def test_placeholder_credentials_are_errors(env):
+    env.setenv('LINKEDIN_PASSWORD', "your_password")
+
+    errors, _ = cli.validate_config(_args())
+
+    assert errors == ["LINKEDIN_PASSWORD is not set (see .env.example)"]
+
+
+def test_missing_api_key_is_only_a_warning_in_direct_mode(env):
+    env.delenv('ANTHROPIC_API_KEY')
+
+    assert len(cli.validate_config(_args())[0]) == 1
+    errors, warnings = cli.validate_config(_args(direct=True))
+    assert errors == []
+    assert "direct mode cannot fall back to the agent" in warnings[0]
+
+
+def test_bad_numbers_profiles_and_inputs_are_errors(env, tmp_path):
+    env.setenv('BATCH_WORKERS', "two")
+    text_file = tmp_path / "people.txt"
+    text_file.write_text("Jane Doe\n")
+
+    errors, _ = cli.validate_config(_args("batch", browser_profile="turbo", input=str(text_file)))
+
+    assert errors == [
+        "Unknown browser profile 'turbo'. Available: default, batch",
+        "BATCH_WORKERS must be a number, got 'two'",
+        f"Unsupported input format: {text_file} (use .csv or .jsonl)",
+    ]
+
+
+def test_lookahead_without_direct_mode_warns(env):
+    _, warnings = cli.validate_config(_args("batch", lookahead=True, input=None))
+
+    assert "--lookahead only applies in direct mode (--direct)" in warnings
+
+
+@pytest.fixture
+def handlers(env):
+    """Replace the command handlers with ones that record the command they were called for."""
+    called = []
+    for name in ('cmd_run', 'cmd_batch'):
+        env.setattr(cli, name, lambda args: called.append(args.command) or 0)
+    return called
+
+
+@pytest.mark.parametrize("argv, command", [
+    ([], "run"),
+    (["--direct"], "run"),
+    (["--direct", "--workers", "2"], "batch"),
+    (["--lookahead", "--direct"], "batch"),
+])
+def test_options_without_a_subcommand_pick_the_legacy_command(handlers, env, argv, command):
+    env.setenv('PERSON_NAMES', "Jane Doe, John Roe")
+
+    assert cli.main(argv) == 0
+    assert handlers == [command]
+
+
+def test_batch_mode_selects_the_batch_command(handlers, env):
+    env.setenv('BATCH_MODE', "true")
+    env.setenv('PERSON_NAMES', "Jane Doe")
+
+    assert cli.main(["--direct"]) == 0
+    assert handlers == ["batch"]
+
+
+def test_check_stops_before_running(handlers, env):
+    assert cli.main(["run", "--check"]) == 0
+    assert handlers == []
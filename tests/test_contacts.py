@@ -0,0 +1,61 @@
+"""Contact index and the batch pre-flight filter."""
+
+import sqlite3
+
+import pytest
+
+from src.linkedin_msg import contacts
+from src.linkedin_msg.contacts import MAX_LISTED_SKIPS, ContactIndex, Preflight
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setenv('PROFILE_CACHE', 'false')
+    return ContactIndex(path=str(tmp_path / "contacts.sqlite3"))
+
+
+def test_namesakes_with_different_profiles_are_both_kept(index):
+    index.record("Jane Doe", "request_sent", "https://www.linkedin.com/in/jane-doe-1")
+    index.record("Jane Doe", "message_sent", "https://www.linkedin.com/in/jane-doe-2")
+
+    assert len(index) == 2
+    assert index.lookup("jane doe")['status'] == "message_sent"
+
+
+def test_lookup_by_resolved_profile_ignores_namesakes(index, monkeypatch):
+    index.record("Jane Doe", "request_sent", "https://www.linkedin.com/in/jane-doe-1")
+
+    class ResolvedCache:
+        def get(self, name):
+            return {'profile_url': "https://www.linkedin.com/in/jane-doe-2"}
+
+    monkeypatch.setenv('PROFILE_CACHE', 'true')
+    monkeypatch.setattr(contacts, 'get_profile_cache', ResolvedCache)
+
+    assert index.lookup("Jane Doe") is None
+
+
+def test_index_keyed_by_name_only_is_migrated(tmp_path):
+    path = str(tmp_path / "contacts.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE contacts (name_key TEXT PRIMARY KEY, name TEXT NOT NULL, profile_url TEXT,"
+                 " status TEXT NOT NULL, contacted_at REAL NOT NULL)")
+    conn.execute("INSERT INTO contacts VALUES ('jane doe', 'Jane Doe', NULL, 'pending', 1.0)")
+    conn.commit()
+    conn.close()
+
+    index = ContactIndex(path=path)
+    index.record("Jane Doe", "request_sent", "https://www.linkedin.com/in/jane-doe-2")
+
+    assert len(index) == 2
+
+
+def test_preflight_drops_duplicates_and_keeps_a_bounded_sample(index):
+    preflight = Preflight(index=index, skip_days=0)
+    people = [{'name': name, 'note': "Hi"} for name in ["Jane Doe", "John Roe"] * (MAX_LISTED_SKIPS + 5)]
+
+    kept = [person['name'] for person in preflight.filter(people)]
+
+    assert kept == ["Jane Doe", "John Roe"]
+    assert preflight.skipped_count == len(people) - 2
+    assert len(preflight.skipped) == MAX_LISTED_SKIPS
@@ -0,0 +1,72 @@
+"""Reusing a worker crew must run the tools again for every person."""
+
+import threading
+
+import pytest
+
+pytest.importorskip("crewai")
+
+from crewai.llms.base_llm import BaseLLM  # noqa: E402
+
+from src.linkedin_msg import crew as crew_module  # noqa: E402
+from src.linkedin_msg.tools import linkedin_automation_tool as tools  # noqa: E402
+from src.linkedin_msg.tools.results import tool_result  # noqa: E402
+
+# Task description fragment → (tool name, tool arguments)
+_TASK_TOOLS = {
+    "Login to LinkedIn": ("LinkedIn Login Tool", "{}"),
+    "Search for a person": ("LinkedIn Search Tool", '{"person_name": "Jane Doe"}'),
+    "Connect button": ("LinkedIn Connection Request Tool", '{"note": "Hi Jane"}'),
+    "message option": ("LinkedIn Message Tool", '{"message": "Hello"}'),
+}
+
+
+class ScriptedLLM(BaseLLM):
+    """Calls the current task's tool once, then answers with the tool's result."""
+
+    def __init__(self):
+        super().__init__(model="scripted")
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        last = messages if isinstance(messages, str) else messages[-1]['content']
+        if "Observation:" in last:
+            observation = last.rsplit("Observation:", 1)[1].strip()
+            return f"Thought: I now know the final answer\nFinal Answer: {observation}"
+        name, arguments = next(
+            tool for fragment, tool in _TASK_TOOLS.items() if fragment in from_task.description
+        )
+        return f"Thought: I should use the tool\nAction: {name}\nAction Input: {arguments}"
+
+
+@pytest.fixture
+def tool_calls(monkeypatch):
+    monkeypatch.setenv("OTEL_SDK_DISABLED", "true")
+    monkeypatch.setenv("CREWAI_DISABLE_TELEMETRY", "true")
+    monkeypatch.setattr(crew_module, "get_llm", lambda model: ScriptedLLM())
+    monkeypatch.setattr(crew_module, "_worker_crews", threading.local())
+
+    calls = []
+    results = {
+        tools.LinkedInLoginTool: tool_result("logged_in", account="me@example.com", session="new"),
+        tools.LinkedInSearchTool: tool_result("profile_found", url="https://www.linkedin.com/in/jane"),
+        tools.LinkedInConnectTool: tool_result("request_sent", note=True),
+    }
+    for tool_class, result in results.items():
+        def fake_run(self, *args, _result=result, _name=tool_class.__name__, **kwargs):
+            calls.append(_name)
+            return _result
+        monkeypatch.setattr(tool_class, "_run", fake_run)
+    return calls
+
+
+def test_reused_worker_crew_runs_the_tools_for_every_person(tool_calls):
+    inputs = {'person_name': "Jane Doe", 'connection_note': "Hi Jane"}
+
+    first = crew_module.worker_crew()
+    first.kickoff(inputs=inputs)
+    second = crew_module.worker_crew()
+    second.kickoff(inputs=inputs)
+
+    assert second is first
+    assert tool_calls == ["LinkedInLoginTool", "LinkedInSearchTool", "LinkedInConnectTool"] * 2
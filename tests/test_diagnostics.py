@@ -0,0 +1,90 @@
+"""Grouping of CDP network events into navigations."""
+
+from src.linkedin_msg.tools.diagnostics import navigation_report, split_navigations
+
+MAIN = "frame-main"
+
+
+def _request(request_id, url, timestamp, type_="Script", loader_id="loader", frame=MAIN, document_url=None):
+    return {'method': 'Network.requestWillBeSent', 'params': {
+        'requestId': request_id, 'loaderId': loader_id, 'frameId': frame, 'type': type_,
+        'timestamp': timestamp, 'request': {'url': url}, 'documentURL': document_url or url,
+    }}
+
+
+def _document(request_id, url, timestamp, frame=MAIN):
+    return _request(request_id, url, timestamp, type_="Document", loader_id=request_id, frame=frame)
+
+
+def _response(request_id, status, request_time, headers_end_ms):
+    return {'method': 'Network.responseReceived', 'params': {
+        'requestId': request_id,
+        'response': {'status': status, 'mimeType': "text/html",
+                     'timing': {'requestTime': request_time, 'receiveHeadersEnd': headers_end_ms}},
+    }}
+
+
+def _finished(request_id, timestamp, size=100):
+    return {'method': 'Network.loadingFinished',
+            'params': {'requestId': request_id, 'timestamp': timestamp, 'encodedDataLength': size}}
+
+
+def test_each_main_frame_document_starts_a_navigation():
+    events = [
+        _document("doc1", "https://example.test/search", 10.0),
+        _response("doc1", 200, 10.0, 150),
+        _request("js1", "https://example.test/app.js", 10.2),
+        _finished("js1", 10.5),
+        {'method': 'Page.domContentEventFired', 'params': {'timestamp': 10.8}},
+        _document("doc2", "https://example.test/in/jane", 11.0),
+        {'method': 'Page.loadEventFired', 'params': {'timestamp': 11.9}},
+    ]
+
+    first, second = split_navigations(events, MAIN)
+
+    assert first['url'] == "https://example.test/search"
+    assert set(first['requests']) == {"doc1", "js1"}
+    assert first['requests']['doc1']['ttfb_ms'] == 150.0
+    assert first['page_events'] == {'dom_content_loaded': 10.8}
+    assert second['url'] == "https://example.test/in/jane"
+    assert second['page_events'] == {'load': 11.9}
+
+
+def test_iframe_documents_do_not_start_a_navigation():
+    events = [
+        _document("doc1", "https://example.test/feed", 10.0),
+        _document("ad1", "https://ads.example.test/frame", 10.3, frame="frame-ad"),
+    ]
+
+    [navigation] = split_navigations(events, MAIN)
+
+    assert set(navigation['requests']) == {"doc1", "ad1"}
+
+
+def test_events_before_the_first_navigation_continue_the_loaded_page():
+    events = [
+        _request("xhr1", "https://example.test/api", 5.0, type_="XHR", document_url="https://example.test/feed"),
+        _finished("xhr1", 5.4),
+    ]
+
+    [navigation] = split_navigations(events, MAIN)
+    report = navigation_report(navigation)
+
+    assert report['continued']
+    assert report['url'] == "https://example.test/feed"
+    assert report['waterfall'][0]['duration_ms'] == 400.0
+
+
+def test_redirects_keep_the_start_and_the_final_url():
+    events = [
+        _document("doc1", "https://example.test/old", 10.0),
+        _document("doc1", "https://example.test/new", 10.2),
+        _finished("doc1", 10.6),
+    ]
+
+    [navigation] = split_navigations(events, MAIN)
+    report = navigation_report(navigation)
+
+    assert report['url'] == "https://example.test/new"
+    assert report['requests'] == 1
+    assert report['slowest'][0]['duration_ms'] == 600.0
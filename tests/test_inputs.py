@@ -0,0 +1,23 @@
+"""Batch input files that cannot be read."""
+
+import csv
+
+import pytest
+
+from src.linkedin_msg.inputs import InputFormatError, iter_people
+
+
+def test_non_utf8_file_is_an_input_format_error(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_bytes("name,note\nJosé,Hi\n".encode("latin-1"))
+
+    with pytest.raises(InputFormatError):
+        list(iter_people(str(path)))
+
+
+def test_malformed_csv_is_an_input_format_error(tmp_path):
+    path = tmp_path / "people.csv"
+    path.write_text("name,note\nJane," + "x" * (csv.field_size_limit() + 1) + "\n", encoding="utf-8")
+
+    with pytest.raises(InputFormatError):
+        list(iter_people(str(path)))
@@ -0,0 +1,68 @@
+"""Job states and resume paging of the batch job store."""
+
+import pytest
+
+from src.linkedin_msg.job_store import FAILED, PENDING, SENT, SKIPPED, JobStore, job_state_for
+from src.linkedin_msg.tools.results import tool_result
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(path=str(tmp_path / "jobs.sqlite3"))
+
+
+def _people(count):
+    return [{'name': f"Person {i}", 'note': "Hi"} for i in range(count)]
+
+
+def test_daily_cap_leaves_the_job_pending():
+    capped = tool_result("daily_cap_reached", error="Daily cap of 20 actions reached")
+
+    assert job_state_for({'status': 'error', 'error': capped}) == PENDING
+    assert job_state_for({'status': 'success', 'connect': 'daily_cap_reached'}) == PENDING
+    assert job_state_for({'status': 'success', 'connect': 'already_connected',
+                          'message': 'daily_cap_reached'}) == PENDING
+
+
+@pytest.mark.parametrize("connect", ["already_connected", "pending", "connect_unavailable"])
+def test_nothing_to_send_is_skipped(connect):
+    assert job_state_for({'status': 'success', 'connect': connect}) == SKIPPED
+
+
+def test_sent_and_failed_states():
+    assert job_state_for({'status': 'success', 'connect': 'request_sent'}) == SENT
+    assert job_state_for({'status': 'success', 'connect': 'already_connected',
+                          'message': 'message_sent'}) == SENT
+    assert job_state_for({'status': 'error', 'error': tool_result("no_results", query="Jane")}) == FAILED
+
+
+def test_connect_status_is_read_from_the_agent_result():
+    assert job_state_for({'status': 'success', 'result': tool_result("pending")}) == SKIPPED
+
+
+def test_iter_unfinished_pages_through_the_batch_in_order(store):
+    batch_id = store.create_batch(_people(7))
+
+    names = [job['person_name'] for job in store.iter_unfinished(batch_id, page_size=3)]
+
+    assert names == [f"Person {i}" for i in range(7)]
+
+
+def test_iter_unfinished_includes_failed_jobs_only_when_asked(store):
+    batch_id = store.create_batch(_people(4))
+    jobs = store.unfinished(batch_id)
+    for job, result in zip(jobs, [
+        {'status': 'success', 'connect': 'request_sent'},
+        {'status': 'error', 'error': tool_result("no_results", query="Person 1")},
+    ]):
+        store.mark_running(job['id'])
+        store.finish(job['id'], result)
+    # Person 2 was interrupted mid-run and counts as unfinished
+    store.mark_running(jobs[2]['id'])
+
+    unfinished = [job['person_name'] for job in store.iter_unfinished(batch_id, page_size=1)]
+    with_failed = [job['person_name'] for job in store.iter_unfinished(batch_id, include_failed=True, page_size=1)]
+
+    assert unfinished == ["Person 2", "Person 3"]
+    assert with_failed == ["Person 1", "Person 2", "Person 3"]
+    assert store.count_unfinished(batch_id, include_failed=True) == 3
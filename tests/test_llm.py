@@ -0,0 +1,55 @@
+"""Prompt normalization and the LLM response cache."""
+
+from src.linkedin_msg.llm import LLMCallCache, TracedLLM, fill_prompt, normalize_prompt
+
+JANE = {'person_name': "Jane Doe", 'connection_note': "Hi Jane Doe, let's connect!"}
+JOHN = {'person_name': "John Roe", 'connection_note': "Hello John Roe, great talk yesterday."}
+
+TOOLS = [{'name': "LinkedIn Search Tool", 'args': {'person_name': "string"}}]
+
+
+def _prompt(params):
+    return (f"Search for {params['person_name']} and send the note "
+            f"\"{params['connection_note']}\" to {params['person_name']}.")
+
+
+def test_prompts_for_different_people_normalize_to_the_same_template():
+    template = normalize_prompt(_prompt(JANE), JANE)
+
+    assert template == normalize_prompt(_prompt(JOHN), JOHN)
+    assert "Jane" not in template
+    # The note contains the name and is replaced as a whole
+    assert "\"{connection_note}\"" in template
+
+
+def test_values_inside_longer_words_are_left_alone():
+    assert normalize_prompt("Ann met Annabel", {'person_name': "Ann"}) == "{person_name} met Annabel"
+
+
+def test_fill_prompt_substitutes_the_other_persons_values():
+    cached = normalize_prompt(_prompt(JANE), JANE)
+
+    assert fill_prompt(cached, JOHN) == _prompt(JOHN)
+
+
+def test_cache_key_is_shared_across_people_but_not_across_tool_schemas():
+    llm = TracedLLM(model="gpt-4o-mini")
+    jane = llm._cache_key(_prompt(JANE), TOOLS, None, JANE)
+
+    assert jane == llm._cache_key(_prompt(JOHN), TOOLS, None, JOHN)
+    assert jane != llm._cache_key(_prompt(JANE), TOOLS + [{'name': "LinkedIn Connect Tool"}], None, JANE)
+    assert jane != llm._cache_key(_prompt(JANE), None, None, JANE)
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = LLMCallCache(max_entries=2)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "A"
+    assert cache.get("c") == "C"
+    assert cache.stats()['evictions'] == 1
+    assert cache.stats()['hits'] == 3
@@ -0,0 +1,72 @@
+"""Opening the lookahead tab in the current browser session."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from src.linkedin_msg.tools import driver_pool
+from src.linkedin_msg.tools.driver_pool import BrowserSession
+from src.linkedin_msg.tools.lookahead import start_lookahead
+
+
+class TabDriver:
+    """Keeps a list of tabs and records which tab every script and CDP command ran in."""
+
+    def __init__(self, blocked_urls=()):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.blocked_urls = list(blocked_urls)
+        self.log = []
+        self.switch_to = SimpleNamespace(window=self._switch)
+
+    def _switch(self, handle):
+        self.current_window_handle = handle
+
+    def execute_script(self, script, *args):
+        if "window.open" in script:
+            self.window_handles.append(f"tab{len(self.window_handles)}")
+        self.log.append((self.current_window_handle, "script", args[0] if args else None))
+
+    def execute_cdp_cmd(self, command, params):
+        self.log.append((self.current_window_handle, command, params.get('urls')))
+
+
+@pytest.fixture
+def session_for(monkeypatch):
+    """Bind a BrowserSession around a driver as the current session."""
+    monkeypatch.setenv('PROFILE_CACHE', 'false')
+    tokens = []
+
+    def bind(driver):
+        session = BrowserSession(driver)
+        tokens.append(driver_pool._current_session.set(session))
+        return session
+
+    yield bind
+    for token in reversed(tokens):
+        driver_pool._current_session.reset(token)
+
+
+def test_blocked_urls_are_applied_to_the_tab_before_the_search_loads(session_for):
+    driver = TabDriver(blocked_urls=["*.jpg"])
+    session = session_for(driver)
+
+    assert start_lookahead("Jane Doe")
+
+    assert session.lookahead == ("jane doe", "tab1")
+    assert driver.current_window_handle == "main"
+    tab_log = [entry for entry in driver.log if entry[0] == "tab1"]
+    assert [entry[1] for entry in tab_log] == ['Network.enable', 'Network.setBlockedURLs', "script"]
+    assert tab_log[1][2] == ["*.jpg"]
+    assert "keywords=Jane" in tab_log[2][2]
+
+
+def test_without_blocks_the_tab_opens_on_the_search_directly(session_for):
+    driver = TabDriver()
+    session = session_for(driver)
+
+    assert start_lookahead("Jane Doe")
+
+    assert session.lookahead == ("jane doe", "tab1")
+    assert all(entry[0] == "main" for entry in driver.log)
+    assert "keywords=Jane" in driver.log[0][2]
@@ -0,0 +1,129 @@
+"""Retry behaviour of the direct pipeline, driven by fake tools instead of a browser."""
+
+import pytest
+
+from src.linkedin_msg import pipeline
+from src.linkedin_msg.errors import AUTH_LOST, STALE_ELEMENT, TRANSIENT, RetryPolicy
+from src.linkedin_msg.tools.results import tool_result
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+class FakeTool:
+    """Returns the queued results in order and records every call in `calls`."""
+
+    def __init__(self, step, results, calls):
+        self.step = step
+        self.results = list(results)
+        self.calls = calls
+
+    def run(self, **kwargs):
+        self.calls.append(self.step)
+        return self.results.pop(0)
+
+
+@pytest.fixture
+def fake_steps(monkeypatch):
+    calls = []
+
+    def install(login, search, connect):
+        steps = [
+            ('login', FakeTool('login', login, calls), {}),
+            ('search', FakeTool('search', search, calls), {}),
+            ('connect', FakeTool('connect', connect, calls), {}),
+        ]
+        monkeypatch.setattr(pipeline, '_steps', lambda person_name, connection_note: steps)
+        return calls
+
+    return install
+
+
+LOGGED_IN = tool_result("logged_in")
+FOUND = tool_result("profile_found", url="https://www.linkedin.com/in/jane")
+SENT = tool_result("request_sent", note=True)
+
+
+def test_transient_search_error_is_retried(fake_steps):
+    calls = fake_steps(
+        login=[LOGGED_IN],
+        search=[tool_result("error", kind=TRANSIENT, error="timeout"), FOUND],
+        connect=[SENT],
+    )
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.COMPLETED
+    assert outcome['retries'] == 1
+    assert calls == ['login', 'search', 'search', 'connect']
+
+
+def test_search_page_error_is_retried(fake_steps):
+    calls = fake_steps(
+        login=[LOGGED_IN],
+        search=[tool_result("page_error", query="Jane Doe", error="HTTP 503"), FOUND],
+        connect=[SENT],
+    )
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.COMPLETED
+    assert outcome['retries'] == 1
+    assert calls == ['login', 'search', 'search', 'connect']
+
+
+def test_failed_connect_reopens_the_profile(fake_steps):
+    calls = fake_steps(
+        login=[LOGGED_IN],
+        search=[FOUND, FOUND],
+        connect=[tool_result("note_failed", kind=STALE_ELEMENT, error="stale"), SENT],
+    )
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.COMPLETED
+    assert calls == ['login', 'search', 'connect', 'search', 'connect']
+
+
+def test_lost_session_logs_in_again(fake_steps):
+    calls = fake_steps(
+        login=[LOGGED_IN, LOGGED_IN],
+        search=[FOUND, FOUND],
+        connect=[tool_result("not_logged_in", kind=AUTH_LOST), SENT],
+    )
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.COMPLETED
+    assert calls == ['login', 'search', 'connect', 'login', 'search', 'connect']
+
+
+def test_retries_stop_at_the_attempt_budget(fake_steps):
+    timeout = tool_result("error", kind=TRANSIENT, error="timeout")
+    calls = fake_steps(login=[LOGGED_IN], search=[timeout] * 3, connect=[])
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.AMBIGUOUS
+    assert outcome['step'] == 'search'
+    assert outcome['retries'] == 2
+    assert calls == ['login', 'search', 'search', 'search']
+
+
+def test_permanent_failures_are_not_retried(fake_steps):
+    calls = fake_steps(login=[LOGGED_IN], search=[tool_result("no_results", query="Jane Doe")], connect=[])
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=NO_WAIT)
+
+    assert outcome['status'] == pipeline.FAILED
+    assert outcome['retries'] == 0
+    assert calls == ['login', 'search']
+
+
+def test_zero_attempts_disables_retries(fake_steps):
+    calls = fake_steps(login=[LOGGED_IN], search=[tool_result("error", kind=TRANSIENT, error="timeout")],
+                       connect=[])
+
+    outcome = pipeline.run_direct("Jane Doe", "Hi", policy=RetryPolicy(max_attempts=0))
+
+    assert outcome['retries'] == 0
+    assert calls == ['login', 'search']
@@ -0,0 +1,74 @@
+"""TTL expiry and LRU eviction of the profile cache."""
+
+import pytest
+
+from src.linkedin_msg.tools import profile_cache
+from src.linkedin_msg.tools.profile_cache import ProfileCache
+
+DAY = 86400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake time.time() for the cache; advance it by assigning to clock.now."""
+    class Clock:
+        now = 1_000_000.0
+
+        def time(self):
+            return self.now
+
+    fake = Clock()
+    monkeypatch.setattr(profile_cache.time, 'time', fake.time)
+    return fake
+
+
+@pytest.fixture
+def cache_factory(tmp_path):
+    def make(ttl_days=30, max_entries=100):
+        return ProfileCache(path=str(tmp_path / "profiles.sqlite3"), ttl_days=ttl_days, max_entries=max_entries)
+    return make
+
+
+def test_entries_expire_after_the_ttl(cache_factory, clock):
+    cache = cache_factory(ttl_days=1)
+    cache.put("Jane Doe", "https://www.linkedin.com/in/jane-doe/?trk=search")
+
+    clock.now += DAY - 1
+    assert cache.get("  jane   DOE ")['profile_url'] == "https://www.linkedin.com/in/jane-doe"
+
+    clock.now += 2
+    assert cache.get("Jane Doe") is None
+    assert len(cache) == 0
+
+
+def test_purge_expired_removes_only_old_entries(cache_factory, clock):
+    cache = cache_factory(ttl_days=1)
+    cache.put("Jane Doe", "https://www.linkedin.com/in/jane-doe")
+    clock.now += DAY
+    cache.put("John Roe", "https://www.linkedin.com/in/john-roe")
+    clock.now += 1
+
+    assert cache.purge_expired() == 1
+    assert cache.get("John Roe") is not None
+
+
+def test_least_recently_used_entry_is_evicted(cache_factory, clock):
+    cache = cache_factory(max_entries=2)
+    cache.put("Jane Doe", "https://www.linkedin.com/in/jane-doe")
+    clock.now += 1
+    cache.put("John Roe", "https://www.linkedin.com/in/john-roe")
+    clock.now += 1
+    cache.get("Jane Doe")
+    clock.now += 1
+    cache.put("Ann Lee", "https://www.linkedin.com/in/ann-lee")
+
+    assert cache.get("John Roe") is None
+    assert cache.get("Jane Doe") is not None
+    assert len(cache) == 2
+
+
+def test_explicit_zero_max_entries_is_not_replaced_by_the_default(cache_factory, monkeypatch):
+    monkeypatch.setenv('PROFILE_CACHE_MAX_ENTRIES', '50')
+
+    assert cache_factory(max_entries=0).max_entries == 0
+    assert ProfileCache(path=cache_factory().path).max_entries == 50
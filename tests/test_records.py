@@ -0,0 +1,80 @@
+"""Run records built from run results, and their summary."""
+
+from types import SimpleNamespace
+
+from src.linkedin_msg.errors import TRANSIENT
+from src.linkedin_msg.records import ResultSink, RunResult, RunStatus, iter_results, run_record, summarize_results
+from src.linkedin_msg.tools.results import tool_result
+
+
+def _span(status):
+    return SimpleNamespace(attrs={'status': status}, outcome=None)
+
+
+def test_success_takes_the_status_of_the_message_step_first():
+    record = run_record({'person': "Jane Doe", 'status': 'success', 'connect': 'already_connected',
+                         'message': 'message_sent', 'profile_url': "https://www.linkedin.com/in/jane"}, [])
+
+    assert record.status == RunStatus.MESSAGE_SENT
+    assert record.ok
+
+
+def test_success_without_a_known_step_status_is_unknown():
+    assert run_record({'person': "Jane Doe", 'status': 'success'}, []).status == RunStatus.UNKNOWN
+
+
+def test_failed_search_is_not_found_and_keeps_the_error_class():
+    record = run_record({'person': "Jane Doe", 'status': 'error',
+                         'error': tool_result("no_results", query="Jane Doe")}, [])
+
+    assert record.status == RunStatus.NOT_FOUND
+    assert record.error_class == "no_results"
+    assert not record.ok
+
+
+def test_failure_records_the_error_kind_and_retries():
+    record = run_record({'person': "Jane Doe", 'status': 'error', 'retries': 2,
+                         'error': tool_result("error", kind=TRANSIENT, error="timeout")}, [])
+
+    assert record.status == RunStatus.FAILED
+    assert record.error_kind == TRANSIENT
+    assert record.retries == 2
+
+
+def test_steps_add_up_repeated_calls():
+    spans = [("tool.search", 1.0, _span("error")), ("tool.search", 0.5, _span("profile_found")),
+             ("tool.connect", 2.0, _span("request_sent"))]
+
+    record = run_record({'person': "Jane Doe", 'status': 'success', 'connect': 'request_sent'}, spans, seconds=3.5)
+
+    assert record.steps['search'] == {'status': "profile_found", 'seconds': 1.5, 'calls': 2}
+    assert record.steps['connect']['calls'] == 1
+    assert record.seconds == 3.5
+
+
+def test_records_round_trip_through_the_sink(tmp_path):
+    path = str(tmp_path / "results.jsonl")
+    sink = ResultSink(path)
+    sink.write(RunResult(person="Jane Doe", status=RunStatus.REQUEST_SENT, steps={'search': {'seconds': 1.0}}))
+    sink.close()
+
+    [record] = iter_results(path)
+
+    assert record.person == "Jane Doe"
+    assert record.status == RunStatus.REQUEST_SENT
+
+
+def test_summary_counts_statuses_and_step_percentiles():
+    records = [
+        RunResult(person=f"Person {i}", status=status, steps={'search': {'seconds': seconds}}, finished_at=i)
+        for i, (status, seconds) in enumerate([(RunStatus.REQUEST_SENT, 1.0), (RunStatus.REQUEST_SENT, 3.0),
+                                               (RunStatus.NOT_FOUND, 2.0), (RunStatus.FAILED, 10.0)])
+    ]
+
+    summary = summarize_results(records)
+    recent = summarize_results(records, since=2)
+
+    assert summary['total'] == 4
+    assert summary['statuses'] == {'request_sent': 2, 'not_found': 1, 'failed': 1}
+    assert summary['steps']['search'] == {'count': 4, 'p50_s': 2.0, 'p95_s': 10.0}
+    assert recent['total'] == 2
@@ -0,0 +1,113 @@
+"""Pacing budget and its use by the batch scheduler."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from src.linkedin_msg.scheduler import BatchScheduler, DailyCapReached, PacingBudget, current_pacing
+
+
+@pytest.fixture
+def budget_factory(tmp_path):
+    def make(min_interval=0, daily_cap=0):
+        return PacingBudget(account="test@example.com", min_interval=min_interval, daily_cap=daily_cap,
+                            path=str(tmp_path / "pacing.sqlite3"))
+    return make
+
+
+def test_daily_cap_raises_once_used_up(budget_factory):
+    budget = budget_factory(daily_cap=2)
+
+    budget.acquire()
+    budget.acquire()
+
+    assert budget.remaining_today() == 0
+    with pytest.raises(DailyCapReached):
+        budget.acquire()
+
+
+def test_daily_cap_is_shared_by_budgets_of_the_same_account(budget_factory):
+    budget_factory(daily_cap=1).acquire()
+
+    assert budget_factory(daily_cap=1).remaining_today() == 0
+
+
+def test_min_interval_spaces_actions(budget_factory):
+    budget = budget_factory(min_interval=0.2)
+
+    budget.acquire()
+    started = time.monotonic()
+    budget.acquire()
+
+    assert time.monotonic() - started >= 0.15
+
+
+def test_budget_can_be_read_while_an_action_waits_for_its_slot(budget_factory):
+    budget = budget_factory(min_interval=1, daily_cap=5)
+    budget.acquire()
+
+    waiting = threading.Thread(target=budget.acquire)
+    waiting.start()
+    time.sleep(0.1)
+    started = time.monotonic()
+    remaining = budget.remaining_today()
+    elapsed = time.monotonic() - started
+    waiting.join()
+
+    assert remaining == 4
+    assert elapsed < 0.5
+    assert budget.remaining_today() == 3
+
+
+async def _collect_async(scheduler, items):
+    return [item async for item, _ in scheduler.run(items)]
+
+
+def _collect(scheduler, items):
+    return asyncio.run(_collect_async(scheduler, items))
+
+
+def test_only_outbound_actions_use_the_budget(budget_factory):
+    budget = budget_factory(daily_cap=2)
+
+    async def worker(item):
+        # Odd items stand for people that need no action (e.g. already connected)
+        if item % 2 == 0:
+            await asyncio.to_thread(current_pacing().acquire)
+        return item
+
+    scheduler = BatchScheduler(worker, workers=1, pacing=budget)
+    done = _collect(scheduler, range(6))
+
+    assert done == [0, 1, 2]
+    assert scheduler.stop_reason is not None
+    assert budget.remaining_today() == 0
+
+
+def test_scheduler_runs_everything_without_a_cap(budget_factory):
+    async def worker(item):
+        await asyncio.to_thread(current_pacing().acquire)
+        return item
+
+    scheduler = BatchScheduler(worker, workers=2, pacing=budget_factory())
+
+    assert sorted(_collect(scheduler, range(5))) == list(range(5))
+    assert scheduler.stop_reason is None
+
+
+def test_cap_stops_a_batch_with_more_workers_than_queue_slots(budget_factory):
+    budget = budget_factory(daily_cap=1)
+
+    async def worker(item):
+        await asyncio.to_thread(current_pacing().acquire)
+        return item
+
+    scheduler = BatchScheduler(worker, workers=4, queue_size=1, pacing=budget)
+
+    async def run():
+        return await asyncio.wait_for(_collect_async(scheduler, range(20)), timeout=5)
+
+    assert len(asyncio.run(run())) <= 4
+    assert scheduler.stop_reason is not None
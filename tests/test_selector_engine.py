@@ -0,0 +1,113 @@
+"""Adaptive ordering and scoring of selector strategies."""
+
+import pytest
+from selenium.webdriver.common.by import By
+
+from src.linkedin_msg.tools.selector_engine import (
+    SCORE_WEIGHT,
+    UNTRIED_SCORE,
+    SelectorEngine,
+    Strategy,
+    compile_strategy,
+)
+
+SITE = "www.linkedin.com"
+
+
+@pytest.fixture
+def engine_factory(tmp_path):
+    strategies = {'connect_button': [
+        Strategy("primary", By.CSS_SELECTOR, "button.primary", 0),
+        Strategy("aria", By.CSS_SELECTOR, "button[aria-label]", 1),
+        Strategy("text:button:Connect", By.XPATH, ".//button", 2),
+    ]}
+
+    def make(adaptive=True):
+        return SelectorEngine(path=str(tmp_path / "selectors.sqlite3"), strategies=strategies, adaptive=adaptive)
+    return make
+
+
+def _keys(strategies):
+    return [strategy.key for strategy in strategies]
+
+
+def test_untried_strategies_keep_the_config_order(engine_factory):
+    assert _keys(engine_factory().ordered('connect_button', SITE)) == ["primary", "aria", "text:button:Connect"]
+
+
+def test_score_moves_with_an_exponential_moving_average(engine_factory):
+    engine = engine_factory()
+    aria = engine.ordered('connect_button', SITE)[1]
+
+    engine.record('connect_button', aria, True, 0.02, SITE)
+    engine.record('connect_button', aria, False, 0.0, SITE)
+
+    hit = (1 - SCORE_WEIGHT) * UNTRIED_SCORE + SCORE_WEIGHT
+    [row] = [row for row in engine.stats(SITE)['connect_button'] if row['strategy'] == "aria"]
+    assert row['score'] == round((1 - SCORE_WEIGHT) * hit, 3)
+    assert (row['hits'], row['misses'], row['avg_ms']) == (1, 1, 20.0)
+
+
+def test_the_strategy_that_works_is_tried_first(engine_factory):
+    engine = engine_factory()
+    primary, aria, _ = engine.ordered('connect_button', SITE)
+
+    engine.record('connect_button', primary, False, 0.0, SITE)
+    engine.record('connect_button', aria, True, 0.01, SITE)
+
+    assert _keys(engine.ordered('connect_button', SITE)) == ["aria", "text:button:Connect", "primary"]
+    # Stats are kept per site
+    assert _keys(engine.ordered('connect_button', "localhost:8000"))[0] == "primary"
+
+
+def test_stats_survive_a_restart(engine_factory):
+    engine = engine_factory()
+    aria = engine.ordered('connect_button', SITE)[1]
+    engine.record('connect_button', aria, True, 0.01, SITE)
+    engine.save()
+
+    assert _keys(engine_factory().ordered('connect_button', SITE))[0] == "aria"
+
+
+def test_non_adaptive_engine_keeps_the_config_order(engine_factory):
+    engine = engine_factory(adaptive=False)
+    aria = engine.ordered('connect_button', SITE)[1]
+    engine.record('connect_button', aria, True, 0.01, SITE)
+
+    assert _keys(engine.ordered('connect_button', SITE))[0] == "primary"
+
+
+def test_text_strategy_compiles_to_one_xpath():
+    strategy = compile_strategy({'text': "Connect", 'tag': "button"}, 0)
+
+    assert strategy.key == "text:button:Connect"
+    assert strategy.locator == (By.XPATH, ".//button[contains(normalize-space(.), 'Connect')"
+                                          " or contains(@aria-label, 'Connect')]")
+
+
+class ScriptDriver:
+    """Answers the query script with (descriptions, elapsed ms) per locator."""
+
+    def __init__(self, results):
+        self.results = results
+
+    def execute_script(self, script, *args):
+        return self.results
+
+
+def _description(text):
+    return {'element': None, 'tag': "button", 'href': None, 'text': text, 'aria_label': None,
+            'visible': True, 'rect': {}}
+
+
+def test_batched_lookup_records_each_strategys_own_time(engine_factory, monkeypatch):
+    monkeypatch.setenv('LINKEDIN_BASE_URL', f"https://{SITE}")
+    engine = engine_factory()
+    driver = ScriptDriver([[[], 3.0], [[_description("Connect")], 12.0], [[_description("Connect")], 40.0]])
+
+    candidate = engine.find_candidate(driver, 'connect_button')
+
+    rows = {row['strategy']: row for row in engine.stats(SITE)['connect_button']}
+    assert candidate.text == "Connect"
+    assert rows["aria"]['avg_ms'] == 12.0
+    assert (rows["primary"]['misses'], rows["text:button:Connect"]['hits']) == (1, 0)